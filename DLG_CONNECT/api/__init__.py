@@ -1,9 +1,31 @@
 """
 DLG Connect - API Module
 Módulos de conexão com backend
+
+Os atributos do pacote são importados sob demanda (PEP 562): `import api`
+não carrega Qt, requests nem cria pastas; só `api.Backend`/`api.api` o fazem.
 """
 
-from .supabase_client import api, DLGApiClient
-from .bridge import Backend
+import importlib
+
+# atributo -> módulo que o define
+_LAZY_ATTRS = {
+    "api": ".supabase_client",
+    "DLGApiClient": ".supabase_client",
+    "Backend": ".bridge",
+}
 
 __all__ = ["api", "DLGApiClient", "Backend"]
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,288 @@
+"""
+DLG Connect - Accounts Model
+Modelos Qt da lista de contas (página Contas), alimentados pelo catálogo de sessions
+"""
+
+import operator
+import re
+import time
+from typing import Optional, Dict, Any, List, NamedTuple
+
+from PySide6.QtCore import (
+    QAbstractListModel, QByteArray, QModelIndex, QObject, QSortFilterProxyModel,
+    Qt, Property, Signal, Slot
+)
+
+from .session_catalog import STATUS_LABELS
+
+
+STATUS_COLORS = {
+    "active": "#22c55e",
+    "flood_2d": "#0080ff",
+    "flood_7d": "#f59e0b",
+    "banned": "#ef4444",
+}
+
+
+class Account(NamedTuple):
+    """Uma linha da lista (tupla: pouca memória com milhares de contas)"""
+
+    path: str
+    phone: str
+    status: str
+    added_today: int
+    last_used: float
+    search_key: str
+
+    @classmethod
+    def from_catalog(cls, row: Dict[str, Any]) -> "Account":
+        label = STATUS_LABELS.get(row["status"], row["status"])
+        # Busca por dígitos ("11 9876") ou pelo rótulo do status ("banida")
+        search_key = f"{re.sub(r'[^0-9]', '', row['phone'])} {label.lower()}"
+        return cls(row["path"], row["phone"], row["status"], row["addedToday"], row["lastUsed"], search_key)
+
+
+def format_last_used(timestamp: float, now: Optional[float] = None) -> str:
+    """Tempo relativo exibido na coluna "Último Uso" ("2 min atrás")"""
+    if not timestamp:
+        return "Nunca"
+    elapsed = max(0, (now or time.time()) - timestamp)
+    if elapsed < 60:
+        return "Agora"
+    if elapsed < 3600:
+        return f"{int(elapsed // 60)} min atrás"
+    if elapsed < 86400:
+        return f"{int(elapsed // 3600)} h atrás"
+    days = int(elapsed // 86400)
+    return "1 dia atrás" if days == 1 else f"{days} dias atrás"
+
+
+class AccountsModel(QAbstractListModel):
+    """
+    Lista de contas com acesso por roles.
+
+    reload() compara com as linhas atuais e emite só as mudanças (linhas
+    removidas, dataChanged, linhas novas), então a ListView mantém a
+    posição e os delegates que já existem.
+
+    A ordenação é feita aqui, em Python (list.sort + layoutChanged): no
+    QSortFilterProxyModel cada comparação chamaria data() via Python, o
+    que leva segundos com 10 mil linhas.
+    """
+
+    PathRole = Qt.UserRole + 1
+    PhoneRole = Qt.UserRole + 2
+    StatusRole = Qt.UserRole + 3
+    StatusLabelRole = Qt.UserRole + 4
+    StatusColorRole = Qt.UserRole + 5
+    AddedTodayRole = Qt.UserRole + 6
+    LastUsedRole = Qt.UserRole + 7
+    LastUsedAtRole = Qt.UserRole + 8
+    SearchRole = Qt.UserRole + 9
+
+    ROLE_NAMES = {
+        PathRole: b"path",
+        PhoneRole: b"phone",
+        StatusRole: b"status",
+        StatusLabelRole: b"statusLabel",
+        StatusColorRole: b"statusColor",
+        AddedTodayRole: b"addedToday",
+        LastUsedRole: b"lastUsed",
+        LastUsedAtRole: b"lastUsedAt",
+        SearchRole: b"search",
+    }
+
+    # role -> campo usado na ordenação
+    SORT_FIELDS = {
+        PathRole: "path",
+        PhoneRole: "phone",
+        StatusRole: "status",
+        StatusLabelRole: "status",
+        AddedTodayRole: "added_today",
+        LastUsedRole: "last_used",
+        LastUsedAtRole: "last_used",
+    }
+
+    def __init__(self, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self._rows: List[Account] = []
+        self._index: Dict[str, int] = {}
+        # Uso mais recente primeiro
+        self._sort_field = "last_used"
+        self._sort_descending = True
+
+    # ========== QAbstractListModel ==========
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def roleNames(self) -> Dict[int, QByteArray]:
+        return {role: QByteArray(name) for role, name in self.ROLE_NAMES.items()}
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        if not index.isValid() or not 0 <= index.row() < len(self._rows):
+            return None
+        account = self._rows[index.row()]
+
+        if role == self.PhoneRole or role == Qt.DisplayRole:
+            return account.phone
+        if role == self.SearchRole:
+            return account.search_key
+        if role == self.LastUsedAtRole:
+            return account.last_used
+        if role == self.StatusRole:
+            return account.status
+        if role == self.StatusLabelRole:
+            return STATUS_LABELS.get(account.status, account.status)
+        if role == self.StatusColorRole:
+            return STATUS_COLORS.get(account.status, "#94a3b8")
+        if role == self.AddedTodayRole:
+            return account.added_today
+        if role == self.LastUsedRole:
+            return format_last_used(account.last_used)
+        if role == self.PathRole:
+            return account.path
+        return None
+
+    # ========== ATUALIZAÇÃO ==========
+
+    def reload(self, rows: List[Dict[str, Any]]):
+        """Aplica uma nova lista do catálogo emitindo apenas o que mudou"""
+        incoming = {}
+        for row in rows:
+            account = Account.from_catalog(row)
+            incoming[account.path] = account
+
+        # Remoções (de trás para frente, em blocos contíguos)
+        row = len(self._rows) - 1
+        while row >= 0:
+            if self._rows[row].path in incoming:
+                row -= 1
+                continue
+            last = row
+            while row >= 0 and self._rows[row].path not in incoming:
+                row -= 1
+            self.beginRemoveRows(QModelIndex(), row + 1, last)
+            del self._rows[row + 1:last + 1]
+            self.endRemoveRows()
+
+        # Alterações (dataChanged em blocos contíguos)
+        first_changed = None
+        for row, account in enumerate(self._rows):
+            updated = incoming.pop(account.path)
+            if updated != account:
+                self._rows[row] = updated
+                if first_changed is None:
+                    first_changed = row
+                continue
+            if first_changed is not None:
+                self.dataChanged.emit(self.index(first_changed), self.index(row - 1))
+                first_changed = None
+        if first_changed is not None:
+            self.dataChanged.emit(self.index(first_changed), self.index(len(self._rows) - 1))
+
+        # Novas contas no fim, já ordenadas entre si (o _apply_sort abaixo as coloca no lugar)
+        if incoming:
+            start = len(self._rows)
+            self.beginInsertRows(QModelIndex(), start, start + len(incoming) - 1)
+            self._rows.extend(sorted(incoming.values(), key=self._sort_key(), reverse=self._sort_descending))
+            self.endInsertRows()
+
+        self._apply_sort()
+
+    def search_key(self, row: int) -> str:
+        """Texto de busca da linha (usado pelo filtro sem passar por data())"""
+        return self._rows[row].search_key
+
+    def sort_by(self, role: int, descending: bool = False) -> bool:
+        field_name = self.SORT_FIELDS.get(role)
+        if field_name is None:
+            return False
+        self._sort_field = field_name
+        self._sort_descending = descending
+        self._apply_sort()
+        return True
+
+    def _sort_key(self):
+        return operator.attrgetter(self._sort_field, "path")
+
+    def _apply_sort(self):
+        """Reordena as linhas (layoutChanged, mantendo os índices persistentes)"""
+        ordered = sorted(self._rows, key=self._sort_key(), reverse=self._sort_descending)
+        if ordered == self._rows:
+            self._index = {account.path: row for row, account in enumerate(self._rows)}
+            return
+
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        paths = [self._rows[index.row()].path for index in persistent]
+        self._rows = ordered
+        self._index = {account.path: row for row, account in enumerate(self._rows)}
+        self.changePersistentIndexList(persistent, [self.index(self._index[path]) for path in paths])
+        self.layoutChanged.emit()
+
+    def remove(self, path: str) -> bool:
+        row = self._index.get(path)
+        if row is None:
+            return False
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._rows[row]
+        self.endRemoveRows()
+        self._index = {account.path: i for i, account in enumerate(self._rows)}
+        return True
+
+
+class AccountsFilterModel(QSortFilterProxyModel):
+    """
+    Busca e ordenação da lista de contas.
+
+    O filtro compara o texto digitado com o search_key de cada linha
+    direto na lista do AccountsModel (sem data()/QVariant por linha); a
+    ordenação é delegada ao AccountsModel.
+    """
+
+    searchQueryChanged = Signal(name="searchQueryChanged")
+    countChanged = Signal(name="countChanged")
+
+    def __init__(self, source: AccountsModel, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self._source = source
+        self._search_query = ""
+        self._needle = ""
+        self.setSourceModel(source)
+
+        for signal in (self.rowsInserted, self.rowsRemoved, self.modelReset, self.layoutChanged):
+            signal.connect(self.countChanged)
+
+    def filterAcceptsRow(self, source_row: int, source_parent: QModelIndex) -> bool:
+        return not self._needle or self._needle in self._source.search_key(source_row)
+
+    @Property(str, notify=searchQueryChanged)
+    def searchQuery(self) -> str:
+        return self._search_query
+
+    @searchQuery.setter
+    def searchQuery(self, value: str):
+        if value == self._search_query:
+            return
+        self._search_query = value
+        needle = value.strip().lower()
+        if re.fullmatch(r"[\d\s+()\-]+", needle):
+            # Telefone digitado com espaços/traços: compara só os dígitos
+            needle = re.sub(r"\D", "", needle)
+        self._needle = needle
+        self.invalidateFilter()
+        self.searchQueryChanged.emit()
+        self.countChanged.emit()
+
+    @Property(int, notify=countChanged)
+    def count(self) -> int:
+        return self.rowCount()
+
+    @Slot(str, bool)
+    def sortBy(self, role_name: str, ascending: bool = True):
+        """Ordena pela role indicada (ex: "phone", "addedToday", "lastUsedAt")"""
+        for role, name in AccountsModel.ROLE_NAMES.items():
+            if name.decode() == role_name:
+                self._source.sort_by(role, descending=not ascending)
+                return
@@ -3,12 +3,37 @@ DLG Connect - QML Bridge
 Ponte entre QML e Python para comunicação com o backend via API PHP
 """
 
-from PySide6.QtCore import QObject, Signal, Slot, Property
-from PySide6.QtQml import QmlElement
-from typing import Optional
+from PySide6.QtCore import QCoreApplication, QObject, QTimer, Signal, Slot, Property
+from PySide6.QtQml import QJSValue, QmlElement
+from typing import Any, Optional
 import json
 
 from .supabase_client import api
+from .session_manager import session_manager
+from .session_catalog import session_catalog
+from .accounts_model import AccountsModel, AccountsFilterModel
+from .log_model import LogModel
+from .user_state import UserState
+from .license_scheduler import LicenseScheduler
+from .realtime_push import PushChannel
+from .job_runner import JobRunner, JobSettings
+from .metrics import metrics
+from .workers import TaskRunner
+from .logger import get_logger
+
+logger = get_logger("bridge")
+
+# Mudanças de licença/dispositivo empurradas em sequência viram uma revalidação
+PUSH_REVALIDATE_DELAY_MS = 500
+
+def _from_qml(value: Any) -> Any:
+    """Argumento vindo do QML: objeto JS (nativo) ou string JSON (handlers antigos)"""
+    if isinstance(value, QJSValue):
+        value = value.toVariant()
+    if isinstance(value, str):
+        value = json.loads(value) if value else None
+    return value
+
 
 # Registra a classe para uso no QML
 QML_IMPORT_NAME = "DLGConnect"
@@ -26,34 +51,123 @@ class Backend(QObject):
     # IMPORTANTE: Os nomes dos sinais devem corresponder exatamente
     # aos handlers no QML (onLoginSuccess, onLoginError, etc.)
     
+    # Sinais e slots de dados entregam QVariantMap/QVariantList (objetos JS
+    # no QML, sem JSON.parse). Handlers antigos que ainda fazem JSON.parse
+    # funcionam com jsonPayloads: true.
+    
     # Auth signals
-    loginSuccess = Signal(str, name="loginSuccess")  # Emite JSON com dados do usuário
+    loginSuccess = Signal("QVariant", name="loginSuccess")  # Dados do usuário (QVariantMap)
     loginError = Signal(str, str, name="loginError")  # Emite mensagem de erro e código
     logoutSuccess = Signal(name="logoutSuccess")
+    accessRevoked = Signal(str, name="accessRevoked")  # Saiu do app sem ban/manutenção/licença/limite (motivo)
+    profileSwitched = Signal("QVariant", name="profileSwitched")  # Outro perfil salvo ativo (QVariantMap)
+    profilesChanged = Signal(name="profilesChanged")  # Lista de perfis salvos mudou (releia listProfiles)
     
     # Ban/Device signals
     userBanned = Signal(str, name="userBanned")      # Emite motivo do ban
-    deviceLimitReached = Signal(str, name="deviceLimitReached")  # Emite JSON com info de limite
+    deviceLimitReached = Signal("QVariant", name="deviceLimitReached")  # Info do limite (QVariantMap)
     maintenanceMode = Signal(str, name="maintenanceMode")  # Emite mensagem de manutenção
     
     # License/Trial signals
-    noLicense = Signal(str, name="noLicense")  # Sem licença ativa
-    trialAvailable = Signal(str, name="trialAvailable")  # Trial disponível
-    trialExpired = Signal(str, name="trialExpired")  # Trial expirado
+    noLicense = Signal("QVariant", name="noLicense")  # Sem licença ativa
+    trialAvailable = Signal("QVariant", name="trialAvailable")  # Trial disponível
+    trialExpired = Signal("QVariant", name="trialExpired")  # Trial expirado
+    licenseExpiring = Signal("QVariant", name="licenseExpiring")  # Cruzou um aviso (3 dias, 1 dia, 1 hora)
+    licenseExpired = Signal("QVariant", name="licenseExpired")    # Venceu pelo relógio local
     
     # Data signals
-    profileLoaded = Signal(str, name="profileLoaded")      # JSON do perfil
-    licenseLoaded = Signal(str, name="licenseLoaded")      # JSON da licença
+    profileLoaded = Signal("QVariant", name="profileLoaded")      # Perfil (QVariantMap)
+    licenseLoaded = Signal("QVariant", name="licenseLoaded")      # Licença (QVariantMap)
+    sessionsUpdated = Signal("QVariant", name="sessionsUpdated")  # Contadores do catálogo
+    actionProgress = Signal("QVariant", name="actionProgress")    # Progresso da ação
+    actionFinished = Signal("QVariant", name="actionFinished")    # Resultado final da ação
+    
+    # Async results (versões não bloqueantes dos slots de licença/trial)
+    licenseChecked = Signal("QVariant", name="licenseChecked")    # Resultado do check_license
+    trialChecked = Signal("QVariant", name="trialChecked")        # Resultado do check_trial
+    trialRegistered = Signal("QVariant", name="trialRegistered")  # Resultado do register_trial
     
     # Status signals
     loadingChanged = Signal(bool, name="loadingChanged")
     errorOccurred = Signal(str, name="errorOccurred")
+    recaptchaSettingsChanged = Signal(name="recaptchaSettingsChanged")
+    userChanged = Signal(name="userChanged")  # Usuário/plano mudou (detalhes em userState)
+    jsonPayloadsChanged = Signal(name="jsonPayloadsChanged")
+    serverAvailabilityChanged = Signal(bool, name="serverAvailabilityChanged")  # Circuit breaker
+    
+    # Interno: resultado do bootstrap do startup (emitido de outra thread)
+    _bootstrapFinished = Signal(object)
+    # Interno: circuit breaker mudou de estado (emitido da thread da requisição)
+    _availabilityChanged = Signal(bool)
+    # Interno: evento do canal Realtime (emitido da thread do canal)
+    _pushReceived = Signal(object)
     
     def __init__(self, parent=None):
         super().__init__(parent)
         self._loading = False
-        # Carregar configurações do reCAPTCHA na inicialização
-        api.load_recaptcha_settings()
+        self._json_payloads = False
+        # Usuário/plano para bindings no QML (atualizado quando as chamadas de auth retornam)
+        self._user_state = UserState(self)
+        self._user_state.changed.connect(self.userChanged)
+        # Chamadas de rede rodam em background, resultados voltam pelos sinais
+        self._tasks = TaskRunner(self)
+        # Bootstrap do startup (reCAPTCHA + verify_session em uma requisição).
+        # O main.py já o iniciou em paralelo com a compilação do QML.
+        self._bootstrap_pending = True
+        self._bootstrap_session: Optional[dict] = None
+        self._verify_requested = False
+        # Auto-login local pelo entitlement: o app já abriu e o servidor
+        # confirma em segundo plano (revogado = não tenta de novo)
+        self._revalidating = False
+        self._entitlement_revoked = False
+        # Revalidação de uma troca de perfil: sem confirmação do servidor, sai do app
+        self._switch_revalidating = False
+        self._bootstrapFinished.connect(self._on_bootstrap_finished)
+        self._availabilityChanged.connect(self.serverAvailabilityChanged)
+        api.add_availability_listener(self._availabilityChanged.emit)
+        api.start_bootstrap().add_done_callback(
+            lambda future: self._bootstrapFinished.emit(future.result())
+        )
+        # Catálogo das sessions do Telegram: sincroniza com a pasta em background
+        # e alimenta a lista da página Contas
+        self._accounts = AccountsModel(self)
+        self._accounts_view = AccountsFilterModel(self._accounts, self)
+        self._accounts_loaded = False
+        self.refreshSessions()
+        # Logs da página Ações: linhas que saem do painel vão para logs/actions.log
+        self._action_logs = LogModel(
+            spill_path=session_manager.get_logs_folder() / "actions.log", parent=self
+        )
+        # Ações (job runner): jobs interrompidos voltam pausados do checkpoint
+        self._jobs = JobRunner(
+            session_manager.get_app_data_path() / "jobs", log=self._action_logs.append, parent=self
+        )
+        self._jobs.progressChanged.connect(lambda state: self.actionProgress.emit(self._payload(state)))
+        self._jobs.jobFinished.connect(self._on_action_finished)
+        self._jobs.restore()
+        # Push do servidor (Supabase Realtime): ban, manutenção, licença e
+        # dispositivos chegam sem esperar o próximo verify_session
+        self._push = PushChannel(
+            api.REALTIME_URL, api.ANON_KEY, self._pushReceived.emit, lambda: api.realtime_token
+        )
+        self._pushReceived.connect(self._on_push_event)
+        self._push_revalidate = QTimer(self)
+        self._push_revalidate.setSingleShot(True)
+        self._push_revalidate.setInterval(PUSH_REVALIDATE_DELAY_MS)
+        self._push_revalidate.timeout.connect(self._revalidate_from_push)
+        self._push_revalidating = False
+        # Relógio da licença: avisos de vencimento na hora certa e
+        # revalidação em segundo plano (espaçada longe do vencimento)
+        self._license = LicenseScheduler(self)
+        self._license.remainingChanged.connect(self._user_state.refresh)
+        self._license.expiring.connect(lambda info: self.licenseExpiring.emit(self._payload(info)))
+        self._license.expired.connect(lambda info: self.licenseExpired.emit(self._payload(info)))
+        self._license.revalidate.connect(self._revalidate_scheduled)
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self._jobs.shutdown)
+            app.aboutToQuit.connect(self._action_logs.close)
+            app.aboutToQuit.connect(self._push.stop)
     
     # ========== PROPERTIES ==========
     
@@ -67,54 +181,105 @@ class Backend(QObject):
             self._loading = value
             self.loadingChanged.emit(value)
     
-    @Property(bool)
+    @Property(bool, notify=jsonPayloadsChanged)
+    def jsonPayloads(self) -> bool:
+        """Modo de compatibilidade: sinais/slots de dados entregam strings JSON"""
+        return self._json_payloads
+    
+    @jsonPayloads.setter
+    def jsonPayloads(self, value: bool):
+        if self._json_payloads != value:
+            self._json_payloads = value
+            self.jsonPayloadsChanged.emit()
+    
+    def _payload(self, value: Any) -> Any:
+        """Valor entregue ao QML: nativo ou, no modo de compatibilidade, JSON"""
+        return json.dumps(value) if self._json_payloads else value
+    
+    @Property(QObject, constant=True)
+    def userState(self) -> QObject:
+        """Usuário, plano e validade com um sinal por propriedade (prefira para bindings)"""
+        return self._user_state
+    
+    @Property(bool, notify=userChanged)
     def isAuthenticated(self) -> bool:
-        return api.is_authenticated
+        return self._user_state.authenticated
     
-    @Property(str)
+    @Property(str, notify=userChanged)
     def userId(self) -> str:
-        if api.user:
-            return api.user.get("id", "")
-        return ""
+        return self._user_state.userId
     
-    @Property(str)
+    @Property(str, notify=userChanged)
     def userEmail(self) -> str:
-        if api.user:
-            return api.user.get("email", "")
-        return ""
+        return self._user_state.email
     
-    @Property(str)
+    @Property(str, notify=userChanged)
     def userName(self) -> str:
-        return api.get_user_display_name()
+        return self._user_state.name
     
-    @Property(str)
+    @Property(str, notify=userChanged)
     def userAvatar(self) -> str:
-        return api.get_user_avatar()
+        return self._user_state.avatar
     
-    @Property(str)
+    @Property(str, notify=userChanged)
     def planName(self) -> str:
-        return api.get_plan_name()
+        return self._user_state.planName
     
-    @Property(str)
+    @Property(str, constant=True)
     def deviceFingerprint(self) -> str:
         """Retorna o fingerprint único deste dispositivo"""
         return api.device_fingerprint
     
-    @Property(str)
+    @Property(str, notify=userChanged)
     def accessType(self) -> str:
         """Retorna tipo de acesso: 'license', 'trial', ou 'none'"""
-        return api.get_access_type()
+        return self._user_state.accessType
     
-    @Property(bool)
+    @Property(bool, notify=recaptchaSettingsChanged)
     def recaptchaEnabled(self) -> bool:
         """Retorna se o reCAPTCHA está habilitado"""
         return api.recaptcha_enabled
     
-    @Property(str)
+    @Property(str, notify=recaptchaSettingsChanged)
     def recaptchaSiteKey(self) -> str:
         """Retorna a site key do reCAPTCHA"""
         return api.recaptcha_site_key
     
+    @Property(QObject, constant=True)
+    def accounts(self) -> QObject:
+        """Lista de contas (busca/ordenação) para a ListView da página Contas"""
+        return self._accounts_view
+    
+    @Property(QObject, constant=True)
+    def actionLogs(self) -> QObject:
+        """Logs das ações (ring buffer) para a ListView da página Ações"""
+        return self._action_logs
+    
+    @Property(bool, notify=serverAvailabilityChanged)
+    def serverAvailable(self) -> bool:
+        """False enquanto o servidor estiver fora do ar (requisições falham na hora)"""
+        return api.server_available
+    
+    @Slot(object)
+    def _on_bootstrap_finished(self, result: dict):
+        """Bootstrap terminou (thread da GUI)"""
+        self._bootstrap_pending = False
+        
+        # Sempre notifica: o QML relê recaptchaEnabled/SiteKey mesmo que
+        # o valor tenha sido aplicado antes de o Login se conectar ao sinal
+        self.recaptchaSettingsChanged.emit()
+        
+        session = result.get("session")
+        if self._verify_requested:
+            # QML já pediu o verifySession: entrega agora
+            self._verify_requested = False
+            if session is not None:
+                self._on_verify_session_result(session)
+            else:
+                self._start_verify_session()
+        else:
+            self._bootstrap_session = session
+    
     # ========== SLOTS (QML -> Python) ==========
     
     @Slot(str, str, str)
@@ -128,22 +293,31 @@ class Backend(QObject):
         5. Verifica licença/trial
         6. Verifica limite de dispositivos
         """
+        self._tasks.cancel("login")
+        self._tasks.cancel("verify_session")
+        self._verify_requested = False
+        self._bootstrap_session = None
+        self._revalidating = False
+        self._switch_revalidating = False
         self.loading = True
-        
-        result = api.full_login(email, password, recaptcha_token)
-        
+        self._tasks.submit("login", api.full_login, self._on_login_result, email, password, recaptcha_token)
+    
+    def _on_login_result(self, result: dict):
+        """Trata o resultado do full_login (thread da GUI)"""
         self.loading = False
+        self._user_state.refresh()
         
-        # LOG para debug
         success = result.get("success", False)
         access = result.get("access")
-        code = result.get("code", "")
-        print(f"[Bridge] Login result: success={success}, access={access}, code={code}")
+        logger.info("Login result: success=%s, access=%s, code=%s", success, access, result.get("code", ""))
         
         # Sucesso APENAS se success=True E access=True explicitamente
         if success is True and access is True:
             # Login bem-sucedido
-            self.loginSuccess.emit(json.dumps({
+            self._start_push()
+            self._schedule_license()
+            self.profilesChanged.emit()
+            self.loginSuccess.emit(self._payload({
                 "user": result.get("user"),
                 "license": result.get("license"),
                 "trial": result.get("trial"),
@@ -155,23 +329,23 @@ class Backend(QObject):
         error_code = result.get("code", "UNKNOWN")
         error_message = result.get("error") or result.get("message", "Erro desconhecido")
         
-        print(f"[Bridge] Erro no login: code={error_code}, message={error_message}")
+        logger.info("Erro no login: code=%s, message=%s", error_code, error_message)
         
         if error_code == "MAINTENANCE":
             self.maintenanceMode.emit(error_message)
         elif error_code == "BANNED":
             ban_reason = result.get("ban_reason") or result.get("message", "Conta suspensa")
-            print(f"[Bridge] Emitindo sinal userBanned: {ban_reason}")
+            logger.info("Emitindo sinal userBanned: %s", ban_reason)
             self.userBanned.emit(ban_reason)
         elif error_code == "DEVICE_LIMIT":
-            self.deviceLimitReached.emit(json.dumps({
+            self.deviceLimitReached.emit(self._payload({
                 "active_count": result.get("activeDevices", 0),
                 "max_allowed": result.get("maxDevices", 1),
                 "error": error_message
             }))
         elif error_code == "NO_LICENSE":
             # Sempre emite noLicense com informações de trial
-            self.noLicense.emit(json.dumps({
+            self.noLicense.emit(self._payload({
                 "can_use_trial": result.get("canUseTrial", False),
                 "trial_days": result.get("trialDays", 3),
                 "message": error_message
@@ -194,12 +368,47 @@ class Backend(QObject):
         """
         Verifica sessão salva localmente sem precisar de senha.
         Emite os mesmos sinais que o login normal.
+        
+        Com entitlement assinado válido, emite loginSuccess na hora e
+        revalida no servidor em segundo plano.
         """
-        self.loading = True
+        if self._tasks.is_running("verify_session") or self._verify_requested:
+            return
         
-        result = api.verify_session()
+        if not self._entitlement_revoked and not self._revalidating:
+            restored = api.restore_from_entitlement()
+            if restored is not None:
+                self._revalidating = True
+                self._emit_login_success(restored)
+        
+        if self._bootstrap_pending:
+            # O bootstrap já está verificando a sessão: aguarda o resultado
+            self._verify_requested = True
+            self.loading = not self._revalidating
+            return
+        
+        if self._bootstrap_session is not None:
+            result, self._bootstrap_session = self._bootstrap_session, None
+            self._on_verify_session_result(result)
+            return
         
+        self._start_verify_session()
+    
+    def _start_verify_session(self):
+        self.loading = not self._revalidating
+        self._tasks.submit("verify_session", api.verify_session, self._on_verify_session_result)
+    
+    def _on_verify_session_result(self, result: dict):
+        """Trata o resultado do verify_session (thread da GUI)"""
         self.loading = False
+        if result.get("code") == "PROFILE_SWITCHED":
+            # Resposta do perfil anterior: a verificação do atual já foi iniciada
+            return
+        self._user_state.refresh()
+        
+        if self._revalidating:
+            self._on_revalidation_result(result)
+            return
         
         # Se não tinha sessão
         if not result.get("has_session"):
@@ -207,15 +416,135 @@ class Backend(QObject):
         
         if result.get("success") and result.get("access"):
             # Sessão válida - login automático
-            self.loginSuccess.emit(json.dumps({
-                "user": result.get("user"),
-                "license": api.license,
-                "trial": api.trial,
-                "accessType": api.get_access_type()
-            }))
+            self._emit_login_success(result)
+            return
+        
+        self._emit_session_error(result)
+    
+    def _on_revalidation_result(self, result: dict):
+        """
+        Resposta do servidor para um auto-login local (entitlement).
+        O usuário já está no app: só sinaliza se o servidor negar o acesso.
+        """
+        self._revalidating = False
+        from_push, self._push_revalidating = self._push_revalidating, False
+        from_switch, self._switch_revalidating = self._switch_revalidating, False
+        
+        if result.get("success") and result.get("access"):
+            logger.info("Acesso confirmado pelo servidor")
+            # Token do canal Realtime pode ter sido renovado
+            self._start_push()
+            self._schedule_license()
+            if from_push:
+                self.profileLoaded.emit(self._payload(api.user))
+                self.licenseLoaded.emit(self._payload(api.license or api.trial))
             return
         
-        # Trata os diferentes tipos de erro
+        error_code = result.get("code", "UNKNOWN")
+        if error_code not in ("BANNED", "MAINTENANCE", "NO_LICENSE", "DEVICE_LIMIT"):
+            if from_switch:
+                # Perfil trocado só pelo entitlement: não fica no app sem o servidor confirmar
+                self._revoke_access({"code": error_code, "error": "Não foi possível confirmar o acesso do perfil"})
+                return
+            if self._license.is_expired:
+                # Venceu pelo relógio local e o servidor não confirmou renovação
+                self._revoke_access({"code": "NO_LICENSE", "error": "Licença expirada"})
+                return
+            # Sem rede/erro temporário: mantém o acesso até o entitlement expirar
+            logger.info("Revalidação falhou (%s), mantendo acesso local", error_code)
+            self._license.record_failure()
+            return
+        
+        self._revoke_access(result)
+    
+    def _revoke_access(self, result: dict):
+        """Servidor negou o acesso de quem já está no app (revalidação ou push)"""
+        error_code = result.get("code", "UNKNOWN")
+        logger.warning("Acesso revogado pelo servidor: %s", error_code)
+        self._entitlement_revoked = True
+        self._push_revalidate.stop()
+        self._push.stop()
+        self._license.stop()
+        if error_code in ("BANNED", "NO_LICENSE"):
+            api.clear_local_session()
+            self.profilesChanged.emit()
+        self._user_state.refresh()
+        if error_code in ("BANNED", "MAINTENANCE", "NO_LICENSE", "DEVICE_LIMIT"):
+            self._emit_session_error(result)
+        else:
+            self.accessRevoked.emit(result.get("error", "Sessão expirada"))
+    
+    # ========== PUSH (REALTIME) ==========
+    
+    def _start_push(self):
+        """Assina as mudanças do usuário logado (ou atualiza o token do canal)"""
+        user_id = (api.user or {}).get("id")
+        if user_id:
+            self._push.start(user_id, api.device_fingerprint)
+    
+    @Slot(object)
+    def _on_push_event(self, event: dict):
+        """Mudança empurrada pelo servidor (thread da GUI)"""
+        if not api.is_authenticated:
+            return
+        
+        kind = event.get("type")
+        if kind == "banned":
+            reason = event.get("reason", "Conta suspensa")
+            self._revoke_access({"code": "BANNED", "ban_reason": reason, "error": reason})
+        elif kind == "maintenance":
+            if event.get("active"):
+                self._revoke_access({"code": "MAINTENANCE", "error": "Sistema em manutenção"})
+        else:
+            # Licença, dispositivo ou perfil: o verify_session decide (e atualiza o estado)
+            self._push_revalidate.start()
+    
+    def _revalidate_from_push(self):
+        if not api.is_authenticated:
+            return
+        if self._tasks.is_running("verify_session"):
+            # Resposta em andamento pode ser anterior à mudança: confere de novo depois
+            self._push_revalidate.start()
+            return
+        self._revalidating = True
+        self._push_revalidating = True
+        self._start_verify_session()
+    
+    # ========== LICENÇA ==========
+    
+    def _schedule_license(self):
+        """Rearma o relógio da licença com o vencimento atual"""
+        access = api.license or api.trial or {}
+        self._license.start(access.get("expires_at"))
+    
+    def _revalidate_scheduled(self):
+        """Timer do LicenseScheduler: confirma a licença no servidor em segundo plano"""
+        if not api.is_authenticated:
+            return
+        if self._tasks.is_running("verify_session"):
+            # A verificação em andamento rearma o scheduler quando voltar
+            self._license.reschedule()
+            return
+        self._revalidating = True
+        self._start_verify_session()
+    
+    def _emit_login_success(self, result: dict):
+        self._user_state.refresh()
+        self._start_push()
+        self._schedule_license()
+        self.loginSuccess.emit(self._payload(self._access_payload(result)))
+    
+    @staticmethod
+    def _access_payload(result: dict) -> dict:
+        return {
+            "user": result.get("user"),
+            "license": api.license,
+            "trial": api.trial,
+            "accessType": api.get_access_type()
+        }
+    
+    def _emit_session_error(self, result: dict):
+        """Emite o sinal correspondente ao erro do verify_session"""
         error_code = result.get("code", "UNKNOWN")
         error_message = result.get("error", "Sessão expirada")
         
@@ -224,13 +553,13 @@ class Backend(QObject):
         elif error_code == "BANNED":
             self.userBanned.emit(result.get("ban_reason", error_message))
         elif error_code == "DEVICE_LIMIT":
-            self.deviceLimitReached.emit(json.dumps({
+            self.deviceLimitReached.emit(self._payload({
                 "active_count": result.get("activeDevices", 0),
                 "max_allowed": result.get("maxDevices", 1),
                 "error": error_message
             }))
         elif error_code == "NO_LICENSE":
-            self.noLicense.emit(json.dumps({
+            self.noLicense.emit(self._payload({
                 "can_use_trial": result.get("canUseTrial", False),
                 "trial_days": result.get("trialDays", 3),
                 "message": error_message
@@ -240,34 +569,169 @@ class Backend(QObject):
     @Slot()
     def clearLocalSession(self):
         """Limpa sessão local sem chamar o servidor"""
+        self._push.stop()
+        self._license.stop()
         api.clear_local_session()
+        self._user_state.refresh()
+        self.profilesChanged.emit()
     
     @Slot()
     def logout(self):
         """Faz logout"""
-        result = api.logout()
+        # Login/verificação em andamento não devem mais entrar no app
+        self._tasks.cancel()
+        self._push_revalidate.stop()
+        self._push.stop()
+        self._license.stop()
+        self._verify_requested = False
+        self._bootstrap_session = None
+        self._revalidating = False
+        self._push_revalidating = False
+        self._switch_revalidating = False
+        self.loading = False
+        self._tasks.submit("logout", api.logout, self._on_logout_result)
+    
+    def _on_logout_result(self, result: dict):
+        self._user_state.refresh()
+        self.profilesChanged.emit()
         if result.get("success"):
             self.logoutSuccess.emit()
         else:
             self.errorOccurred.emit(result.get("error", "Erro ao sair"))
     
-    @Slot(result=str)
-    def checkLicense(self) -> str:
-        """Verifica licença do usuário atual"""
+    # ========== PERFIS ==========
+    
+    @Slot(result="QVariant")
+    def listProfiles(self) -> Any:
+        """Perfis salvos neste dispositivo (o ativo marcado com "active")"""
+        return self._payload(api.list_profiles())
+    
+    @Slot(str)
+    def switchProfile(self, user_id: str):
+        """
+        Troca para outro perfil salvo. Com entitlement válido entra na hora e
+        o servidor confirma em segundo plano (como no auto-login local); se
+        negar, ou não responder, o acesso é revogado. Sem entitlement válido,
+        sai do app (accessRevoked) e espera o verify_session, como num login.
+        """
+        if user_id == (api.user or {}).get("id"):
+            return
+        if self._tasks.is_running("login"):
+            self.errorOccurred.emit("Aguarde o login em andamento")
+            return
+        
+        was_authenticated = api.is_authenticated
+        # Verificações em andamento são do perfil anterior
+        self._tasks.cancel("verify_session")
+        self._push_revalidate.stop()
+        self._verify_requested = False
+        self._bootstrap_session = None
+        self._push_revalidating = False
+        
+        result = api.switch_profile(user_id)
+        if not result.get("success"):
+            self.profilesChanged.emit()
+            self.errorOccurred.emit(result.get("error", "Erro ao trocar de perfil"))
+            return
+        
+        self._entitlement_revoked = False
+        self.profilesChanged.emit()
+        if not result.get("access"):
+            self._revalidating = False
+            self._switch_revalidating = False
+            self._push.stop()
+            self._license.stop()
+            self._user_state.refresh()
+            if was_authenticated:
+                self.accessRevoked.emit("Confirmando o acesso do perfil no servidor...")
+            self._start_verify_session()
+            return
+        
+        self._revalidating = True
+        self._switch_revalidating = True
+        if was_authenticated:
+            self._user_state.refresh()
+            self._start_push()
+            self._schedule_license()
+            self.profileSwitched.emit(self._payload(self._access_payload(result)))
+        else:
+            self._emit_login_success(result)
+        self._start_verify_session()
+    
+    @Slot(str)
+    def removeProfile(self, user_id: str):
+        """Esquece um perfil salvo (o ativo equivale a logout)"""
+        if user_id == session_manager.get_user_id():
+            self.logout()
+            return
+        self._tasks.submit("remove_profile", api.forget_profile, self._on_profile_removed, user_id)
+    
+    def _on_profile_removed(self, result: dict):
+        self.profilesChanged.emit()
+        if not result.get("success"):
+            self.errorOccurred.emit(result.get("error", "Erro ao remover perfil"))
+    
+    @Slot()
+    def cancelPending(self):
+        """Cancela operações em andamento (ex: usuário saiu da tela)"""
+        cancelled = self._tasks.cancel()
+        self._verify_requested = False
+        self._revalidating = False
+        self._push_revalidating = False
+        self._switch_revalidating = False
+        if cancelled:
+            logger.info("%s operação(ões) cancelada(s)", cancelled)
+        self.loading = False
+    
+    @Slot(result="QVariant")
+    def checkLicense(self) -> Any:
+        """Verifica licença do usuário atual (bloqueante - prefira checkLicenseAsync)"""
         result = api.check_license()
-        return json.dumps(result)
+        self._user_state.refresh()
+        return self._payload(result)
     
-    @Slot(result=str)
-    def checkTrial(self) -> str:
-        """Verifica trial para este dispositivo"""
+    @Slot()
+    def checkLicenseAsync(self):
+        """Verifica licença em background; resultado em licenseChecked"""
+        self._tasks.submit("check_license", api.check_license, self._on_license_checked)
+    
+    def _on_license_checked(self, result: dict):
+        self._user_state.refresh()
+        self.licenseChecked.emit(self._payload(result))
+    
+    @Slot(result="QVariant")
+    def checkTrial(self) -> Any:
+        """Verifica trial para este dispositivo (bloqueante - prefira checkTrialAsync)"""
         result = api.check_trial()
-        return json.dumps(result)
+        self._user_state.refresh()
+        return self._payload(result)
     
-    @Slot(result=str)
-    def registerTrial(self) -> str:
-        """Registra trial para o usuário/dispositivo atual"""
+    @Slot()
+    def checkTrialAsync(self):
+        """Verifica trial em background; resultado em trialChecked"""
+        self._tasks.submit("check_trial", api.check_trial, self._on_trial_checked)
+    
+    def _on_trial_checked(self, result: dict):
+        self._user_state.refresh()
+        self.trialChecked.emit(self._payload(result))
+    
+    @Slot(result="QVariant")
+    def registerTrial(self) -> Any:
+        """Registra trial para o usuário/dispositivo atual (bloqueante - prefira registerTrialAsync)"""
         result = api.register_trial()
-        return json.dumps(result)
+        self._user_state.refresh()
+        return self._payload(result)
+    
+    @Slot()
+    def registerTrialAsync(self):
+        """Registra trial em background; resultado em trialRegistered"""
+        self.loading = True
+        self._tasks.submit("register_trial", api.register_trial, self._on_register_trial_result)
+    
+    def _on_register_trial_result(self, result: dict):
+        self.loading = False
+        self._user_state.refresh()
+        self.trialRegistered.emit(self._payload(result))
     
     @Slot(result=bool)
     def hasActiveLicense(self) -> bool:
@@ -289,37 +753,188 @@ class Backend(QObject):
         """Retorna dias restantes da licença"""
         return api.get_license_days_remaining()
     
-    @Slot(result=str)
-    def getDeviceInfo(self) -> str:
+    @Slot(result="QVariant")
+    def getDeviceInfo(self) -> Any:
         """Retorna informações do dispositivo atual"""
-        return json.dumps(api._get_device_info())
+        return self._payload(api._get_device_info())
+    
+    # ========== SESSIONS DO TELEGRAM ==========
+    
+    @Slot()
+    def refreshSessions(self):
+        """Reindexa a pasta de sessions (só arquivos alterados); contadores em sessionsUpdated"""
+        if self._tasks.is_running("session_scan"):
+            return
+        self._tasks.submit(
+            "session_scan", self._scan_sessions, self._on_sessions_scanned, not self._accounts_loaded
+        )
+    
+    @staticmethod
+    def _scan_sessions(load_all: bool) -> dict:
+        result = session_catalog.scan()
+        # Linhas só vão para o modelo se algo mudou (a leitura também roda aqui, fora da GUI)
+        rows = session_catalog.query(limit=-1) if load_all or result.changed else None
+        return {"rows": rows, "stats": session_catalog.stats()}
+    
+    def _on_sessions_scanned(self, result: dict):
+        if "stats" not in result:
+            logger.warning("Erro ao indexar sessions: %s", result.get("error"))
+            return
+        if result["rows"] is not None:
+            self._accounts.reload(result["rows"])
+            self._accounts_loaded = True
+        self.sessionsUpdated.emit(self._payload(result["stats"]))
+    
+    @Slot(str)
+    def deleteSession(self, path: str):
+        """Apaga a session do Telegram (arquivo + catálogo) e tira da lista"""
+        self._tasks.submit("delete_session", self._delete_session, self._on_session_deleted, path)
+    
+    @staticmethod
+    def _delete_session(path: str) -> dict:
+        try:
+            session_catalog.delete(path)
+        except OSError as e:
+            return {"success": False, "error": f"Erro ao excluir sessão: {e}"}
+        return {"success": True, "path": path, "stats": session_catalog.stats()}
+    
+    def _on_session_deleted(self, result: dict):
+        if not result.get("success"):
+            self.errorOccurred.emit(result.get("error", "Erro ao excluir sessão"))
+            return
+        self._accounts.remove(result["path"])
+        self.sessionsUpdated.emit(self._payload(result["stats"]))
+    
+    @Slot(result="QVariant")
+    def getSessionStats(self) -> Any:
+        """Contadores dos cards (total, por status, adicionados hoje)"""
+        return self._payload(session_catalog.stats())
+    
+    @Slot(str, str, int, int, result="QVariant")
+    def searchSessions(self, query: str, status: str = "", limit: int = 100, offset: int = 0) -> Any:
+        """Busca no catálogo por telefone/status (paginado)"""
+        return self._payload({
+            "total": session_catalog.count(query, status or None),
+            "items": session_catalog.query(query, status or None, limit, offset)
+        })
+    
+    # ========== AÇÕES ==========
+    
+    @Slot(str, "QVariant")
+    def startAction(self, action: str, params: Any):
+        """
+        Inicia (ou enfileira) uma ação com as contas ativas.
+        Delay/limite vêm dos parâmetros da página (objeto ou JSON) ou das Configurações.
+        """
+        try:
+            params = dict(_from_qml(params) or {})
+            saved = self._action_settings()
+            settings = JobSettings(
+                delay_seconds=float(params.pop("delay", None) or saved.delay_seconds),
+                limit_per_account=int(params.pop("limit", None) or saved.limit_per_account),
+                random_delay=saved.random_delay,
+            )
+            sessions_folder = session_manager.get_sessions_folder()
+            accounts = [
+                str(sessions_folder / row["path"])
+                for row in session_catalog.query(status="active", limit=-1)
+            ]
+            self._jobs.submit(action, params, accounts, settings)
+        except (ValueError, TypeError) as e:
+            self._action_logs.append("error", str(e))
+            self.errorOccurred.emit(str(e))
+    
+    @Slot()
+    def pauseAction(self):
+        self._jobs.pause()
+    
+    @Slot()
+    def resumeAction(self):
+        self._jobs.resume()
+    
+    @Slot()
+    def cancelAction(self):
+        self._jobs.cancel()
+    
+    @Slot(result="QVariant")
+    def getActionStatus(self) -> Any:
+        """Estado da ação atual (status, progresso, conta em uso)"""
+        return self._payload(self._jobs.snapshot())
+    
+    def _on_action_finished(self, state: dict):
+        self.actionFinished.emit(self._payload(state))
+        # Contas usadas/marcadas com flood durante a ação
+        self.refreshSessions()
+    
+    def _action_settings(self) -> JobSettings:
+        saved = session_manager.get_section("settings")
+        defaults = JobSettings()
+        return JobSettings(
+            delay_seconds=float(saved.get("action_delay", defaults.delay_seconds)),
+            limit_per_account=int(saved.get("action_limit", defaults.limit_per_account)),
+            random_delay=bool(saved.get("anti_ban", defaults.random_delay)),
+        )
+    
+    @Slot(result="QVariant")
+    def getActionSettings(self) -> Any:
+        """Delay, limite por conta e Anti-Ban salvos nas Configurações"""
+        settings = self._action_settings()
+        return self._payload({
+            "delay": settings.delay_seconds,
+            "limit": settings.limit_per_account,
+            "antiBan": settings.random_delay,
+        })
+    
+    @Slot(float, int, bool)
+    def saveActionSettings(self, delay: float, limit: int, anti_ban: bool):
+        session_manager.update_section(
+            "settings", action_delay=max(0.0, delay), action_limit=max(1, limit), anti_ban=anti_ban
+        )
+    
+    # ========== DIAGNÓSTICO ==========
+    
+    @Slot(result="QVariant")
+    def getApiMetrics(self) -> Any:
+        """Retorna latência/status/erros por ação da API (QVariantMap; painel de diagnóstico)"""
+        return self._payload(metrics.snapshot())
     
     @Slot(result=str)
-    def getAccessType(self) -> str:
-        """Retorna tipo de acesso: 'license', 'trial', ou 'none'"""
-        return api.get_access_type()
+    def exportApiMetrics(self) -> str:
+        """Grava o snapshot OpenMetrics na pasta de logs e retorna o caminho"""
+        try:
+            return str(metrics.export_openmetrics(session_manager.get_logs_folder()))
+        except OSError as e:
+            logger.warning("Erro ao exportar métricas: %s", e)
+            self.errorOccurred.emit("Erro ao exportar métricas")
+            return ""
     
     @Slot(result=str)
-    def getUserInfo(self) -> str:
-        """Retorna informações completas do usuário"""
-        return json.dumps({
-            "id": api.user.get("id") if api.user else None,
-            "email": api.user.get("email") if api.user else None,
-            "name": api.get_user_display_name(),
-            "avatar": api.get_user_avatar(),
-            "plan": api.get_plan_name(),
-            "accessType": api.get_access_type(),
-            "isAuthenticated": api.is_authenticated,
+    def getAccessType(self) -> str:
+        """Retorna tipo de acesso: 'license', 'trial', ou 'none'"""
+        return self._user_state.accessType
+    
+    @Slot(result="QVariant")
+    def getUserInfo(self) -> Any:
+        """Retorna informações completas do usuário (para bindings, use userState)"""
+        state = self._user_state
+        return self._payload({
+            "id": state.userId or None,
+            "email": state.email or None,
+            "name": state.name,
+            "avatar": state.avatar,
+            "plan": state.planName,
+            "accessType": state.accessType,
+            "isAuthenticated": state.authenticated,
             "license": api.license,
             "trial": api.trial
         })
     
-    @Slot(result=str)
-    def getLicenseInfo(self) -> str:
+    @Slot(result="QVariant")
+    def getLicenseInfo(self) -> Any:
         """Retorna informações da licença"""
-        return json.dumps(api.license or {})
+        return self._payload(api.license or {})
     
-    @Slot(result=str)
-    def getTrialInfo(self) -> str:
+    @Slot(result="QVariant")
+    def getTrialInfo(self) -> Any:
         """Retorna informações do trial"""
-        return json.dumps(api.trial or {})
+        return self._payload(api.trial or {})
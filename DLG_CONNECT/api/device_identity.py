@@ -0,0 +1,175 @@
+"""
+DLG Connect - Device Identity
+Fingerprint e informações do dispositivo, calculados uma vez e salvos em disco
+"""
+
+import json
+import hashlib
+import os
+import platform
+import socket
+import threading
+import uuid
+from pathlib import Path
+from typing import Optional, Dict, Any
+
+from .logger import get_logger
+
+logger = get_logger("device")
+
+
+class DeviceIdentity:
+    """
+    Identidade do dispositivo usada no login, verify_session e trial.
+
+    O fingerprint é salvo em device.json (junto do session.json) e só é
+    recalculado quando o hostname ou o MAC mudam. O IP é resolvido em
+    background com tempo limite, sem bloquear o login.
+    """
+
+    IDENTITY_FILE = "device.json"
+    FORMAT_VERSION = 1
+    IP_RESOLVE_TIMEOUT = 2.0
+
+    def __init__(self, app_data_path: Path):
+        self._path = Path(app_data_path) / self.IDENTITY_FILE
+        self._identity: Optional[Dict[str, Any]] = None
+        self._device_info: Optional[Dict[str, Any]] = None
+        self._ip_address = "unknown"
+        self._ip_resolved = threading.Event()
+        self._ip_waited = False
+        self._lock = threading.Lock()
+
+    # ========== API PÚBLICA ==========
+
+    @property
+    def fingerprint(self) -> str:
+        return self._ensure_identity()["fingerprint"]
+
+    def get_device_info(self) -> Dict[str, Any]:
+        """Informações enviadas ao servidor (custo: leitura de dicionário)"""
+        info = self._device_info
+        if info is None:
+            identity = self._ensure_identity()
+
+            if not self._ip_waited:
+                # Só espera o DNS uma vez, e no máximo IP_RESOLVE_TIMEOUT
+                self._ip_resolved.wait(self.IP_RESOLVE_TIMEOUT)
+                self._ip_waited = True
+
+            info = {
+                "device_fingerprint": identity["fingerprint"],
+                "device_name": identity["hostname"],
+                "device_os": identity["device_os"],
+                "machine_id": identity["hostname"],
+                "ip_address": self._ip_address
+            }
+            self._device_info = info
+
+        return dict(info)
+
+    def invalidate(self):
+        """Força recálculo na próxima chamada (ex: troca de hardware detectada)"""
+        with self._lock:
+            self._identity = None
+            self._device_info = None
+            try:
+                self._path.unlink()
+            except FileNotFoundError:
+                pass
+
+    # ========== CÁLCULO / PERSISTÊNCIA ==========
+
+    def _ensure_identity(self) -> Dict[str, Any]:
+        identity = self._identity
+        if identity is not None:
+            return identity
+
+        with self._lock:
+            if self._identity is None:
+                self._identity = self._load_or_compute()
+                self._start_ip_resolution()
+            return self._identity
+
+    def _load_or_compute(self) -> Dict[str, Any]:
+        hostname = platform.node()
+        mac_address = uuid.getnode()
+
+        saved = self._load()
+        if (
+            saved
+            and saved.get("version") == self.FORMAT_VERSION
+            and saved.get("hostname") == hostname
+            and saved.get("mac_address") == mac_address
+            and saved.get("fingerprint")
+        ):
+            if saved.get("ip_address"):
+                # Último IP conhecido até a nova resolução terminar
+                self._ip_address = saved["ip_address"]
+            return saved
+
+        logger.info("Calculando identidade do dispositivo")
+        identity = {
+            "version": self.FORMAT_VERSION,
+            "fingerprint": self._generate_fingerprint(hostname, mac_address),
+            "hostname": hostname,
+            "mac_address": mac_address,
+            "device_os": f"{platform.system()} {platform.release()}",
+        }
+        self._save(identity)
+        return identity
+
+    def _generate_fingerprint(self, hostname: str, mac_address: int) -> str:
+        """
+        Gera fingerprint único do dispositivo para controle de trial.
+        Mesma fórmula das versões anteriores - o servidor associa o trial a ele.
+        """
+        try:
+            processor = platform.processor()
+            system = platform.system()
+            release = platform.release()
+
+            fingerprint_data = f"{hostname}-{mac_address}-{processor}-{system}-{release}"
+            return hashlib.sha256(fingerprint_data.encode()).hexdigest()
+        except Exception:
+            return str(uuid.uuid4())
+
+    def _load(self) -> Optional[Dict[str, Any]]:
+        try:
+            if self._path.exists():
+                with open(self._path, "r", encoding="utf-8") as f:
+                    return json.load(f)
+        except Exception as e:
+            logger.warning("Erro ao ler identidade: %s", e)
+        return None
+
+    def _save(self, identity: Dict[str, Any]):
+        tmp_path = self._path.with_suffix(".tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(identity, f)
+            os.replace(tmp_path, self._path)
+        except Exception as e:
+            logger.warning("Erro ao salvar identidade: %s", e)
+
+    # ========== IP ==========
+
+    def _start_ip_resolution(self):
+        def resolve():
+            try:
+                ip_address = socket.gethostbyname(socket.gethostname())
+            except Exception:
+                ip_address = "unknown"
+
+            self._ip_address = ip_address
+            # Recria o dicionário com o novo IP na próxima chamada
+            self._device_info = None
+            self._ip_resolved.set()
+
+            with self._lock:
+                identity = self._identity
+                if identity is not None and identity.get("ip_address") != ip_address:
+                    identity["ip_address"] = ip_address
+                    self._save(identity)
+
+        threading.Thread(target=resolve, name="device-ip", daemon=True).start()
@@ -0,0 +1,73 @@
+"""
+DLG Connect - Entitlement
+Validação local do entitlement assinado pelo servidor (auto-login sem rede)
+"""
+
+import base64
+import binascii
+import importlib.util
+import json
+import time
+from typing import Optional, Dict, Any
+
+from .logger import get_logger
+
+# cryptography é necessário só para validar a assinatura (importado no
+# primeiro uso); sem ele o auto-login volta a depender do verify_session
+try:
+    CRYPTO_AVAILABLE = importlib.util.find_spec("cryptography") is not None
+except ValueError:
+    CRYPTO_AVAILABLE = False
+
+logger = get_logger("entitlement")
+
+# Tolerância para relógios levemente fora de sincronia (segundos)
+CLOCK_SKEW = 60
+
+
+def _b64url_decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def verify_entitlement(
+    token: str,
+    public_key: str,
+    device_fingerprint: str,
+    user_id: str
+) -> Optional[Dict[str, Any]]:
+    """
+    Valida o entitlement "payload.assinatura" (base64url, Ed25519).
+
+    Retorna as claims se a assinatura confere, o token não expirou e foi
+    emitido para este usuário e dispositivo. Caso contrário retorna None.
+    """
+    if not token or not public_key or not CRYPTO_AVAILABLE:
+        return None
+
+    from cryptography.exceptions import InvalidSignature
+    from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PublicKey
+
+    try:
+        payload_b64, signature_b64 = token.split(".")
+        key = Ed25519PublicKey.from_public_bytes(base64.b64decode(public_key))
+        key.verify(_b64url_decode(signature_b64), payload_b64.encode("ascii"))
+        claims = json.loads(_b64url_decode(payload_b64))
+    except InvalidSignature:
+        logger.warning("Assinatura inválida")
+        return None
+    except (ValueError, binascii.Error) as e:
+        logger.warning("Token malformado: %s", e)
+        return None
+
+    now = time.time()
+    if claims.get("exp", 0) + CLOCK_SKEW < now:
+        logger.info("Token expirado")
+        return None
+    if claims.get("iat", 0) - CLOCK_SKEW > now:
+        logger.warning("Token emitido no futuro (relógio do sistema?)")
+        return None
+    if claims.get("sub") != user_id or claims.get("fp") != device_fingerprint:
+        logger.warning("Token de outro usuário/dispositivo")
+        return None
+
+    return claims
@@ -0,0 +1,462 @@
+"""
+DLG Connect - Job Runner
+Execução das ações (adicionar membros, DM, entrar/sair de grupos) em background,
+com pausa/retomada, checkpoint em disco e progresso em taxa limitada
+"""
+
+import json
+import random
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Callable
+
+from PySide6.QtCore import QObject, QTimer, Qt, Signal, Slot
+
+from .logger import get_logger
+from .state_store import atomic_write_json
+
+logger = get_logger("jobs")
+
+
+class AccountUnavailable(Exception):
+    """A conta não pode continuar nesta ação (flood, ban...); as outras seguem"""
+
+    def __init__(self, message: str, status: Optional[str] = None):
+        super().__init__(message)
+        self.status = status  # status do catálogo a aplicar (ex: "flood_2d")
+
+
+class ActionHandler:
+    """
+    Implementação de uma ação. prepare() monta a lista de itens (membros,
+    chats...) uma vez por job; process() executa um item com uma conta.
+    Erros comuns contam como falha do item; AccountUnavailable tira a
+    conta do job.
+    """
+
+    def prepare(self, job: "Job") -> List[str]:
+        return list(job.params.get("items", []))
+
+    def process(self, job: "Job", item: str, account: str) -> str:
+        raise NotImplementedError
+
+
+# action -> handler (registrados pelo módulo que fala com o Telegram)
+ACTION_HANDLERS: Dict[str, ActionHandler] = {}
+
+
+def register_action(action: str, handler: ActionHandler):
+    ACTION_HANDLERS[action] = handler
+
+
+@dataclass
+class JobSettings:
+    """Delay entre itens da mesma conta e limite de itens por conta (Configurações)"""
+
+    delay_seconds: float = 30.0
+    limit_per_account: int = 50
+    # Anti-Ban Mode: até +50% de delay aleatório
+    random_delay: bool = True
+
+
+@dataclass
+class Job:
+    """Estado de uma execução; é o que vai para o checkpoint"""
+
+    id: str
+    action: str
+    params: Dict[str, Any]
+    accounts: List[str]
+    settings: JobSettings
+    status: str = "queued"      # queued, running, paused, done, cancelled, failed
+    items: Optional[List[str]] = None
+    cursor: int = 0             # próximo item ainda não entregue a uma conta
+    retry: List[int] = field(default_factory=list)  # itens a refazer (em andamento no crash)
+    processed: int = 0
+    failed: int = 0
+    per_account: Dict[str, int] = field(default_factory=dict)
+    exhausted: List[str] = field(default_factory=list)  # contas fora do job
+    error: str = ""
+    created_at: float = field(default_factory=time.time)
+
+    @property
+    def total(self) -> int:
+        return len(self.items or [])
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Job":
+        data = dict(data)
+        data["settings"] = JobSettings(**data.get("settings", {}))
+        return cls(**data)
+
+
+class JobRunner(QObject):
+    """
+    Fila de jobs executada fora da thread da GUI.
+
+    Um job por vez; dentro dele cada conta roda em uma thread do pool,
+    pegando o próximo item da fila compartilhada e esperando o delay
+    configurado antes do item seguinte, até o limite por conta.
+
+    O estado é gravado em jobs/<id>.json a cada CHECKPOINT_INTERVAL (e
+    ao pausar/terminar). Jobs interrompidos por crash/fechamento voltam
+    pausados no próximo start e continuam de onde pararam; itens que
+    estavam em andamento são refeitos.
+
+    progressChanged é emitido no máximo a cada PROGRESS_INTERVAL_MS,
+    com o estado mais recente, não uma vez por item.
+    """
+
+    MAX_WORKERS = 4
+    PROGRESS_INTERVAL_MS = 250
+    CHECKPOINT_INTERVAL = 1.0
+
+    progressChanged = Signal(object, name="progressChanged")   # dict (snapshot)
+    jobFinished = Signal(object, name="jobFinished")           # dict (snapshot final)
+    # Interno: job terminou (emitido da thread do job)
+    _jobEnded = Signal(str)
+
+    def __init__(self, jobs_folder: Path, log: Optional[Callable[[str, str], None]] = None,
+                 parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self._folder = Path(jobs_folder)
+        self._folder.mkdir(parents=True, exist_ok=True)
+        self._log = log or (lambda level, message: None)
+        self._lock = threading.Lock()
+        self._queue: "deque[Job]" = deque()
+        self._current: Optional[Job] = None
+        self._current_accounts: Dict[str, str] = {}  # thread -> conta em uso
+        self._in_flight: set = set()
+        self._thread: Optional[threading.Thread] = None
+        self._resume_event = threading.Event()
+        self._cancel_event = threading.Event()
+        self._shutting_down = False
+        self._dirty = False
+        self._last_checkpoint = 0.0
+
+        self._progress_timer = QTimer(self)
+        self._progress_timer.setInterval(self.PROGRESS_INTERVAL_MS)
+        self._progress_timer.timeout.connect(self._emit_progress)
+        self._jobEnded.connect(self._on_job_ended, Qt.QueuedConnection)
+
+    # ========== API (thread da GUI) ==========
+
+    def submit(self, action: str, params: Dict[str, Any], accounts: List[str], settings: JobSettings) -> str:
+        """Enfileira uma ação; começa na hora se não houver outra rodando"""
+        if action not in ACTION_HANDLERS:
+            raise ValueError(f"Ação não disponível: {action}")
+        if not accounts:
+            raise ValueError("Nenhuma conta ativa para a ação")
+
+        job = Job(uuid.uuid4().hex[:12], action, dict(params), list(accounts), settings)
+        self._write_checkpoint(job)
+        self._queue.append(job)
+        logger.info("Job %s (%s) enfileirado com %d conta(s)", job.id, action, len(accounts))
+        self._start_next()
+        return job.id
+
+    def pause(self) -> bool:
+        job = self._current
+        if job is None or job.status != "running":
+            return False
+        self._resume_event.clear()
+        job.status = "paused"
+        self._log("warning", "Execução pausada")
+        self._write_checkpoint(job)
+        self._emit_progress(force=True)
+        return True
+
+    def resume(self) -> bool:
+        job = self._current
+        if job is None or job.status != "paused":
+            return False
+        job.status = "running"
+        self._log("info", "Execução retomada")
+        self._resume_event.set()
+        if not self._is_running():
+            self._launch(job)
+        self._progress_timer.start()
+        self._emit_progress(force=True)
+        return True
+
+    def cancel(self) -> bool:
+        job = self._current
+        if job is None:
+            return False
+        self._cancel_event.set()
+        self._resume_event.set()
+        if not self._is_running():
+            # Job restaurado e ainda não iniciado: termina aqui mesmo
+            job.status = "cancelled"
+            self._finish(job)
+        return True
+
+    def restore(self) -> int:
+        """Carrega jobs interrompidos (checkpoints) como pausados; retorna quantos"""
+        restored = []
+        for path in sorted(self._folder.glob("*.json"), key=lambda p: p.stat().st_mtime):
+            try:
+                job = Job.from_dict(json.loads(path.read_text(encoding="utf-8")))
+            except Exception as e:
+                logger.warning("Checkpoint inválido %s: %s", path.name, e)
+                path.unlink(missing_ok=True)
+                continue
+            if job.status in ("done", "cancelled", "failed"):
+                path.unlink(missing_ok=True)
+                continue
+            job.status = "paused"
+            restored.append(job)
+
+        if restored:
+            self._queue.extend(restored)
+            logger.info("%d job(s) restaurado(s) do checkpoint", len(restored))
+            self._start_next(paused=True)
+        return len(restored)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Estado atual para a página Ações"""
+        job = self._current
+        if job is None:
+            return {"status": "idle", "queued": len(self._queue)}
+        with self._lock:
+            accounts = list(self._current_accounts.values())
+            total = job.total
+            done = job.processed + job.failed
+            return {
+                "jobId": job.id,
+                "action": job.action,
+                "status": job.status,
+                "processed": job.processed,
+                "failed": job.failed,
+                "done": done,
+                "total": total,
+                "progress": int(done * 100 / total) if total else 0,
+                "currentAccount": _label(accounts[-1]) if accounts else "",
+                "activeAccounts": len(job.accounts) - len(job.exhausted),
+                "queued": len(self._queue),
+                "error": job.error,
+            }
+
+    def shutdown(self, timeout: float = 5.0):
+        """Pausa e grava o checkpoint (fechamento do app); retomado no próximo start"""
+        job = self._current
+        if job is None:
+            return
+        self._shutting_down = True
+        self._cancel_event.set()
+        self._resume_event.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        if job.status in ("running", "paused"):
+            job.status = "paused"
+            self._write_checkpoint(job)
+
+    # ========== EXECUÇÃO ==========
+
+    def _is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _start_next(self, paused: bool = False):
+        if self._current is not None or not self._queue:
+            return
+        job = self._queue.popleft()
+        self._current = job
+        self._cancel_event.clear()
+        if paused or job.status == "paused":
+            job.status = "paused"
+            self._resume_event.clear()
+            self._emit_progress(force=True)
+            return
+        job.status = "running"
+        self._resume_event.set()
+        self._launch(job)
+        self._progress_timer.start()
+
+    def _launch(self, job: Job):
+        self._thread = threading.Thread(target=self._run_job, args=(job,), name=f"job-{job.id}", daemon=True)
+        self._thread.start()
+
+    def _run_job(self, job: Job):
+        handler = ACTION_HANDLERS.get(job.action)
+        try:
+            if handler is None:
+                raise ValueError(f"Ação não disponível: {job.action}")
+            if job.items is None:
+                self._log("info", "Preparando itens da ação...")
+                job.items = list(handler.prepare(job))
+                self._log("info", f"{job.total} item(ns), {len(job.accounts)} conta(s)")
+                self._checkpoint(job, force=True)
+
+            accounts = [a for a in job.accounts if a not in job.exhausted]
+            with ThreadPoolExecutor(max_workers=min(self.MAX_WORKERS, max(1, len(accounts))),
+                                    thread_name_prefix=f"job-{job.id}-account") as pool:
+                for account in accounts:
+                    pool.submit(self._run_account, job, handler, account)
+        except Exception as e:
+            logger.exception("Erro no job %s", job.id)
+            job.error = str(e)
+            job.status = "failed"
+            self._log("error", f"Falha na ação: {e}")
+
+        if self._cancel_event.is_set():
+            # Fechamento do app: fica pausado para continuar no próximo start
+            job.status = "paused" if self._shutting_down else "cancelled"
+        elif job.status not in ("failed", "paused"):
+            job.status = "done"
+        self._jobEnded.emit(job.id)
+
+    def _run_account(self, job: Job, handler: ActionHandler, account: str):
+        settings = job.settings
+        thread_name = threading.current_thread().name
+        try:
+            while True:
+                if not self._wait_if_paused():
+                    return
+                if job.per_account.get(account, 0) >= settings.limit_per_account:
+                    self._log("info", f"{_label(account)}: limite de {settings.limit_per_account} atingido")
+                    return
+
+                index = self._take_item(job)
+                if index is None:
+                    return
+
+                item = job.items[index]
+                with self._lock:
+                    self._current_accounts[thread_name] = account
+                try:
+                    result = handler.process(job, item, account)
+                except AccountUnavailable as e:
+                    self._release_item(job, index, retry=True)
+                    self._drop_account(job, account, e)
+                    return
+                except Exception as e:
+                    self._release_item(job, index, success=False, account=account)
+                    self._log("error", f"{_label(account)}: {item} - {e}")
+                else:
+                    self._release_item(job, index, success=True, account=account)
+                    self._log("success", result or f"{item} ok")
+
+                delay = settings.delay_seconds
+                if settings.random_delay:
+                    delay *= 1 + random.random() * 0.5
+                # Espera interrompível (cancelar/fechar não aguarda o delay)
+                if self._cancel_event.wait(delay):
+                    return
+        finally:
+            with self._lock:
+                self._current_accounts.pop(thread_name, None)
+
+    def _wait_if_paused(self) -> bool:
+        while not self._resume_event.wait(0.2):
+            if self._cancel_event.is_set():
+                return False
+        return not self._cancel_event.is_set()
+
+    def _take_item(self, job: Job) -> Optional[int]:
+        with self._lock:
+            if job.retry:
+                index = job.retry.pop(0)
+            elif job.cursor < job.total:
+                index = job.cursor
+                job.cursor += 1
+            else:
+                return None
+            self._in_flight.add(index)
+            return index
+
+    def _release_item(self, job: Job, index: int, success: bool = False,
+                      account: Optional[str] = None, retry: bool = False):
+        with self._lock:
+            self._in_flight.discard(index)
+            if retry:
+                job.retry.append(index)
+            elif success:
+                job.processed += 1
+                job.per_account[account] = job.per_account.get(account, 0) + 1
+            else:
+                job.failed += 1
+                job.per_account[account] = job.per_account.get(account, 0) + 1
+            self._dirty = True
+        self._checkpoint(job)
+
+    def _drop_account(self, job: Job, account: str, error: AccountUnavailable):
+        with self._lock:
+            if account not in job.exhausted:
+                job.exhausted.append(account)
+            self._dirty = True
+        self._log("warning", f"{_label(account)} removida da ação: {error}")
+        if error.status:
+            from .session_catalog import session_catalog
+            try:
+                session_catalog.set_status(Path(account).name, error.status)
+            except Exception as e:
+                logger.warning("Erro ao atualizar status de %s: %s", account, e)
+        self._checkpoint(job, force=True)
+
+    # ========== CHECKPOINT ==========
+
+    def _checkpoint(self, job: Job, force: bool = False):
+        now = time.monotonic()
+        if not force and now - self._last_checkpoint < self.CHECKPOINT_INTERVAL:
+            return
+        self._last_checkpoint = now
+        self._write_checkpoint(job)
+
+    def _write_checkpoint(self, job: Job):
+        with self._lock:
+            data = job.to_dict()
+            # Itens em andamento são refeitos se o app fechar antes de terminarem
+            data["retry"] = sorted(set(job.retry) | self._in_flight) if job is self._current else job.retry
+        try:
+            atomic_write_json(self._folder / f"{job.id}.json", data)
+        except OSError as e:
+            logger.warning("Erro ao gravar checkpoint do job %s: %s", job.id, e)
+
+    # ========== PROGRESSO (thread da GUI) ==========
+
+    @Slot()
+    def _emit_progress(self, force: bool = False):
+        with self._lock:
+            dirty, self._dirty = self._dirty, False
+        if dirty or force:
+            self.progressChanged.emit(self.snapshot())
+
+    @Slot(str)
+    def _on_job_ended(self, job_id: str):
+        job = self._current
+        if job is None or job.id != job_id or self._shutting_down:
+            return
+        self._thread = None
+        self._finish(job)
+
+    def _finish(self, job: Job):
+        self._progress_timer.stop()
+        final = self.snapshot()
+        if job.status == "done":
+            self._log("success", f"Ação concluída: {job.processed} ok, {job.failed} falha(s)")
+            remaining = job.total - job.processed - job.failed
+            if remaining > 0:
+                self._log("warning", f"Limite das contas atingido, {remaining} item(ns) não processado(s)")
+        elif job.status == "cancelled":
+            self._log("warning", f"Ação cancelada após {job.processed + job.failed} item(ns)")
+        (self._folder / f"{job.id}.json").unlink(missing_ok=True)
+        logger.info("Job %s terminou: %s", job.id, job.status)
+
+        self._current = None
+        self.progressChanged.emit(final)
+        self.jobFinished.emit(final)
+        self._start_next()
+
+
+def _label(account: str) -> str:
+    """Conta exibida nos logs/progresso (nome da session sem extensão)"""
+    return Path(account).stem
@@ -0,0 +1,129 @@
+"""
+DLG Connect - License Clock
+Tempo restante da licença calculado localmente (relógio monotônico + hora do servidor)
+"""
+
+import math
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional, Any, Tuple
+
+
+# Relógio que não volta nem pula quando o usuário muda a hora do sistema.
+# CLOCK_BOOTTIME (Linux) continua contando durante a suspensão; no Windows
+# o time.monotonic() já conta.
+_BOOTTIME = getattr(time, "CLOCK_BOOTTIME", None)
+
+# Deriva aceita do relógio local entre duas amostras (100 ppm)
+CLOCK_DRIFT = 1e-4
+
+DAY = 24 * 60 * 60
+
+
+def _monotonic() -> float:
+    if _BOOTTIME is not None:
+        return time.clock_gettime(_BOOTTIME)
+    return time.monotonic()
+
+
+def parse_timestamp(value: Any) -> Optional[datetime]:
+    """Data ISO 8601 do servidor (ex: expires_at), sempre com fuso (UTC se não vier)"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+class LicenseClock:
+    """
+    Hora do servidor estimada localmente.
+
+    Guarda o intervalo possível do offset (hora do servidor - relógio
+    monotônico) e now() avança pelo relógio monotônico, sem depender da
+    hora do sistema. Cada resposta do bot-auth traz o header Date, que
+    limita o offset a uma janela de 1s + ida e volta; as janelas de várias
+    respostas são intersectadas (alargadas pela deriva desde a última), e
+    a estimativa é o meio do intervalo. Antes da primeira resposta, usa a
+    hora do sistema.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (offset mínimo, offset máximo, instante monotônico da última amostra)
+        self._bounds: Optional[Tuple[float, float, float]] = None
+
+    @property
+    def synced(self) -> bool:
+        return self._bounds is not None
+
+    @property
+    def uncertainty(self) -> Optional[float]:
+        """Meia largura do intervalo do offset, em segundos (None = sem amostra)"""
+        bounds = self._bounds
+        return None if bounds is None else (bounds[1] - bounds[0]) / 2
+
+    def sync(self, server_date: str, rtt: float = 0.0) -> bool:
+        """Header Date de uma resposta que levou `rtt` segundos; retorna True se usou a amostra"""
+        if not server_date:
+            return False
+        try:
+            server_time = parsedate_to_datetime(server_date).timestamp()
+        except (TypeError, ValueError, IndexError):
+            return False
+
+        received = _monotonic()
+        # Date (truncado no segundo) foi gerado em algum ponto da ida e volta
+        low = server_time - received
+        high = server_time + 1 + rtt - received
+
+        with self._lock:
+            if self._bounds is not None:
+                old_low, old_high, updated_at = self._bounds
+                drift = (received - updated_at) * CLOCK_DRIFT
+                merged_low, merged_high = max(low, old_low - drift), min(high, old_high + drift)
+                if merged_low <= merged_high:
+                    low, high = merged_low, merged_high
+                # Janelas disjuntas: hora do servidor mudou, vale a amostra nova
+            self._bounds = (low, high, received)
+        return True
+
+    def reset(self):
+        with self._lock:
+            self._bounds = None
+
+    def now(self) -> float:
+        """Hora atual do servidor (epoch, segundos)"""
+        bounds = self._bounds
+        if bounds is None:
+            return time.time()
+        low, high, _ = bounds
+        return _monotonic() + (low + high) / 2
+
+    def skew(self) -> float:
+        """Diferença servidor - relógio do sistema (segundos; positivo = sistema atrasado)"""
+        return self.now() - time.time()
+
+    def seconds_until(self, value: Any) -> Optional[float]:
+        """Segundos até a data `value` (negativo = já passou); None se não há data"""
+        moment = parse_timestamp(value)
+        if moment is None:
+            return None
+        return moment.timestamp() - self.now()
+
+    def days_until(self, value: Any) -> Optional[int]:
+        """Dias restantes arredondados para cima (0 quando vencido); None se não há data"""
+        remaining = self.seconds_until(value)
+        if remaining is None:
+            return None
+        return max(0, math.ceil(remaining / DAY))
+
+
+# =====================================================
+# INSTÂNCIA GLOBAL
+# =====================================================
+license_clock = LicenseClock()
@@ -0,0 +1,198 @@
+"""
+DLG Connect - License Scheduler
+Avisos de vencimento e revalidação da licença em segundo plano, por timers
+"""
+
+import math
+import random
+from typing import Optional, Dict, Any
+
+from PySide6.QtCore import QObject, QTimer, Qt, Signal
+
+from .license_clock import LicenseClock, license_clock, DAY
+from .logger import get_logger
+
+logger = get_logger("license")
+
+
+HOUR = 60 * 60
+
+# Um aviso (expiring) ao cruzar cada limite antes do vencimento, em segundos
+WARNING_THRESHOLDS = (3 * DAY, DAY, HOUR)
+
+# Revalidação: uma fração do tempo restante, entre os limites (segundos).
+# Longe do vencimento fica no máximo; perto dele, a cada poucos minutos.
+REVALIDATE_FRACTION = 0.25
+REVALIDATE_MIN = 5 * 60
+REVALIDATE_MAX = 12 * HOUR
+# Depois do vencimento, confere no servidor (renovação) após essa folga
+EXPIRY_GRACE = 5
+# Revalidação que não chegou ao servidor: backoff a partir daqui, até o máximo
+RETRY_INITIAL = 30
+RETRY_MAX = 15 * 60
+
+# QTimer aceita até ~24 dias; esperas maiores são rearmadas no caminho
+MAX_TIMER_MS = DAY * 1000
+# Dispara um pouco depois do limite, para o cálculo já cair do outro lado
+TIMER_SLACK_MS = 20
+
+
+def revalidation_delay(remaining: Optional[float], failures: int = 0) -> float:
+    """
+    Segundos até a próxima revalidação: rara longe do vencimento, frequente
+    perto dele, com backoff depois de falhas e nunca depois do vencimento.
+    """
+    if failures:
+        delay = min(RETRY_MAX, RETRY_INITIAL * 2 ** (failures - 1))
+    elif remaining is None:
+        delay = REVALIDATE_MAX
+    else:
+        delay = min(REVALIDATE_MAX, max(REVALIDATE_MIN, remaining * REVALIDATE_FRACTION))
+
+    if remaining is not None and remaining > 0:
+        delay = min(delay, remaining + EXPIRY_GRACE)
+    # Jitter: vários bots com a mesma licença não revalidam juntos
+    return delay * random.uniform(0.9, 1.0)
+
+
+class LicenseScheduler(QObject):
+    """
+    Relógio da licença do usuário logado.
+
+    start(expires_at) a cada acesso confirmado pelo servidor. Um timer
+    preciso dispara exatamente no próximo limite (troca de dia, aviso ou
+    vencimento), sem polling; outro agenda a revalidação em segundo plano
+    (sinal `revalidate`), e record_failure() encurta a espera quando ela
+    não chega ao servidor.
+    """
+
+    # {"secondsRemaining", "daysRemaining", "expiresAt", "threshold"}
+    expiring = Signal(object)
+    # {"secondsRemaining", "daysRemaining", "expiresAt"}
+    expired = Signal(object)
+    # Dias restantes (ou o aviso) mudaram: UserState relê
+    remainingChanged = Signal()
+    # Hora de um verify_session em segundo plano
+    revalidate = Signal()
+
+    def __init__(self, parent: Optional[QObject] = None, clock: LicenseClock = license_clock):
+        super().__init__(parent)
+        self._clock = clock
+        self._expires_at: Optional[str] = None
+        self._failures = 0
+        # Quantos limites de WARNING_THRESHOLDS já foram avisados
+        self._warned = 0
+        self._expired_emitted = False
+
+        self._tick_timer = QTimer(self)
+        self._tick_timer.setSingleShot(True)
+        # CoarseTimer erra até 5% do intervalo (mais de 1h num timer de 1 dia)
+        self._tick_timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._tick_timer.timeout.connect(self._on_tick)
+
+        self._revalidate_timer = QTimer(self)
+        self._revalidate_timer.setSingleShot(True)
+        self._revalidate_timer.timeout.connect(self.revalidate)
+
+    @property
+    def active(self) -> bool:
+        return self._revalidate_timer.isActive() or self._tick_timer.isActive()
+
+    @property
+    def failures(self) -> int:
+        return self._failures
+
+    @property
+    def expires_at(self) -> Optional[str]:
+        return self._expires_at
+
+    @property
+    def is_expired(self) -> bool:
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+
+    def remaining(self) -> Optional[float]:
+        """Segundos até o vencimento (None = sem data)"""
+        return self._clock.seconds_until(self._expires_at)
+
+    def next_revalidation_in(self) -> Optional[float]:
+        """Segundos até a revalidação agendada (None = nenhuma)"""
+        if not self._revalidate_timer.isActive():
+            return None
+        return self._revalidate_timer.remainingTime() / 1000
+
+    # ========== CONTROLE ==========
+
+    def start(self, expires_at: Optional[str]):
+        """Acesso confirmado (login/revalidação): rearma avisos e revalidação"""
+        if expires_at != self._expires_at:
+            # Licença nova/renovada: avisos recomeçam do zero
+            self._expires_at = expires_at
+            self._warned = 0
+            self._expired_emitted = False
+        self._failures = 0
+        self._on_tick()
+        self._schedule_revalidation()
+
+    def record_failure(self):
+        """Revalidação não chegou ao servidor (rede/erro temporário): tenta de novo antes"""
+        self._failures += 1
+        self._schedule_revalidation()
+
+    def reschedule(self):
+        """Revalidação pulada (outra verificação em andamento): agenda a próxima"""
+        self._schedule_revalidation()
+
+    def stop(self):
+        self._tick_timer.stop()
+        self._revalidate_timer.stop()
+        self._expires_at = None
+        self._failures = 0
+        self._warned = 0
+        self._expired_emitted = False
+
+    # ========== TIMERS ==========
+
+    def _info(self, remaining: float) -> Dict[str, Any]:
+        return {
+            "secondsRemaining": max(0, int(remaining)),
+            "daysRemaining": max(0, math.ceil(remaining / DAY)),
+            "expiresAt": self._expires_at or "",
+        }
+
+    def _on_tick(self):
+        remaining = self.remaining()
+        if remaining is None:
+            self._tick_timer.stop()
+            return
+
+        self.remainingChanged.emit()
+
+        if remaining <= 0:
+            self._tick_timer.stop()
+            if not self._expired_emitted:
+                self._expired_emitted = True
+                logger.warning("Licença venceu (%s)", self._expires_at)
+                self.expired.emit(self._info(remaining))
+            return
+
+        crossed = sum(1 for threshold in WARNING_THRESHOLDS if remaining <= threshold)
+        if crossed > self._warned:
+            self._warned = crossed
+            logger.info("Licença vence em %.0f s", remaining)
+            self.expiring.emit({**self._info(remaining), "threshold": WARNING_THRESHOLDS[crossed - 1]})
+
+        self._arm_tick(remaining)
+
+    def _arm_tick(self, remaining: float):
+        """Próximo instante em que algo visível muda: dia, aviso ou vencimento"""
+        days = math.ceil(remaining / DAY)
+        candidates = [remaining, remaining - (days - 1) * DAY]
+        candidates.extend(remaining - threshold for threshold in WARNING_THRESHOLDS if threshold < remaining)
+        wait = min(c for c in candidates if c > 0)
+        self._tick_timer.start(min(MAX_TIMER_MS, int(wait * 1000) + TIMER_SLACK_MS))
+
+    def _schedule_revalidation(self):
+        delay = revalidation_delay(self.remaining(), self._failures)
+        logger.debug("Próxima revalidação da licença em %.0f s (falhas: %d)", delay, self._failures)
+        self._revalidate_timer.start(min(MAX_TIMER_MS, int(delay * 1000)))
@@ -0,0 +1,233 @@
+"""
+DLG Connect - Log Model
+Logs da página Ações: ring buffer de tamanho fixo com inserção em lote
+"""
+
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from pathlib import Path
+from typing import Optional, Dict, Any, List, NamedTuple
+
+from PySide6.QtCore import (
+    QAbstractListModel, QByteArray, QModelIndex, QObject, QTimer,
+    Qt, Property, Signal, Slot
+)
+
+
+LEVELS = ("info", "success", "warning", "error")
+
+
+class LogEntry(NamedTuple):
+    level: str
+    message: str
+    time: str
+    created: float
+
+
+class _SpillWriter:
+    """Grava as linhas que saem do buffer em um arquivo rotativo, em outra thread"""
+
+    MAX_BYTES = 2 * 1024 * 1024
+    BACKUP_COUNT = 3
+
+    def __init__(self, path: Path):
+        handler = RotatingFileHandler(
+            path, maxBytes=self.MAX_BYTES, backupCount=self.BACKUP_COUNT,
+            encoding="utf-8", delay=True
+        )
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        self._handler = handler
+        self._queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        self._listener = QueueListener(self._queue, handler)
+        self._listener.start()
+        # Logger próprio (fora da árvore "dlg"): não vai para o dlg_connect.log
+        self._logger = logging.Logger(f"dlg-spill:{path.name}")
+        self._logger.addHandler(QueueHandler(self._queue))
+
+    def write(self, entries: List[LogEntry]):
+        for entry in entries:
+            self._logger.info("%s [%s] %s", entry.time, entry.level, entry.message)
+
+    def close(self):
+        self._listener.stop()
+        self._handler.close()
+
+
+class LogModel(QAbstractListModel):
+    """
+    Últimas `capacity` linhas de log para a ListView da página Ações.
+
+    append() pode ser chamado de qualquer thread: as linhas ficam
+    pendentes e entram no modelo no máximo a cada FLUSH_INTERVAL_MS, em
+    um único rowsInserted (e um rowsRemoved para as que saíram do
+    buffer). O filtro por nível é feito aqui, sem recriar delegates.
+    Com spill_path, as linhas descartadas vão para um arquivo rotativo.
+    """
+
+    DEFAULT_CAPACITY = 2000
+    FLUSH_INTERVAL_MS = 100
+
+    LevelRole = Qt.UserRole + 1
+    MessageRole = Qt.UserRole + 2
+    TimeRole = Qt.UserRole + 3
+
+    ROLE_NAMES = {
+        LevelRole: b"type",
+        MessageRole: b"message",
+        TimeRole: b"time",
+    }
+
+    countChanged = Signal(name="countChanged")
+    levelFilterChanged = Signal(name="levelFilterChanged")
+    # Interno: primeira linha pendente (pode vir de outra thread)
+    _pendingAvailable = Signal()
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, spill_path: Optional[Path] = None,
+                 parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self._capacity = capacity
+        self._buffer: "deque[LogEntry]" = deque()
+        # Linhas visíveis (subconjunto do buffer, mesma ordem)
+        self._rows: List[LogEntry] = []
+        self._level_filter = ""
+        self._pending: List[LogEntry] = []
+        self._pending_lock = threading.Lock()
+        self._spill = _SpillWriter(Path(spill_path)) if spill_path else None
+
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(self.FLUSH_INTERVAL_MS)
+        self._flush_timer.timeout.connect(self.flush)
+        self._pendingAvailable.connect(self._schedule_flush, Qt.QueuedConnection)
+
+    # ========== QAbstractListModel ==========
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def roleNames(self) -> Dict[int, QByteArray]:
+        return {role: QByteArray(name) for role, name in self.ROLE_NAMES.items()}
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        if not index.isValid() or not 0 <= index.row() < len(self._rows):
+            return None
+        entry = self._rows[index.row()]
+        if role == self.MessageRole or role == Qt.DisplayRole:
+            return entry.message
+        if role == self.LevelRole:
+            return entry.level
+        if role == self.TimeRole:
+            return entry.time
+        return None
+
+    # ========== PROPRIEDADES ==========
+
+    @Property(int, notify=countChanged)
+    def count(self) -> int:
+        return len(self._rows)
+
+    @Property(int, constant=True)
+    def capacity(self) -> int:
+        return self._capacity
+
+    @Property(str, notify=levelFilterChanged)
+    def levelFilter(self) -> str:
+        """Nível exibido ("" = todos)"""
+        return self._level_filter
+
+    @levelFilter.setter
+    def levelFilter(self, value: str):
+        if value == self._level_filter:
+            return
+        self._level_filter = value
+        self.beginResetModel()
+        self._rows = [entry for entry in self._buffer if self._accepts(entry)]
+        self.endResetModel()
+        self.levelFilterChanged.emit()
+        self.countChanged.emit()
+
+    # ========== ESCRITA ==========
+
+    @Slot(str, str)
+    def append(self, level: str, message: str):
+        """Adiciona uma linha (qualquer thread); entra no modelo no próximo flush"""
+        now = time.time()
+        entry = LogEntry(
+            level if level in LEVELS else "info", message,
+            time.strftime("%H:%M:%S", time.localtime(now)), now
+        )
+        with self._pending_lock:
+            first = not self._pending
+            self._pending.append(entry)
+        if first:
+            self._pendingAvailable.emit()
+
+    @Slot()
+    def _schedule_flush(self):
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    @Slot()
+    def flush(self):
+        """Aplica as linhas pendentes (thread da GUI)"""
+        with self._pending_lock:
+            batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        evicted: List[LogEntry] = []
+        if len(batch) > self._capacity:
+            # Mais linhas que o buffer inteiro: as primeiras nem chegam a aparecer
+            overflow = len(batch) - self._capacity
+            evicted.extend(batch[:overflow])
+            batch = batch[overflow:]
+
+        excess = len(self._buffer) + len(batch) - self._capacity
+        if excess > 0:
+            dropped = [self._buffer.popleft() for _ in range(excess)]
+            visible = sum(1 for entry in dropped if self._accepts(entry))
+            if visible:
+                self.beginRemoveRows(QModelIndex(), 0, visible - 1)
+                del self._rows[:visible]
+                self.endRemoveRows()
+            evicted[:0] = dropped
+
+        self._buffer.extend(batch)
+        shown = [entry for entry in batch if self._accepts(entry)]
+        if shown:
+            start = len(self._rows)
+            self.beginInsertRows(QModelIndex(), start, start + len(shown) - 1)
+            self._rows.extend(shown)
+            self.endInsertRows()
+
+        if evicted and self._spill is not None:
+            self._spill.write(evicted)
+        self.countChanged.emit()
+
+    @Slot()
+    def clear(self):
+        """Limpa o painel (as linhas vão para o arquivo, se houver spill)"""
+        self.flush()
+        if self._spill is not None and self._buffer:
+            self._spill.write(list(self._buffer))
+        self.beginResetModel()
+        self._buffer.clear()
+        self._rows = []
+        self.endResetModel()
+        self.countChanged.emit()
+
+    def close(self):
+        """Grava o que ainda está no buffer e fecha o arquivo (encerramento do app)"""
+        if self._spill is None:
+            return
+        self.flush()
+        self._spill.write(list(self._buffer))
+        self._spill.close()
+        self._spill = None
+
+    def _accepts(self, entry: LogEntry) -> bool:
+        return not self._level_filter or entry.level == self._level_filter
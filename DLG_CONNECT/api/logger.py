@@ -0,0 +1,172 @@
+"""
+DLG Connect - Logging
+Logs estruturados (JSON lines) gravados em background, com redação de credenciais
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import re
+import sys
+import threading
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from pathlib import Path
+from typing import Optional, Any
+
+# Logger raiz do app: todos os módulos usam filhos dele (dlg.api, dlg.bridge...)
+ROOT_LOGGER = "dlg"
+
+LOG_FILE = "dlg_connect.log"
+MAX_BYTES = 2 * 1024 * 1024
+BACKUP_COUNT = 3
+
+# Chaves cujo valor nunca vai para o log
+SENSITIVE_KEYS = {
+    "password",
+    "recaptcha_token",
+    "access_token",
+    "refresh_token",
+    "entitlement",
+    "token",
+    "apikey",
+    "authorization",
+    "checksum",
+}
+REDACTED = "***"
+
+# JWT (anon key, tokens do Supabase) e "Bearer <token>" dentro de mensagens
+_TOKEN_PATTERNS = (
+    re.compile(r"eyJ[\w-]+\.[\w-]+\.[\w-]*"),
+    re.compile(r"(?i)(bearer\s+)[\w.-]+"),
+)
+
+_listener: Optional[QueueListener] = None
+_setup_lock = threading.Lock()
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Logger de um módulo (ex: get_logger("api") -> dlg.api)"""
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+def redact(value: Any) -> Any:
+    """Cópia do valor com credenciais e tokens mascarados"""
+    if isinstance(value, dict):
+        return {
+            k: REDACTED if str(k).lower() in SENSITIVE_KEYS and v else redact(v)
+            for k, v in value.items()
+        }
+    if isinstance(value, (list, tuple)):
+        return [redact(v) for v in value]
+    if isinstance(value, str):
+        return _redact_text(value)
+    return value
+
+
+def _redact_text(text: str) -> str:
+    text = _TOKEN_PATTERNS[0].sub(REDACTED, text)
+    return _TOKEN_PATTERNS[1].sub(r"\1" + REDACTED, text)
+
+
+class JsonFormatter(logging.Formatter):
+    """Uma linha JSON por registro; campos extras vêm de extra={"fields": {...}}"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "msg": _redact_text(record.getMessage()),
+        }
+        fields = getattr(record, "fields", None)
+        if fields:
+            entry.update(redact(fields))
+        if record.exc_info:
+            entry["exc"] = _redact_text(self.formatException(record.exc_info))
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class ConsoleFormatter(logging.Formatter):
+    """Formato de console no estilo dos antigos prints: [modulo] mensagem"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        tag = record.name.rsplit(".", 1)[-1]
+        text = f"[{tag}] {_redact_text(record.getMessage())}"
+        if record.exc_info:
+            text += "\n" + self.formatException(record.exc_info)
+        return text
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """
+    QueueHandler que não formata na thread de quem chamou: a mensagem
+    (msg % args) é montada só na thread do QueueListener.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def setup_logging(logs_folder: Path, level: Optional[int] = None, console: Optional[bool] = None):
+    """
+    Configura o pipeline de logs (chamar uma vez no startup):
+    logger -> fila -> thread de I/O -> arquivo rotativo (+ console em dev).
+
+    Nível padrão INFO (DLG_LOG_LEVEL=DEBUG ativa os dumps de payload).
+    Console ativo fora do app empacotado, ou com DLG_LOG_CONSOLE=1.
+    """
+    global _listener
+
+    with _setup_lock:
+        if _listener is not None:
+            return
+
+        if level is None:
+            level = logging.getLevelName(os.environ.get("DLG_LOG_LEVEL", "INFO").upper())
+            if not isinstance(level, int):
+                level = logging.INFO
+        if console is None:
+            console = not getattr(sys, "frozen", False) or os.environ.get("DLG_LOG_CONSOLE") == "1"
+
+        file_handler = RotatingFileHandler(
+            Path(logs_folder) / LOG_FILE,
+            maxBytes=MAX_BYTES,
+            backupCount=BACKUP_COUNT,
+            encoding="utf-8",
+            delay=True,
+        )
+        file_handler.setFormatter(JsonFormatter())
+        handlers = [file_handler]
+
+        if console:
+            console_handler = logging.StreamHandler(sys.stdout)
+            console_handler.setFormatter(ConsoleFormatter())
+            handlers.append(console_handler)
+
+        log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+
+        root = logging.getLogger(ROOT_LOGGER)
+        root.setLevel(level)
+        root.addHandler(_DeferredQueueHandler(log_queue))
+        root.propagate = False
+
+        atexit.register(shutdown_logging)
+
+
+def shutdown_logging():
+    """Esvazia a fila e fecha o arquivo de log"""
+    global _listener
+
+    with _setup_lock:
+        if _listener is None:
+            return
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
@@ -0,0 +1,227 @@
+"""
+DLG Connect - Metrics
+Registro em memória de latência, status e erros por ação da API
+"""
+
+import bisect
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Dict, Any, List
+
+
+# Limites dos buckets de latência (ms); o último bucket é +Inf
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+METRICS_FILE = "api_metrics.prom"
+
+_SERVER_TIMING_DUR = re.compile(r"dur=([\d.]+)")
+
+
+def parse_server_timing(header: str) -> Optional[float]:
+    """Soma as durações (ms) de um header Server-Timing, ou None se ausente"""
+    if not header:
+        return None
+    durations = [float(d) for d in _SERVER_TIMING_DUR.findall(header)]
+    return sum(durations) if durations else None
+
+
+class Histogram:
+    """Histograma de buckets fixos (contagem acumulada calculada só na exportação)"""
+
+    __slots__ = ("counts", "count", "total")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value_ms: float):
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS_MS, value_ms)] += 1
+        self.count += 1
+        self.total += value_ms
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimativa do quantil pelo limite superior do bucket"""
+        if not self.count:
+            return None
+        target = q * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= target:
+                return float(LATENCY_BUCKETS_MS[i]) if i < len(LATENCY_BUCKETS_MS) else float("inf")
+        return float("inf")
+
+    def to_dict(self) -> Dict[str, Any]:
+        p95 = self.quantile(0.95)
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total / self.count, 1) if self.count else None,
+            "p50_ms": self.quantile(0.5),
+            "p95_ms": None if p95 == float("inf") else p95,
+        }
+
+
+class ActionMetrics:
+    """Métricas de uma ação da Edge Function"""
+
+    __slots__ = ("latency", "server_time", "status_codes", "errors", "events", "bytes_sent", "bytes_received")
+
+    def __init__(self):
+        self.latency = Histogram()
+        self.server_time = Histogram()
+        self.status_codes: Dict[int, int] = {}
+        self.errors: Dict[str, int] = {}
+        self.events: Dict[str, int] = {}   # retry, hedge, hedge_won, circuit_rejected, coalesced, memo_hit, not_modified
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+
+class MetricsRegistry:
+    """
+    Registro thread-safe das métricas do cliente da API.
+    Gravar uma amostra custa um lock e algumas somas; a formatação
+    (snapshot/OpenMetrics) só acontece quando alguém pede.
+    """
+
+    def __init__(self):
+        self._actions: Dict[str, ActionMetrics] = {}
+        self._lock = threading.Lock()
+        self._started_at = time.time()
+
+    def _get(self, action: str) -> ActionMetrics:
+        metrics = self._actions.get(action)
+        if metrics is None:
+            metrics = self._actions.setdefault(action, ActionMetrics())
+        return metrics
+
+    def record_response(
+        self,
+        action: str,
+        status_code: int,
+        elapsed_ms: float,
+        bytes_sent: int,
+        bytes_received: int,
+        server_ms: Optional[float] = None
+    ):
+        with self._lock:
+            metrics = self._get(action)
+            metrics.latency.observe(elapsed_ms)
+            if server_ms is not None:
+                metrics.server_time.observe(server_ms)
+            metrics.status_codes[status_code] = metrics.status_codes.get(status_code, 0) + 1
+            metrics.bytes_sent += bytes_sent
+            metrics.bytes_received += bytes_received
+
+    def record_error(self, action: str, kind: str, elapsed_ms: Optional[float] = None, bytes_sent: int = 0):
+        """
+        kind: timeout, connection, ssl, invalid_response, other.
+        elapsed_ms None = latência já registrada em record_response.
+        """
+        with self._lock:
+            metrics = self._get(action)
+            if elapsed_ms is not None:
+                metrics.latency.observe(elapsed_ms)
+            metrics.errors[kind] = metrics.errors.get(kind, 0) + 1
+            metrics.bytes_sent += bytes_sent
+
+    def record_event(self, action: str, event: str):
+        """Eventos da política de requisição (retry, hedge, circuit_rejected, coalesced, memo_hit, not_modified...)"""
+        with self._lock:
+            metrics = self._get(action)
+            metrics.events[event] = metrics.events.get(event, 0) + 1
+
+    def latency_quantile(self, action: str, q: float, min_samples: int = 20) -> Optional[float]:
+        """Quantil da latência (ms) da ação, ou None com poucas amostras"""
+        with self._lock:
+            metrics = self._actions.get(action)
+            if metrics is None or metrics.latency.count < min_samples:
+                return None
+            return metrics.latency.quantile(q)
+
+    def reset(self):
+        with self._lock:
+            self._actions.clear()
+            self._started_at = time.time()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Resumo por ação para o painel de diagnóstico"""
+        with self._lock:
+            actions = {}
+            for action, metrics in sorted(self._actions.items()):
+                actions[action] = {
+                    "latency": metrics.latency.to_dict(),
+                    "server_time": metrics.server_time.to_dict(),
+                    "status_codes": {str(code): n for code, n in metrics.status_codes.items()},
+                    "errors": dict(metrics.errors),
+                    "events": dict(metrics.events),
+                    "bytes_sent": metrics.bytes_sent,
+                    "bytes_received": metrics.bytes_received,
+                }
+            return {"since": self._started_at, "actions": actions}
+
+    def to_openmetrics(self) -> str:
+        """Snapshot no formato texto do OpenMetrics"""
+        lines: List[str] = []
+
+        def histogram(name: str, help_text: str, attr: str):
+            lines.append(f"# TYPE {name} histogram")
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# UNIT {name} milliseconds")
+            for action, metrics in sorted(self._actions.items()):
+                hist: Histogram = getattr(metrics, attr)
+                if not hist.count:
+                    continue
+                cumulative = 0
+                for bound, bucket_count in zip(LATENCY_BUCKETS_MS + ("+Inf",), hist.counts):
+                    cumulative += bucket_count
+                    lines.append(f'{name}_bucket{{action="{action}",le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_count{{action="{action}"}} {hist.count}')
+                lines.append(f'{name}_sum{{action="{action}"}} {round(hist.total, 3)}')
+
+        with self._lock:
+            histogram("dlg_api_request_duration_milliseconds", "Latência total da requisição", "latency")
+            histogram("dlg_api_server_duration_milliseconds", "Tempo no servidor (Server-Timing)", "server_time")
+
+            lines.append("# TYPE dlg_api_responses counter")
+            lines.append("# HELP dlg_api_responses Respostas por status HTTP")
+            for action, metrics in sorted(self._actions.items()):
+                for code, n in sorted(metrics.status_codes.items()):
+                    lines.append(f'dlg_api_responses_total{{action="{action}",status="{code}"}} {n}')
+
+            lines.append("# TYPE dlg_api_errors counter")
+            lines.append("# HELP dlg_api_errors Falhas de transporte por tipo")
+            for action, metrics in sorted(self._actions.items()):
+                for kind, n in sorted(metrics.errors.items()):
+                    lines.append(f'dlg_api_errors_total{{action="{action}",kind="{kind}"}} {n}')
+
+            lines.append("# TYPE dlg_api_policy_events counter")
+            lines.append("# HELP dlg_api_policy_events Retries, hedges, rejeições do circuit breaker, chamadas duplicadas evitadas e respostas 304")
+            for action, metrics in sorted(self._actions.items()):
+                for event, n in sorted(metrics.events.items()):
+                    lines.append(f'dlg_api_policy_events_total{{action="{action}",event="{event}"}} {n}')
+
+            lines.append("# TYPE dlg_api_payload_bytes counter")
+            lines.append("# HELP dlg_api_payload_bytes Bytes enviados/recebidos")
+            for action, metrics in sorted(self._actions.items()):
+                lines.append(f'dlg_api_payload_bytes_total{{action="{action}",direction="sent"}} {metrics.bytes_sent}')
+                lines.append(f'dlg_api_payload_bytes_total{{action="{action}",direction="received"}} {metrics.bytes_received}')
+
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def export_openmetrics(self, logs_folder: Path) -> Path:
+        """Grava o snapshot OpenMetrics em logs/api_metrics.prom (substitui o anterior)"""
+        path = Path(logs_folder) / METRICS_FILE
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.to_openmetrics())
+        os.replace(tmp_path, path)
+        return path
+
+
+# Instância global
+metrics = MetricsRegistry()
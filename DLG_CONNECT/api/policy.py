@@ -0,0 +1,248 @@
+"""
+DLG Connect - Request Policy
+Retry com backoff, Retry-After, hedging, circuit breaker e coalescência para a Edge Function
+"""
+
+import copy
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional, Callable, List, Dict, Any, Hashable, Tuple
+
+from .logger import get_logger
+
+logger = get_logger("policy")
+
+
+@dataclass(frozen=True)
+class RequestPolicy:
+    """Política de uma ação da API"""
+
+    # Tentativas extras após falha transitória (timeout, conexão, 429/502/503/504).
+    # Só faz sentido para ações idempotentes.
+    retries: int = 0
+    backoff_base: float = 0.25      # segundos
+    backoff_max: float = 4.0        # segundos
+    # Retry-After maior que isso não é esperado: devolve o erro para a UI
+    max_retry_after: float = 10.0
+    # Hedging: envia uma requisição duplicada se a primeira passar do p95
+    hedge: bool = False
+    hedge_after: float = 1.5        # segundos, usado enquanto não há amostras suficientes
+    # Resultado de sucesso reaproveitado por esse tempo (segundos). Só para
+    # ações de leitura; ações com 0 invalidam o que estiver memorizado.
+    memo_ttl: float = 0.0
+    # Envia If-None-Match com o ETag da última resposta; 304 reaproveita o corpo
+    conditional: bool = False
+
+    def backoff(self, attempt: int) -> float:
+        """Backoff exponencial com jitter completo"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+
+DEFAULT_POLICY = RequestPolicy()
+
+# Status HTTP que indicam falha transitória
+TRANSIENT_STATUS = (429, 502, 503, 504)
+
+
+def parse_retry_after(value: str) -> Optional[float]:
+    """Retry-After em segundos (aceita número ou data HTTP)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    # Formato de data é raro: email.utils só é importado aqui
+    from email.utils import parsedate_to_datetime
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker do endpoint.
+
+    closed: requisições normais. Após FAILURE_THRESHOLD falhas seguidas de
+    transporte/5xx, abre por RESET_TIMEOUT segundos (falha imediata).
+    half_open: uma requisição de teste; sucesso fecha, falha reabre.
+    Quem recebeu o teste chama release() ao terminar: teste sem veredito
+    (erro SSL, resposta inesperada, exceção) conta como falha.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    FAILURE_THRESHOLD = 3
+    RESET_TIMEOUT = 30.0
+
+    def __init__(self):
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        # Thread que recebeu a requisição de teste do half_open
+        self._probe_owner: Optional[int] = None
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[bool], None]] = []
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    @property
+    def is_open(self) -> bool:
+        return self._state != self.CLOSED
+
+    def retry_in(self) -> float:
+        """Segundos até a próxima tentativa ser permitida"""
+        return max(0.0, self._opened_at + self.RESET_TIMEOUT - time.monotonic())
+
+    def add_listener(self, callback: Callable[[bool], None]):
+        """callback(available) quando o endpoint cai/volta (chamado na thread da requisição)"""
+        self._listeners.append(callback)
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN and self.retry_in() <= 0:
+                self._state = self.HALF_OPEN
+                self._probe_in_flight = False
+            if self._state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                self._probe_owner = threading.get_ident()
+                return True
+            return False
+
+    def release(self):
+        """Fim de uma requisição permitida por allow() (chamar sempre, na mesma thread)"""
+        with self._lock:
+            unsettled = (
+                self._state == self.HALF_OPEN and self._probe_in_flight
+                and self._probe_owner == threading.get_ident()
+            )
+        if unsettled:
+            # Sem record_success/record_failure: o teste não pode prender o circuito
+            self.record_failure()
+
+    def record_success(self):
+        with self._lock:
+            was_open = self._state != self.CLOSED
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+        if was_open:
+            logger.info("Endpoint respondeu, circuito fechado")
+            self._notify(True)
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            opened = False
+            if self._state == self.HALF_OPEN or self._failures >= self.FAILURE_THRESHOLD:
+                opened = self._state == self.CLOSED
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._probe_in_flight = False
+        if opened:
+            logger.warning("Endpoint indisponível, circuito aberto por %.0fs", self.RESET_TIMEOUT)
+            self._notify(False)
+
+    def reset(self):
+        self.record_success()
+
+    def _notify(self, available: bool):
+        for callback in list(self._listeners):
+            try:
+                callback(available)
+            except Exception:
+                logger.exception("Erro no listener do circuit breaker")
+
+
+class _Flight:
+    """Requisição em andamento compartilhada por chamadas idênticas"""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Coalescência de chamadas idênticas (mesma ação + payload).
+
+    Enquanto uma chamada está em andamento, as demais com a mesma chave
+    esperam por ela e recebem uma cópia do mesmo resultado, em vez de
+    repetir a requisição. Com ttl > 0 o resultado aceito por `cacheable`
+    fica memorizado por ttl segundos; invalidate() descarta o memo
+    (inclusive o de chamadas que ainda estão em andamento).
+    """
+
+    LEADER = "leader"
+    COALESCED = "coalesced"
+    MEMO_HIT = "memo_hit"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._memo: Dict[Hashable, Tuple[float, Any]] = {}
+        self._generation = 0
+
+    def do(
+        self,
+        key: Hashable,
+        fn: Callable[[], Any],
+        ttl: float = 0.0,
+        cacheable: Callable[[Any], bool] = lambda result: True,
+    ) -> Tuple[Any, str]:
+        """Executa fn() uma vez por chave; retorna (resultado, LEADER | COALESCED | MEMO_HIT)"""
+        with self._lock:
+            memo = self._memo.get(key)
+            if memo is not None:
+                if memo[0] > time.monotonic():
+                    return copy.deepcopy(memo[1]), self.MEMO_HIT
+                del self._memo[key]
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                generation = self._generation
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return copy.deepcopy(flight.result), self.COALESCED
+
+        result = None
+        try:
+            result = fn()
+            # Cópia antes de devolver: quem chamou pode alterar o resultado
+            flight.result = copy.deepcopy(result)
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+                if (
+                    ttl > 0 and flight.error is None and generation == self._generation
+                    and cacheable(flight.result)
+                ):
+                    self._memo[key] = (time.monotonic() + ttl, flight.result)
+            flight.done.set()
+        return result, self.LEADER
+
+    def invalidate(self):
+        """Descarta os resultados memorizados (ex: após login, logout ou registro de trial)"""
+        with self._lock:
+            self._memo.clear()
+            self._generation += 1
@@ -0,0 +1,335 @@
+"""
+DLG Connect - Realtime Push
+Canal de push (Supabase Realtime) com ban, manutenção, licença e dispositivos do usuário logado
+"""
+
+import asyncio
+import random
+import threading
+import time
+from typing import Optional, Dict, Any, Callable, List, Tuple
+
+from .logger import get_logger
+
+logger = get_logger("realtime")
+
+
+# Reconexão: espera dobra a cada falha (com jitter) até o máximo, em segundos
+RECONNECT_INITIAL = 1.0
+RECONNECT_MAX = 60.0
+# Conexão que ficou de pé por esse tempo zera o backoff
+STABLE_AFTER = 30.0
+# Tempo máximo para o servidor confirmar o phx_join
+SUBSCRIBE_TIMEOUT = 10.0
+HEARTBEAT_INTERVAL = 25
+# Conexão viva: estado do cliente/canal conferido a cada WATCH_INTERVAL e,
+# a cada PROBE_INTERVAL, um broadcast com ack que precisa voltar em PROBE_TIMEOUT.
+# Fora do ar por SUBSCRIBE_TIMEOUT (a lib não conseguiu reentrar), reconecta.
+WATCH_INTERVAL = 0.5
+PROBE_INTERVAL = 25.0
+PROBE_TIMEOUT = 10.0
+
+MAINTENANCE_KEY = "maintenance_mode"
+
+
+def change_bindings(user_id: str) -> List[Tuple[str, Optional[str]]]:
+    """(tabela, filtro) assinados no canal do usuário"""
+    return [
+        ("profiles", f"user_id=eq.{user_id}"),
+        ("licenses", f"user_id=eq.{user_id}"),
+        ("bot_device_sessions", f"user_id=eq.{user_id}"),
+        ("system_settings", f"key=eq.{MAINTENANCE_KEY}"),
+    ]
+
+
+def classify_change(data: Dict[str, Any], device_id: str = "") -> Optional[Dict[str, Any]]:
+    """
+    Traduz um postgres_changes em evento do app:
+      {"type": "banned", "reason": str}
+      {"type": "maintenance", "active": bool}
+      {"type": "license" | "device" | "profile", "event": "INSERT" | "UPDATE"}
+    Retorna None para mudanças que não interessam (ex: outro dispositivo ativo).
+    """
+    table = data.get("table")
+    event = data.get("type", "")
+    event = getattr(event, "value", event)  # a lib entrega um enum
+    record = data.get("record") or {}
+    old_record = data.get("old_record") or {}
+
+    if table == "system_settings":
+        if record.get("key", old_record.get("key")) != MAINTENANCE_KEY:
+            return None
+        return {"type": "maintenance", "active": record.get("value") == "true"}
+
+    if event == "DELETE":
+        # O Realtime não aplica RLS nem o filtro user_id a DELETE: chegaria o
+        # de qualquer usuário. Nada apaga perfis, licenças ou dispositivos
+        # (desconectar é UPDATE is_active=false).
+        return None
+
+    if table == "profiles":
+        if record.get("banned"):
+            return {"type": "banned", "reason": record.get("ban_reason") or "Conta suspensa"}
+        return {"type": "profile", "event": event}
+
+    if table == "licenses":
+        return {"type": "license", "event": event}
+
+    if table == "bot_device_sessions":
+        # Só interessa este dispositivo desconectado pelo painel. Atualizações
+        # de last_activity_at (is_active=true) são ignoradas, senão o próprio
+        # verify_session dispararia outro evento.
+        if record.get("is_active") or record.get("device_id") != device_id:
+            return None
+        return {"type": "device", "event": event}
+
+    return None
+
+
+class PushChannel:
+    """
+    Assinatura Realtime do usuário logado, em uma thread com event loop próprio.
+
+    Cada mudança relevante vira um evento (ver classify_change) entregue a
+    `on_event` na thread do canal; o Backend repassa para a thread da GUI
+    por um Signal. Queda de conexão, probe sem ack ou phx_join recusado
+    reconectam com backoff exponencial até stop().
+    """
+
+    def __init__(
+        self,
+        url: str,
+        apikey: str,
+        on_event: Callable[[Dict[str, Any]], None],
+        token_provider: Callable[[], Optional[str]] = lambda: None,
+    ):
+        self._url = url
+        self._apikey = apikey
+        self._on_event = on_event
+        self._token_provider = token_provider
+        self._user_id = ""
+        self._device_id = ""
+        self._thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stop_event: Optional[asyncio.Event] = None
+        self._client = None
+        self.connected = False
+        self.connections = 0
+        self.reconnects = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def user_id(self) -> str:
+        return self._user_id
+
+    def start(self, user_id: str, device_id: str = ""):
+        """Assina as mudanças de `user_id` (reinicia se já estava em outro usuário)"""
+        if self.running and user_id == self._user_id:
+            self.update_token()
+            return
+        self.stop()
+        self._user_id = user_id
+        self._device_id = device_id
+        self._loop = asyncio.new_event_loop()
+        self._stop_event = asyncio.Event()
+        self._thread = threading.Thread(target=self._run_thread, name="realtime-push", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        thread, loop, stop_event = self._thread, self._loop, self._stop_event
+        self._thread = None
+        if thread is None:
+            return
+        try:
+            loop.call_soon_threadsafe(stop_event.set)
+        except RuntimeError:
+            pass  # loop já encerrado
+        thread.join(timeout)
+        self.connected = False
+
+    def update_token(self):
+        """Token do usuário mudou (login/renovação): envia ao canal já inscrito"""
+        if self.running:
+            asyncio.run_coroutine_threadsafe(self._send_token(), self._loop)
+
+    async def _send_token(self):
+        client = self._client
+        token = self._token_provider() or self._apikey
+        if client is not None and client.access_token != token:
+            await client.set_auth(token)
+
+    # ========== THREAD DO CANAL ==========
+
+    def _run_thread(self):
+        loop = self._loop
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self._run())
+        except Exception as e:
+            logger.error("Canal Realtime encerrado com erro: %s", e)
+        finally:
+            self.connected = False
+            # Timeouts de push da lib ainda pendentes: cancela antes de fechar o loop
+            pending = asyncio.all_tasks(loop)
+            for task in pending:
+                task.cancel()
+            if pending:
+                loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            loop.close()
+
+    async def _run(self):
+        backoff = RECONNECT_INITIAL
+        stop_event = self._stop_event
+        while not stop_event.is_set():
+            started = time.monotonic()
+            try:
+                await self._session()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Realtime: conexão com %s falhou: %s", self._url, e)
+            self.connected = False
+            if stop_event.is_set():
+                break
+
+            if time.monotonic() - started >= STABLE_AFTER:
+                backoff = RECONNECT_INITIAL
+            delay = backoff * random.uniform(0.5, 1.0)
+            backoff = min(backoff * 2, RECONNECT_MAX)
+            logger.info("Realtime: reconectando em %.1fs", delay)
+            try:
+                await asyncio.wait_for(stop_event.wait(), delay)
+            except asyncio.TimeoutError:
+                self.reconnects += 1
+
+    async def _session(self):
+        """Uma conexão: conecta, entra no canal e espera até cair (ou stop())"""
+        from realtime import AsyncRealtimeClient, RealtimeSubscribeStates
+
+        # auto_reconnect: em erro no socket a lib tenta uma vez reconectar e
+        # reentrar no canal; se não conseguir, _watch passa para o nosso backoff
+        client = AsyncRealtimeClient(
+            self._url, self._apikey, auto_reconnect=True, max_retries=1, hb_interval=HEARTBEAT_INTERVAL
+        )
+        # apikey = anon key; o JWT do usuário vai no phx_join (RLS por usuário)
+        client.access_token = self._token_provider() or self._apikey
+        self._client = client
+        try:
+            await client.connect()
+            channel = client.channel(f"dlg-user-{self._user_id}", {
+                "config": {
+                    # ack: o servidor responde ao broadcast do probe (ver _watch)
+                    "broadcast": {"ack": True, "self": False},
+                    "presence": {"key": "", "enabled": False},
+                    "private": False,
+                }
+            })
+            for table, change_filter in change_bindings(self._user_id):
+                channel.on_postgres_changes(
+                    "*", callback=self._on_change, table=table, schema="public", filter=change_filter
+                )
+
+            joined = asyncio.get_running_loop().create_future()
+            interrupted = asyncio.Event()
+
+            def on_subscribe(state, error):
+                if joined.done():
+                    # Depois da inscrição, o callback só volta quando a lib reentra no canal
+                    if state == RealtimeSubscribeStates.SUBSCRIBED:
+                        self.reconnects += 1
+                        logger.info("Realtime: canal reinscrito pela lib após queda")
+                        # O phx_join dela leva o token da primeira inscrição
+                        asyncio.ensure_future(client.set_auth(self._token_provider() or self._apikey))
+                    else:
+                        interrupted.set()
+                    return
+                if state == RealtimeSubscribeStates.SUBSCRIBED:
+                    joined.set_result(True)
+                else:
+                    joined.set_exception(error or RuntimeError(f"canal {state}"))
+
+            await channel.subscribe(on_subscribe)
+            await asyncio.wait_for(joined, SUBSCRIBE_TIMEOUT)
+
+            self.connected = True
+            self.connections += 1
+            logger.info("Realtime: inscrito nas mudanças do usuário %s", self._user_id)
+
+            watch_task = asyncio.ensure_future(self._watch(client, channel, interrupted))
+            stop_task = asyncio.ensure_future(self._stop_event.wait())
+            try:
+                await asyncio.wait({watch_task, stop_task}, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                watch_task.cancel()
+                stop_task.cancel()
+            if not self._stop_event.is_set():
+                logger.warning("Realtime: conexão encerrada pelo servidor")
+        finally:
+            self._client = None
+            try:
+                await client.close()
+            except Exception:
+                pass
+
+    async def _watch(self, client, channel, interrupted: asyncio.Event):
+        """
+        Retorna quando a conexão caiu de vez. A lib não avisa: erro no socket
+        zera is_connected e phx_error/phx_close tiram o canal de JOINED (ela
+        pode se recuperar sozinha em até SUBSCRIBE_TIMEOUT); reinscrição
+        recusada chega em `interrupted`; um fechamento limpo não muda nada,
+        daí o probe periódico.
+        """
+        loop = asyncio.get_running_loop()
+        next_probe = loop.time() + PROBE_INTERVAL
+        down_since = None
+        while not interrupted.is_set():
+            now = loop.time()
+            if not (client.is_connected and channel.is_joined):
+                down_since = down_since or now
+                if now - down_since >= SUBSCRIBE_TIMEOUT:
+                    return
+            elif down_since is not None:
+                down_since = None
+                next_probe = now + PROBE_INTERVAL
+            elif now >= next_probe:
+                if not await self._probe(channel):
+                    logger.warning("Realtime: probe sem resposta em %.0fs", PROBE_TIMEOUT)
+                    return
+                next_probe = loop.time() + PROBE_INTERVAL
+            await asyncio.sleep(WATCH_INTERVAL)
+
+    @staticmethod
+    async def _probe(channel) -> bool:
+        """Broadcast com ack; True se o servidor respondeu (ok ou erro)"""
+        from realtime import ChannelEvents, RealtimeAcknowledgementStatus
+
+        answered = asyncio.get_running_loop().create_future()
+
+        def on_reply(_response=None):
+            if not answered.done():
+                answered.set_result(True)
+
+        push = await channel.push(
+            ChannelEvents.broadcast, {"type": "broadcast", "event": "dlg-probe", "payload": {}}
+        )
+        push.receive(RealtimeAcknowledgementStatus.Ok, on_reply)
+        push.receive(RealtimeAcknowledgementStatus.Error, on_reply)
+        try:
+            return await asyncio.wait_for(answered, PROBE_TIMEOUT)
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            push.destroy()
+
+    def _on_change(self, payload: Dict[str, Any]):
+        event = classify_change(payload.get("data") or {}, self._device_id)
+        if event is None:
+            return
+        logger.info("Realtime: %s", event)
+        try:
+            self._on_event(event)
+        except Exception as e:
+            logger.error("Realtime: erro ao entregar evento %s: %s", event, e)
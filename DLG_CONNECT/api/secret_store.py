@@ -0,0 +1,207 @@
+"""
+DLG Connect - Secret Store
+Segredos (refresh tokens) fora dos arquivos JSON de estado: keyring do SO
+quando instalado, senão cifrados em disco
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Optional, Dict
+
+from .logger import get_logger
+
+logger = get_logger("secrets")
+
+
+def _dpapi(data: bytes, protect: bool) -> bytes:
+    """Cifra/decifra com a DPAPI do Windows (chave da conta do usuário)"""
+    import ctypes
+    from ctypes import wintypes
+
+    class _Blob(ctypes.Structure):
+        _fields_ = [("cbData", wintypes.DWORD), ("pbData", ctypes.POINTER(ctypes.c_char))]
+
+    CRYPTPROTECT_UI_FORBIDDEN = 0x01
+    buffer = ctypes.create_string_buffer(data, len(data))
+    blob_in = _Blob(len(data), ctypes.cast(buffer, ctypes.POINTER(ctypes.c_char)))
+    blob_out = _Blob()
+    crypt32 = ctypes.windll.crypt32
+    function = crypt32.CryptProtectData if protect else crypt32.CryptUnprotectData
+    if not function(ctypes.byref(blob_in), None, None, None, None,
+                    CRYPTPROTECT_UI_FORBIDDEN, ctypes.byref(blob_out)):
+        raise ctypes.WinError()
+    try:
+        return ctypes.string_at(blob_out.pbData, blob_out.cbData)
+    finally:
+        ctypes.windll.kernel32.LocalFree(blob_out.pbData)
+
+
+class SecretStore:
+    """
+    Guarda segredos por nome (ex.: "refresh_token:<user_id>").
+
+    Com o pacote keyring instalado, usa o cofre do SO (Credential Manager,
+    Keychain, Secret Service). Sem ele, os segredos ficam em secrets.bin,
+    cifrado com a DPAPI no Windows ou com AES-GCM nos demais sistemas
+    (chave em secrets.key, legível só pelo usuário).
+
+    Leituras passam por um cache em memória; set() sem mudança não grava.
+    """
+
+    SERVICE = "DLG Connect"
+    SECRETS_FILE = "secrets.bin"
+    KEY_FILE = "secrets.key"
+    NONCE_SIZE = 12
+
+    def __init__(self, folder: Path):
+        self._folder = Path(folder)
+        self._lock = threading.RLock()
+        self._cache: Dict[str, Optional[str]] = {}
+        self._keyring = None
+        self._keyring_checked = False
+        # Conteúdo decifrado do secrets.bin (sem keyring)
+        self._vault: Optional[Dict[str, str]] = None
+
+    # ========== API PÚBLICA ==========
+
+    def get(self, name: str) -> Optional[str]:
+        with self._lock:
+            if name not in self._cache:
+                self._cache[name] = self._read(name)
+            return self._cache[name]
+
+    def set(self, name: str, value: Optional[str]) -> bool:
+        """Grava o segredo (vazio = apaga); retorna False se nada mudou"""
+        value = value or None
+        with self._lock:
+            if self.get(name) == value:
+                return False
+            if value is None:
+                self._remove(name)
+            else:
+                self._write(name, value)
+            self._cache[name] = value
+            return True
+
+    def delete(self, name: str) -> bool:
+        return self.set(name, None)
+
+    @property
+    def backend(self) -> str:
+        """"keyring" ou "file" (para diagnóstico)"""
+        return "keyring" if self._get_keyring() else "file"
+
+    # ========== KEYRING ==========
+
+    def _get_keyring(self):
+        if not self._keyring_checked:
+            self._keyring_checked = True
+            try:
+                import keyring
+                # Backend "fail"/nulo (sem cofre no SO) tem prioridade < 1
+                if keyring.get_keyring().priority >= 1:
+                    self._keyring = keyring
+            except Exception:
+                self._keyring = None
+        return self._keyring
+
+    def _disable_keyring(self, error: Exception):
+        logger.warning("Keyring indisponível (%s); usando arquivo cifrado", error)
+        self._keyring = None
+
+    def _read(self, name: str) -> Optional[str]:
+        keyring = self._get_keyring()
+        if keyring is not None:
+            try:
+                return keyring.get_password(self.SERVICE, name)
+            except Exception as e:
+                self._disable_keyring(e)
+        return self._load_vault().get(name)
+
+    def _write(self, name: str, value: str):
+        keyring = self._get_keyring()
+        if keyring is not None:
+            try:
+                keyring.set_password(self.SERVICE, name, value)
+                return
+            except Exception as e:
+                self._disable_keyring(e)
+        vault = self._load_vault()
+        vault[name] = value
+        self._save_vault(vault)
+
+    def _remove(self, name: str):
+        keyring = self._get_keyring()
+        if keyring is not None:
+            from keyring.errors import PasswordDeleteError
+            try:
+                keyring.delete_password(self.SERVICE, name)
+            except PasswordDeleteError:
+                pass
+            except Exception as e:
+                self._disable_keyring(e)
+            else:
+                return
+        vault = self._load_vault()
+        if vault.pop(name, None) is not None:
+            self._save_vault(vault)
+
+    # ========== ARQUIVO CIFRADO ==========
+
+    def _load_vault(self) -> Dict[str, str]:
+        if self._vault is None:
+            self._vault = {}
+            path = self._folder / self.SECRETS_FILE
+            try:
+                if path.exists():
+                    data = json.loads(self._unprotect(path.read_bytes()))
+                    if isinstance(data, dict):
+                        self._vault = data
+            except Exception as e:
+                # Arquivo de outra conta/máquina ou corrompido: segredos perdidos, novo login
+                logger.warning("Não foi possível ler %s: %s", self.SECRETS_FILE, e)
+        return self._vault
+
+    def _save_vault(self, vault: Dict[str, str]):
+        path = self._folder / self.SECRETS_FILE
+        if not vault:
+            path.unlink(missing_ok=True)
+            return
+        blob = self._protect(json.dumps(vault, separators=(",", ":")).encode("utf-8"))
+        self._folder.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(blob)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def _protect(self, data: bytes) -> bytes:
+        if os.name == "nt":
+            return _dpapi(data, protect=True)
+        from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+        nonce = os.urandom(self.NONCE_SIZE)
+        return nonce + AESGCM(self._file_key()).encrypt(nonce, data, None)
+
+    def _unprotect(self, blob: bytes) -> bytes:
+        if os.name == "nt":
+            return _dpapi(blob, protect=False)
+        from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+        nonce, ciphertext = blob[:self.NONCE_SIZE], blob[self.NONCE_SIZE:]
+        return AESGCM(self._file_key()).decrypt(nonce, ciphertext, None)
+
+    def _file_key(self) -> bytes:
+        """Chave AES-256 local, criada no primeiro uso com permissão 0600"""
+        path = self._folder / self.KEY_FILE
+        try:
+            return path.read_bytes()
+        except FileNotFoundError:
+            pass
+        self._folder.mkdir(parents=True, exist_ok=True)
+        key = os.urandom(32)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(key)
+        return key
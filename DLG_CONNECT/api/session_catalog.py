@@ -0,0 +1,353 @@
+"""
+DLG Connect - Session Catalog
+Índice SQLite das sessions do Telegram (telegram_sessions/) com scan incremental
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Optional, Dict, Any, List
+
+from .logger import get_logger
+from .session_manager import session_manager
+
+logger = get_logger("catalog")
+
+
+# Status de cada conta -> rótulo exibido nos cards/lista
+STATUS_LABELS = {
+    "active": "Ativa",
+    "flood_2d": "Float 2d",
+    "flood_7d": "7 dias",
+    "banned": "Banida",
+}
+DEFAULT_STATUS = "active"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    path         TEXT PRIMARY KEY,
+    phone        TEXT NOT NULL,
+    phone_digits TEXT NOT NULL,
+    status       TEXT NOT NULL DEFAULT 'active',
+    last_used    REAL NOT NULL DEFAULT 0,
+    added_today  INTEGER NOT NULL DEFAULT 0,
+    added_day    TEXT NOT NULL DEFAULT '',
+    file_hash    TEXT NOT NULL,
+    mtime_ns     INTEGER NOT NULL,
+    size         INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_phone ON sessions(phone_digits);
+CREATE INDEX IF NOT EXISTS idx_sessions_status ON sessions(status, last_used);
+CREATE INDEX IF NOT EXISTS idx_sessions_last_used ON sessions(last_used);
+CREATE INDEX IF NOT EXISTS idx_sessions_hash ON sessions(file_hash);
+
+-- Contadores dos cards, mantidos pelos triggers (sem COUNT(*) na leitura)
+CREATE TABLE IF NOT EXISTS status_counts (
+    status TEXT PRIMARY KEY,
+    total  INTEGER NOT NULL DEFAULT 0
+);
+CREATE TRIGGER IF NOT EXISTS trg_sessions_insert AFTER INSERT ON sessions BEGIN
+    INSERT OR IGNORE INTO status_counts(status, total) VALUES (NEW.status, 0);
+    UPDATE status_counts SET total = total + 1 WHERE status = NEW.status;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_sessions_delete AFTER DELETE ON sessions BEGIN
+    UPDATE status_counts SET total = total - 1 WHERE status = OLD.status;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_sessions_status AFTER UPDATE OF status ON sessions
+WHEN OLD.status <> NEW.status BEGIN
+    UPDATE status_counts SET total = total - 1 WHERE status = OLD.status;
+    INSERT OR IGNORE INTO status_counts(status, total) VALUES (NEW.status, 0);
+    UPDATE status_counts SET total = total + 1 WHERE status = NEW.status;
+END;
+"""
+
+
+@dataclass
+class ScanResult:
+    """Resumo de um scan incremental da pasta de sessions"""
+
+    added: int = 0
+    updated: int = 0
+    removed: int = 0
+    unchanged: int = 0
+    elapsed_ms: float = 0.0
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.added or self.updated or self.removed)
+
+
+class SessionCatalog:
+    """
+    Catálogo das sessions do Telegram em um banco SQLite (sessions.db).
+
+    scan() lê só os metadados da pasta (os.scandir) e reindexa apenas os
+    arquivos cujo mtime/tamanho mudou; o conteúdo (hash) só é lido nesses.
+    Busca, filtro por status e contadores saem do índice, sem percorrer
+    a pasta. Seguro para usar de várias threads (uma conexão + lock).
+    """
+
+    DB_FILE = "sessions.db"
+    SESSION_SUFFIX = ".session"
+    HASH_CHUNK = 1024 * 1024
+
+    def __init__(self, app_data_path: Path, sessions_folder: Path):
+        self._db_path = Path(app_data_path) / self.DB_FILE
+        self._folder = Path(sessions_folder)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+
+    # ========== CONEXÃO ==========
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(str(self._db_path), check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+            logger.debug("Catálogo aberto: %s", self._db_path)
+        return self._conn
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # ========== SCAN ==========
+
+    def scan(self) -> ScanResult:
+        """Sincroniza o índice com a pasta, reindexando só o que mudou"""
+        started = time.perf_counter()
+        result = ScanResult()
+
+        on_disk: Dict[str, os.stat_result] = {}
+        try:
+            with os.scandir(self._folder) as entries:
+                for entry in entries:
+                    if entry.name.endswith(self.SESSION_SUFFIX) and entry.is_file():
+                        on_disk[entry.name] = entry.stat()
+        except FileNotFoundError:
+            pass
+
+        with self._lock:
+            db = self._db()
+            indexed = {
+                row["path"]: (row["mtime_ns"], row["size"])
+                for row in db.execute("SELECT path, mtime_ns, size FROM sessions")
+            }
+
+            with db:
+                for name, st in on_disk.items():
+                    known = indexed.pop(name, None)
+                    if known == (st.st_mtime_ns, st.st_size):
+                        result.unchanged += 1
+                        continue
+                    try:
+                        file_hash = self._hash_file(self._folder / name)
+                    except OSError as e:
+                        logger.warning("Erro ao ler %s: %s", name, e)
+                        continue
+
+                    if known is None:
+                        phone = self._read_phone(name)
+                        db.execute(
+                            "INSERT INTO sessions(path, phone, phone_digits, status, last_used,"
+                            " file_hash, mtime_ns, size) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                            (name, phone, _digits(phone), DEFAULT_STATUS, st.st_mtime,
+                             file_hash, st.st_mtime_ns, st.st_size),
+                        )
+                        result.added += 1
+                    else:
+                        # O Telethon grava no .session a cada uso da conta
+                        db.execute(
+                            "UPDATE sessions SET file_hash = ?, mtime_ns = ?, size = ?,"
+                            " last_used = MAX(last_used, ?) WHERE path = ?",
+                            (file_hash, st.st_mtime_ns, st.st_size, st.st_mtime, name),
+                        )
+                        result.updated += 1
+
+                if indexed:
+                    db.executemany("DELETE FROM sessions WHERE path = ?", [(p,) for p in indexed])
+                    result.removed = len(indexed)
+
+        result.elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+        if result.changed:
+            logger.info(
+                "Scan: +%d ~%d -%d (%d sem mudança) em %.1f ms",
+                result.added, result.updated, result.removed, result.unchanged, result.elapsed_ms
+            )
+        return result
+
+    def _hash_file(self, path: Path) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(self.HASH_CHUNK), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _read_phone(self, name: str) -> str:
+        """Telefone do JSON que acompanha a session (se houver) ou do nome do arquivo"""
+        stem = name[:-len(self.SESSION_SUFFIX)]
+        sidecar = self._folder / f"{stem}.json"
+        try:
+            if sidecar.exists():
+                with open(sidecar, "r", encoding="utf-8") as f:
+                    phone = json.load(f).get("phone")
+                if phone:
+                    phone = str(phone)
+                    return phone if phone.startswith("+") else f"+{phone}"
+        except Exception as e:
+            logger.debug("JSON inválido para %s: %s", name, e)
+
+        digits = _digits(stem)
+        return f"+{digits}" if digits else stem
+
+    # ========== ATUALIZAÇÕES ==========
+
+    def set_status(self, path: str, status: str) -> bool:
+        """Altera o status de uma conta (ativa, flood, banida)"""
+        if status not in STATUS_LABELS:
+            raise ValueError(f"Status inválido: {status}")
+        with self._lock:
+            db = self._db()
+            with db:
+                cursor = db.execute("UPDATE sessions SET status = ? WHERE path = ?", (status, path))
+            return cursor.rowcount > 0
+
+    def record_usage(self, path: str, added: int = 0) -> bool:
+        """Marca a conta como usada agora e soma membros adicionados hoje"""
+        today = date.today().isoformat()
+        with self._lock:
+            db = self._db()
+            with db:
+                cursor = db.execute(
+                    "UPDATE sessions SET last_used = ?,"
+                    " added_today = CASE WHEN added_day = ? THEN added_today + ? ELSE ? END,"
+                    " added_day = ? WHERE path = ?",
+                    (time.time(), today, added, added, today, path),
+                )
+            return cursor.rowcount > 0
+
+    def delete(self, path: str) -> bool:
+        """Apaga o arquivo da session (e o JSON que a acompanha) e tira do índice"""
+        name = Path(path).name
+        stem = name[:-len(self.SESSION_SUFFIX)] if name.endswith(self.SESSION_SUFFIX) else name
+        for file in (self._folder / name, self._folder / f"{stem}.json"):
+            try:
+                file.unlink()
+            except FileNotFoundError:
+                pass
+
+        with self._lock:
+            db = self._db()
+            with db:
+                cursor = db.execute("DELETE FROM sessions WHERE path = ?", (name,))
+            return cursor.rowcount > 0
+
+    # ========== CONSULTAS ==========
+
+    def stats(self) -> Dict[str, Any]:
+        """Contadores dos cards (total, por status, adicionados hoje)"""
+        with self._lock:
+            db = self._db()
+            by_status = {status: 0 for status in STATUS_LABELS}
+            for row in db.execute("SELECT status, total FROM status_counts"):
+                by_status[row["status"]] = row["total"]
+            added_today = db.execute(
+                "SELECT COALESCE(SUM(added_today), 0) FROM sessions WHERE added_day = ?",
+                (date.today().isoformat(),),
+            ).fetchone()[0]
+        return {
+            "total": sum(by_status.values()),
+            "by_status": by_status,
+            "added_today": added_today,
+        }
+
+    def count(self, search: str = "", status: Optional[str] = None) -> int:
+        where, params = self._filter(search, status)
+        with self._lock:
+            return self._db().execute(f"SELECT COUNT(*) FROM sessions{where}", params).fetchone()[0]
+
+    def query(
+        self,
+        search: str = "",
+        status: Optional[str] = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> List[Dict[str, Any]]:
+        """Contas filtradas por telefone/status, usadas mais recentemente primeiro (limit=-1: todas)"""
+        where, params = self._filter(search, status)
+        with self._lock:
+            rows = self._db().execute(
+                f"SELECT path, phone, status, last_used, added_today, added_day, file_hash"
+                f" FROM sessions{where} ORDER BY last_used DESC, path LIMIT ? OFFSET ?",
+                (*params, limit, offset),
+            ).fetchall()
+
+        today = date.today().isoformat()
+        return [
+            {
+                "path": row["path"],
+                "phone": row["phone"],
+                "status": row["status"],
+                "statusLabel": STATUS_LABELS.get(row["status"], row["status"]),
+                "lastUsed": row["last_used"],
+                "addedToday": row["added_today"] if row["added_day"] == today else 0,
+                "fileHash": row["file_hash"],
+            }
+            for row in rows
+        ]
+
+    def duplicates(self) -> List[List[str]]:
+        """Grupos de arquivos com o mesmo conteúdo (mesma conta copiada)"""
+        with self._lock:
+            rows = self._db().execute(
+                "SELECT group_concat(path, char(10)) AS paths FROM sessions"
+                " GROUP BY file_hash HAVING COUNT(*) > 1"
+            ).fetchall()
+        return [row["paths"].split("\n") for row in rows]
+
+    @staticmethod
+    def _filter(search: str, status: Optional[str]):
+        clauses, params = [], []
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+
+        search = search.strip().lower()
+        if search:
+            digits = _digits(search)
+            # Busca também pelo rótulo do status ("banida", "7 dias"...)
+            statuses = [code for code, label in STATUS_LABELS.items() if search in label.lower()]
+            options = []
+            if digits:
+                options.append("phone_digits LIKE ?")
+                params.append(f"%{digits}%")
+            if statuses:
+                options.append(f"status IN ({', '.join('?' * len(statuses))})")
+                params.extend(statuses)
+            clauses.append(f"({' OR '.join(options)})" if options else "0")
+
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, params
+
+
+def _digits(value: str) -> str:
+    return re.sub(r"\D", "", value)
+
+
+# Instância global (o banco só é aberto no primeiro uso)
+session_catalog = SessionCatalog(
+    session_manager.get_app_data_path(),
+    session_manager.get_sessions_folder()
+)
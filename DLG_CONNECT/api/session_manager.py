@@ -4,21 +4,38 @@ Gerencia persistência de sessão local para auto-login
 """
 
 import os
-import json
+import atexit
 import hashlib
+import threading
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 
+from .logger import get_logger
+from .state_store import StateStore
+from .secret_store import SecretStore
+
+logger = get_logger("session")
+
 
 class SessionManager:
-    """Gerencia sessão local do usuário para persistência de login"""
+    """
+    Gerencia sessão local do usuário para persistência de login.
+    
+    session.json é a sessão ativa (auto-login); profiles.json guarda a
+    sessão de cada conta já logada neste dispositivo, por user_id, para
+    trocar de operador sem novo login (activate_profile).
+    
+    O refresh token de cada conta não vai para esses arquivos: fica no
+    SecretStore (keyring do SO ou secrets.bin cifrado), por user_id.
+    """
     
     _instance: Optional['SessionManager'] = None
     
     # Pasta de dados do app
     APP_NAME = "DLG Connect"
     SESSION_FILE = "session.json"
+    PROFILES_FILE = "profiles.json"
     
     def __new__(cls):
         """Singleton pattern"""
@@ -32,14 +49,21 @@ class SessionManager:
             return
             
         self._app_data_path = self._get_app_data_path()
-        self._session_path = self._get_session_path()
+        self._app_data_created = False
+        # Sessão + seções extras (profile.json, settings.json...), gravadas em segundo plano
+        self._store = StateStore(
+            self._app_data_path, {"session": self.SESSION_FILE, "profiles": self.PROFILES_FILE}
+        )
+        atexit.register(self._store.flush)
+        self._secrets = SecretStore(self._app_data_path)
+        self._profiles_migrated = False
         self._session_data: Optional[Dict[str, Any]] = None
+        # Sessão é lida do disco sob demanda (ou pré-carregada no startup)
+        self._loaded = False
+        self._load_lock = threading.Lock()
         self._initialized = True
         
-        # Carregar sessão existente
-        self._load_session()
-        
-        print(f"[Session] Pasta de dados: {self._app_data_path}")
+        logger.debug("Pasta de dados: %s", self._app_data_path)
     
     def _get_app_data_path(self) -> Path:
         """Retorna o caminho da pasta de dados do app baseado no SO"""
@@ -58,52 +82,64 @@ class SessionManager:
             # Linux (dev): ~/.dlg-connect/
             base_path = Path.home() / ".dlg-connect"
         
-        # Criar diretório principal se não existir
-        base_path.mkdir(parents=True, exist_ok=True)
-        
         return base_path
     
-    def _get_session_path(self) -> Path:
-        """Retorna o caminho do arquivo de sessão"""
-        return self._app_data_path / self.SESSION_FILE
-    
     def get_app_data_path(self) -> Path:
         """Retorna o caminho da pasta de dados do app (público)"""
+        # Criada no primeiro uso, não no import do módulo
+        if not self._app_data_created:
+            self._app_data_path.mkdir(parents=True, exist_ok=True)
+            self._app_data_created = True
         return self._app_data_path
     
     def get_sessions_folder(self) -> Path:
         """Retorna pasta para armazenar sessions do Telegram"""
-        sessions_path = self._app_data_path / "telegram_sessions"
+        sessions_path = self.get_app_data_path() / "telegram_sessions"
         sessions_path.mkdir(parents=True, exist_ok=True)
         return sessions_path
     
     def get_logs_folder(self) -> Path:
         """Retorna pasta para logs locais"""
-        logs_path = self._app_data_path / "logs"
+        logs_path = self.get_app_data_path() / "logs"
         logs_path.mkdir(parents=True, exist_ok=True)
         return logs_path
     
     def get_cache_folder(self) -> Path:
         """Retorna pasta para cache"""
-        cache_path = self._app_data_path / "cache"
+        cache_path = self.get_app_data_path() / "cache"
         cache_path.mkdir(parents=True, exist_ok=True)
         return cache_path
     
+    def preload(self) -> bool:
+        """Carrega a sessão salva do disco (seguro para chamar de outra thread)"""
+        self._ensure_loaded()
+        return self._session_data is not None
+    
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        with self._load_lock:
+            if not self._loaded:
+                self._load_session()
+                self._loaded = True
+    
     def _load_session(self) -> bool:
         """Carrega sessão do arquivo local"""
-        try:
-            if self._session_path.exists():
-                with open(self._session_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    
-                # Verificar se a sessão não está corrompida
-                if data.get("user_id") and data.get("email"):
-                    self._session_data = data
-                    print(f"[Session] Sessão carregada para: {data.get('email')}")
-                    return True
-                    
-        except Exception as e:
-            print(f"[Session] Erro ao carregar sessão: {e}")
+        data = self._store.get("session")
+        
+        # Verificar se a sessão não está corrompida
+        if data and data.get("user_id") and data.get("email"):
+            if "refresh_token" in data:
+                # Sessão de versões antigas: o token sai do session.json
+                data = dict(data)
+                self._secrets.set(self._token_name(data["user_id"]), data.pop("refresh_token"))
+                self._store.set("session", data)
+            self._session_data = data
+            logger.info("Sessão carregada para: %s", data.get("email"))
+            if data["user_id"] not in self._profiles():
+                # Sessão de antes dos perfis: vira o primeiro perfil salvo
+                self._save_profile(data)
+            return True
         
         self._session_data = None
         return False
@@ -117,84 +153,199 @@ class SessionManager:
         device_fingerprint: str = "",
         plan_name: str = "",
         expires_at: str = "",
-        is_trial: bool = False
+        is_trial: bool = False,
+        entitlement: str = "",
+        refresh_token: str = ""
     ) -> bool:
-        """Salva sessão localmente após login bem-sucedido"""
-        try:
-            session_data = {
-                "user_id": user_id,
-                "email": email,
-                "name": name,
-                "avatar": avatar,
-                "device_fingerprint": device_fingerprint,
-                "plan_name": plan_name,
-                "expires_at": expires_at,
-                "is_trial": is_trial,
-                "saved_at": datetime.now().isoformat(),
-                # Hash para verificação de integridade
-                "checksum": self._generate_checksum(user_id, email, device_fingerprint)
-            }
-            
-            with open(self._session_path, 'w', encoding='utf-8') as f:
-                json.dump(session_data, f, indent=2)
-            
-            self._session_data = session_data
-            print(f"[Session] Sessão salva para: {email}")
-            return True
-            
-        except Exception as e:
-            print(f"[Session] Erro ao salvar sessão: {e}")
-            return False
+        """
+        Salva sessão localmente após login bem-sucedido.
+        Sem mudanças em relação à sessão atual, não grava nada; a gravação
+        em disco é feita em segundo plano (ver StateStore).
+        """
+        self._ensure_loaded()
+        session_data = {
+            "user_id": user_id,
+            "email": email,
+            "name": name,
+            "avatar": avatar,
+            "device_fingerprint": device_fingerprint,
+            "plan_name": plan_name,
+            "expires_at": expires_at,
+            "is_trial": is_trial,
+            # Token assinado pelo servidor (auto-login sem rede)
+            "entitlement": entitlement,
+            "saved_at": datetime.now().isoformat(),
+            # Hash para verificação de integridade
+            "checksum": self._generate_checksum(user_id, email, device_fingerprint)
+        }
+        
+        # Login em outra conta: o perfil dela passa a ser o usado por último
+        switched = (self._session_data or {}).get("user_id") != user_id
+        # Renova o token do canal Realtime no auto-login (fora do session.json)
+        self._secrets.set(self._token_name(user_id), refresh_token)
+        if self._store.set("session", session_data, ignore=("saved_at",)):
+            logger.info("Sessão salva para: %s", email)
+        self._save_profile(session_data, touch=switched)
+        self._session_data = self._store.get("session")
+        self._loaded = True
+        return True
     
     def clear_session(self) -> bool:
-        """Remove sessão local (logout ou erro de verificação)"""
+        """Remove sessão local (logout ou erro de verificação), inclusive o perfil salvo"""
         try:
-            if self._session_path.exists():
-                self._session_path.unlink()
-                print("[Session] Sessão removida")
-            
+            user_id = self.get_user_id()
+            self._store.delete("session")
             self._session_data = None
+            self._loaded = True
+            if user_id:
+                self.remove_profile(user_id)
+            logger.info("Sessão removida")
             return True
             
         except Exception as e:
-            print(f"[Session] Erro ao remover sessão: {e}")
+            logger.error("Erro ao remover sessão: %s", e)
             return False
     
+    # ========== PERFIS ==========
+    
+    def _profiles(self) -> Dict[str, Dict[str, Any]]:
+        profiles = self._store.get("profiles") or {}
+        if not self._profiles_migrated:
+            self._profiles_migrated = True
+            if any("refresh_token" in profile for profile in profiles.values()):
+                profiles = self._migrate_profile_tokens(profiles)
+        return profiles
+    
+    def _migrate_profile_tokens(self, profiles: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Perfis de versões antigas: os refresh tokens saem do profiles.json"""
+        migrated = {}
+        for user_id, profile in profiles.items():
+            profile = dict(profile)
+            token = profile.pop("refresh_token", None)
+            # O da sessão ativa, se já migrado, é mais novo
+            if token and not self._secrets.get(self._token_name(user_id)):
+                self._secrets.set(self._token_name(user_id), token)
+            migrated[user_id] = profile
+        self._store.set("profiles", migrated)
+        return migrated
+    
+    def _save_profile(self, session_data: Dict[str, Any], touch: bool = False):
+        """Guarda a sessão como perfil do usuário (só grava se algo mudou)"""
+        user_id = session_data["user_id"]
+        previous = self._profiles().get(user_id) or {}
+        profile = {k: v for k, v in session_data.items() if k != "saved_at"}
+        profile["last_used_at"] = (
+            None if touch else previous.get("last_used_at")
+        ) or datetime.now().isoformat()
+        self._store.update("profiles", **{user_id: profile})
+    
+    def list_profiles(self) -> List[Dict[str, Any]]:
+        """Perfis salvos, do usado mais recentemente ao mais antigo ("active" marca o atual)"""
+        self._ensure_loaded()
+        active = self.get_user_id()
+        profiles = [
+            {**profile, "active": user_id == active}
+            for user_id, profile in self._profiles().items()
+        ]
+        profiles.sort(key=lambda p: p.get("last_used_at", ""), reverse=True)
+        return profiles
+    
+    def get_profile(self, user_id: str) -> Optional[Dict[str, Any]]:
+        return self._profiles().get(user_id)
+    
+    def activate_profile(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Torna um perfil salvo a sessão ativa (sem rede; a gravação em disco
+        fica em segundo plano). Retorna a sessão, ou None se não existe.
+        """
+        self._ensure_loaded()
+        profile = self._profiles().get(user_id)
+        if profile is None:
+            return None
+        
+        now = datetime.now().isoformat()
+        session_data = {k: v for k, v in profile.items() if k != "last_used_at"}
+        session_data["saved_at"] = now
+        self._store.set("session", session_data, ignore=("saved_at",))
+        self._store.update("profiles", **{user_id: {**profile, "last_used_at": now}})
+        self._session_data = self._store.get("session")
+        self._loaded = True
+        logger.info("Perfil ativo: %s", profile.get("email"))
+        return self._session_data
+    
+    def remove_profile(self, user_id: str) -> bool:
+        """Esquece um perfil salvo e o refresh token dele; retorna False se não existia"""
+        self._secrets.delete(self._token_name(user_id))
+        profiles = dict(self._profiles())
+        if profiles.pop(user_id, None) is None:
+            return False
+        self._store.set("profiles", profiles)
+        return True
+    
+    def get_section(self, section: str) -> Dict[str, Any]:
+        """Dados de uma seção persistida (profile, license, settings...)"""
+        return dict(self._store.get(section) or {})
+    
+    def update_section(self, section: str, **fields) -> bool:
+        """Atualiza campos de uma seção; só grava (em segundo plano) se algo mudou"""
+        return self._store.update(section, **fields)
+    
+    def flush(self):
+        """Grava no disco as alterações pendentes (chamar ao fechar o app)"""
+        self._store.flush()
+    
     def has_session(self) -> bool:
         """Verifica se existe uma sessão salva"""
+        self._ensure_loaded()
         return self._session_data is not None and bool(self._session_data.get("user_id"))
     
     def get_session(self) -> Optional[Dict[str, Any]]:
         """Retorna dados da sessão salva"""
+        self._ensure_loaded()
         return self._session_data
     
     def get_user_id(self) -> Optional[str]:
         """Retorna o user_id da sessão salva"""
+        self._ensure_loaded()
         if self._session_data:
             return self._session_data.get("user_id")
         return None
     
     def get_email(self) -> Optional[str]:
         """Retorna o email da sessão salva"""
+        self._ensure_loaded()
         if self._session_data:
             return self._session_data.get("email")
         return None
     
+    def get_refresh_token(self, user_id: Optional[str] = None) -> Optional[str]:
+        """Refresh token salvo da conta (padrão: a da sessão ativa)"""
+        user_id = user_id or self.get_user_id()
+        if not user_id:
+            return None
+        return self._secrets.get(self._token_name(user_id))
+    
+    @staticmethod
+    def _token_name(user_id: str) -> str:
+        return f"refresh_token:{user_id}"
+    
     def get_device_fingerprint(self) -> Optional[str]:
         """Retorna o device_fingerprint da sessão salva"""
+        self._ensure_loaded()
         if self._session_data:
             return self._session_data.get("device_fingerprint")
         return None
     
     def verify_integrity(self, device_fingerprint: str) -> bool:
         """Verifica se a sessão é válida para este dispositivo"""
+        self._ensure_loaded()
         if not self._session_data:
             return False
         
         # Verificar se o device_fingerprint bate
         saved_fp = self._session_data.get("device_fingerprint", "")
         if saved_fp and saved_fp != device_fingerprint:
-            print("[Session] Device fingerprint não confere")
+            logger.warning("Device fingerprint não confere")
             return False
         
         # Verificar checksum
@@ -205,7 +356,7 @@ class SessionManager:
         )
         
         if self._session_data.get("checksum") != expected_checksum:
-            print("[Session] Checksum inválido")
+            logger.warning("Checksum inválido")
             return False
         
         return True
@@ -0,0 +1,115 @@
+"""
+DLG Connect - Settings Cache
+Cache persistente (com TTL) das configurações enviadas pelo servidor
+"""
+
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Optional, Dict, Any
+
+from .logger import get_logger
+
+logger = get_logger("cache")
+
+
+@dataclass
+class CacheEntry:
+    """Valor em cache de uma configuração do servidor"""
+
+    value: Any
+    fetched_at: float   # epoch (segundos)
+    ttl: float          # segundos
+    version: int = 1    # versão do formato do valor
+
+    @property
+    def age(self) -> float:
+        return max(0.0, time.time() - self.fetched_at)
+
+    def is_fresh(self) -> bool:
+        return self.age < self.ttl
+
+
+class SettingsCache:
+    """
+    Cache chave -> CacheEntry gravado em cache/server_settings.json.
+
+    Entradas com versão diferente da pedida são descartadas, e uma mudança
+    em SCHEMA_VERSION invalida o arquivo inteiro.
+    """
+
+    SCHEMA_VERSION = 1
+    CACHE_FILE = "server_settings.json"
+
+    def __init__(self, cache_folder: Path):
+        self._path = Path(cache_folder) / self.CACHE_FILE
+        self._entries: Optional[Dict[str, CacheEntry]] = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, CacheEntry]:
+        if self._entries is not None:
+            return self._entries
+
+        entries: Dict[str, CacheEntry] = {}
+        try:
+            if self._path.exists():
+                with open(self._path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+
+                if data.get("schema_version") == self.SCHEMA_VERSION:
+                    for key, raw in data.get("entries", {}).items():
+                        entries[key] = CacheEntry(**raw)
+                else:
+                    logger.info("Versão do cache mudou, descartando entradas antigas")
+        except Exception as e:
+            logger.warning("Erro ao ler cache: %s", e)
+
+        self._entries = entries
+        return entries
+
+    def _save(self):
+        data = {
+            "schema_version": self.SCHEMA_VERSION,
+            "entries": {key: asdict(entry) for key, entry in self._entries.items()},
+        }
+        tmp_path = self._path.with_suffix(".tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self._path)
+        except Exception as e:
+            logger.warning("Erro ao salvar cache: %s", e)
+
+    def get(self, key: str, version: int = 1) -> Optional[CacheEntry]:
+        """Retorna a entrada em cache (mesmo expirada) ou None"""
+        with self._lock:
+            entry = self._load().get(key)
+            if entry is not None and entry.version != version:
+                return None
+            return entry
+
+    def put(self, key: str, value: Any, ttl: float, version: int = 1) -> bool:
+        """
+        Grava um valor no cache.
+        Retorna True se o valor mudou em relação ao que estava em cache.
+        """
+        with self._lock:
+            entries = self._load()
+            previous = entries.get(key)
+            changed = previous is None or previous.version != version or previous.value != value
+            entries[key] = CacheEntry(value=value, fetched_at=time.time(), ttl=ttl, version=version)
+            self._save()
+            return changed
+
+    def invalidate(self, key: Optional[str] = None):
+        """Remove uma entrada (ou todas)"""
+        with self._lock:
+            entries = self._load()
+            if key is None:
+                entries.clear()
+            else:
+                entries.pop(key, None)
+            self._save()
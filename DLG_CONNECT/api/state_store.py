@@ -0,0 +1,151 @@
+"""
+DLG Connect - State Store
+Persistência em seções JSON com escrita atômica, diff e gravação adiada
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Optional, Dict, Any, Iterable
+
+from .logger import get_logger
+
+logger = get_logger("store")
+
+
+def atomic_write_json(path: Path, data: Any):
+    """Grava JSON de forma atômica: arquivo temporário + fsync + rename"""
+    tmp_path = path.with_name(path.name + ".tmp")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+    if os.name == "posix":
+        # Garante que o rename também chegou ao disco
+        dir_fd = os.open(path.parent, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+class StateStore:
+    """
+    Estado persistido em seções independentes, um arquivo por seção
+    (session.json, profile.json, license.json...), então mudar uma
+    seção não regrava as outras.
+
+    set()/update() comparam com o estado em memória e ignoram gravações
+    sem mudança. As mudanças ficam pendentes e são gravadas juntas,
+    WRITE_DELAY segundos depois da primeira, em uma thread de fundo.
+    flush() grava tudo na hora (chamado ao sair do app).
+    """
+
+    WRITE_DELAY = 0.5
+
+    def __init__(self, folder: Path, filenames: Optional[Dict[str, str]] = None):
+        self._folder = Path(folder)
+        self._filenames = dict(filenames or {})
+        self._data: Dict[str, Optional[Dict[str, Any]]] = {}
+        self._dirty: set = set()
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.RLock()
+        # Serializa as gravações no disco (fora do _lock, para não travar quem lê)
+        self._write_lock = threading.Lock()
+
+    def path(self, section: str) -> Path:
+        return self._folder / self._filenames.get(section, f"{section}.json")
+
+    # ========== LEITURA ==========
+
+    def get(self, section: str) -> Optional[Dict[str, Any]]:
+        """Conteúdo da seção (lido do disco na primeira vez) ou None"""
+        with self._lock:
+            if section not in self._data:
+                self._data[section] = self._read(section)
+            return self._data[section]
+
+    def _read(self, section: str) -> Optional[Dict[str, Any]]:
+        path = self.path(section)
+        try:
+            if path.exists():
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if isinstance(data, dict):
+                    return data
+        except Exception as e:
+            logger.warning("Erro ao ler %s: %s", path.name, e)
+        return None
+
+    # ========== ESCRITA ==========
+
+    def set(self, section: str, data: Dict[str, Any], ignore: Iterable[str] = ()) -> bool:
+        """
+        Substitui a seção. Chaves em `ignore` (ex: timestamps) não contam
+        como mudança. Retorna True se algo mudou e a gravação foi agendada.
+        """
+        ignore = set(ignore)
+        with self._lock:
+            current = self.get(section)
+            if current is not None and self._strip(current, ignore) == self._strip(data, ignore):
+                return False
+            self._data[section] = dict(data)
+            self._mark_dirty(section)
+            return True
+
+    def update(self, section: str, **fields) -> bool:
+        """Altera apenas alguns campos da seção"""
+        with self._lock:
+            current = self.get(section) or {}
+            if all(current.get(k) == v for k, v in fields.items()):
+                return False
+            self._data[section] = {**current, **fields}
+            self._mark_dirty(section)
+            return True
+
+    def delete(self, section: str):
+        """Remove a seção do disco imediatamente (ex: logout)"""
+        with self._write_lock, self._lock:
+            self._data[section] = None
+            self._dirty.discard(section)
+            path = self.path(section)
+            if path.exists():
+                path.unlink()
+
+    def flush(self):
+        """Grava agora todas as seções pendentes"""
+        with self._write_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                pending = {
+                    section: dict(self._data[section])
+                    for section in self._dirty
+                    if self._data.get(section) is not None
+                }
+                self._dirty.clear()
+
+            for section, data in pending.items():
+                try:
+                    atomic_write_json(self.path(section), data)
+                except Exception as e:
+                    logger.error("Erro ao gravar %s: %s", self.path(section).name, e)
+                    # Tenta de novo na próxima gravação
+                    with self._lock:
+                        self._dirty.add(section)
+
+    def _mark_dirty(self, section: str):
+        self._dirty.add(section)
+        if self._timer is None:
+            self._timer = threading.Timer(self.WRITE_DELAY, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    @staticmethod
+    def _strip(data: Dict[str, Any], ignore: set) -> Dict[str, Any]:
+        return {k: v for k, v in data.items() if k not in ignore}
@@ -0,0 +1,251 @@
+"""
+DLG Connect - HTTP Transport
+Camada de transporte com conexões persistentes (keep-alive) para a Edge Function
+"""
+
+import importlib.util
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Optional, Dict, Any, Tuple, Union
+from urllib.parse import urlsplit
+
+# requests/httpx são importados só quando o primeiro transporte é criado
+# (importar o pacote api não deve custar ~70ms de requests/urllib3)
+if TYPE_CHECKING:
+    import httpx
+    import requests
+
+
+# (connect, read) em segundos
+Timeout = Union[float, Tuple[float, float]]
+
+
+# ========== ERROS ==========
+
+class TransportError(Exception):
+    """Erro genérico de transporte"""
+
+
+class TransportTimeout(TransportError):
+    """Tempo limite de conexão ou leitura excedido"""
+
+
+class TransportConnectionError(TransportError):
+    """Falha ao conectar no servidor"""
+
+
+class TransportSSLError(TransportConnectionError):
+    """Falha no handshake/certificado TLS"""
+
+
+# ========== RESPOSTA ==========
+
+@dataclass
+class TransportResponse:
+    """Resposta HTTP independente da biblioteca usada no transporte (headers em minúsculas)"""
+
+    status_code: int
+    content: bytes
+    headers: Dict[str, str] = field(default_factory=dict)
+    elapsed: float = 0.0
+    # Bytes do corpo como vieram da rede (comprimidos); 0 = desconhecido
+    wire_bytes: int = 0
+
+    @property
+    def received_bytes(self) -> int:
+        return self.wire_bytes or len(self.content)
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+
+# ========== TRANSPORTES ==========
+
+class BaseTransport:
+    """Interface dos transportes usados pelo DLGApiClient"""
+
+    name = "base"
+
+    def __init__(self, default_headers: Optional[Dict[str, str]] = None):
+        # Headers estáticos montados uma única vez
+        self._default_headers = dict(default_headers or {})
+
+    def post(
+        self, url: str, body: bytes, timeout: Timeout, headers: Optional[Dict[str, str]] = None
+    ) -> TransportResponse:
+        """POST do corpo; `headers` extras valem só para esta requisição (ex: If-None-Match)"""
+        raise NotImplementedError
+
+    def close(self):
+        """Fecha todas as conexões abertas"""
+
+
+class RequestsTransport(BaseTransport):
+    """
+    Transporte baseado em requests.Session.
+    Mantém uma sessão (pool keep-alive) por endpoint, reaproveitando a
+    conexão TCP e a sessão TLS entre chamadas.
+    """
+
+    name = "requests"
+    POOL_SIZE = 4
+
+    def __init__(self, default_headers: Optional[Dict[str, str]] = None):
+        super().__init__(default_headers)
+        import requests
+        self._requests = requests
+        self._sessions: Dict[str, "requests.Session"] = {}
+        self._lock = threading.Lock()
+
+    def _get_session(self, url: str) -> "requests.Session":
+        parts = urlsplit(url)
+        key = f"{parts.scheme}://{parts.netloc}"
+
+        session = self._sessions.get(key)
+        if session is not None:
+            return session
+
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = self._requests.Session()
+                session.headers.update(self._default_headers)
+                # Sem retries automáticos: a política de retry fica no cliente
+                adapter = self._requests.adapters.HTTPAdapter(
+                    pool_connections=1,
+                    pool_maxsize=self.POOL_SIZE,
+                    max_retries=0
+                )
+                session.mount(f"{parts.scheme}://", adapter)
+                self._sessions[key] = session
+        return session
+
+    def post(
+        self, url: str, body: bytes, timeout: Timeout, headers: Optional[Dict[str, str]] = None
+    ) -> TransportResponse:
+        session = self._get_session(url)
+        errors = self._requests.exceptions
+        start = time.perf_counter()
+
+        try:
+            response = session.post(url, data=body, timeout=timeout, headers=headers)
+            content = response.content
+        except errors.Timeout as e:
+            raise TransportTimeout(str(e)) from e
+        except errors.SSLError as e:
+            raise TransportSSLError(str(e)) from e
+        except errors.ConnectionError as e:
+            raise TransportConnectionError(str(e)) from e
+        except errors.RequestException as e:
+            raise TransportError(str(e)) from e
+
+        return TransportResponse(
+            status_code=response.status_code,
+            content=content,
+            headers={k.lower(): v for k, v in response.headers.items()},
+            elapsed=time.perf_counter() - start,
+            # urllib3 conta os bytes lidos do socket, antes de descomprimir
+            wire_bytes=response.raw.tell() if response.raw is not None else 0
+        )
+
+    def close(self):
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+
+class Http2Transport(BaseTransport):
+    """
+    Transporte baseado em httpx com HTTP/2.
+    Uma única conexão multiplexa as requisições concorrentes por endpoint.
+    """
+
+    name = "httpx-h2"
+
+    def __init__(self, default_headers: Optional[Dict[str, str]] = None):
+        super().__init__(default_headers)
+        import httpx
+        self._httpx = httpx
+        self._clients: Dict[str, "httpx.Client"] = {}
+        self._lock = threading.Lock()
+
+    def _get_client(self, url: str) -> "httpx.Client":
+        parts = urlsplit(url)
+        key = f"{parts.scheme}://{parts.netloc}"
+
+        client = self._clients.get(key)
+        if client is not None:
+            return client
+
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = self._httpx.Client(http2=True, headers=self._default_headers)
+                self._clients[key] = client
+        return client
+
+    def post(
+        self, url: str, body: bytes, timeout: Timeout, headers: Optional[Dict[str, str]] = None
+    ) -> TransportResponse:
+        client = self._get_client(url)
+        httpx = self._httpx
+
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            httpx_timeout = httpx.Timeout(read, connect=connect)
+        else:
+            httpx_timeout = httpx.Timeout(timeout)
+
+        start = time.perf_counter()
+        try:
+            response = client.post(url, content=body, timeout=httpx_timeout, headers=headers)
+        except httpx.TimeoutException as e:
+            raise TransportTimeout(str(e)) from e
+        except httpx.ConnectError as e:
+            if "SSL" in str(e) or "certificate" in str(e):
+                raise TransportSSLError(str(e)) from e
+            raise TransportConnectionError(str(e)) from e
+        except httpx.HTTPError as e:
+            raise TransportError(str(e)) from e
+
+        return TransportResponse(
+            status_code=response.status_code,
+            content=response.content,
+            headers={k.lower(): v for k, v in response.headers.items()},
+            elapsed=time.perf_counter() - start,
+            wire_bytes=response.num_bytes_downloaded
+        )
+
+    def close(self):
+        with self._lock:
+            for client in self._clients.values():
+                client.close()
+            self._clients.clear()
+
+
+def http2_available() -> bool:
+    """HTTP/2 é opcional: só é usado se httpx + h2 estiverem instalados"""
+    return all(importlib.util.find_spec(name) is not None for name in ("httpx", "h2"))
+
+
+def accept_encoding() -> str:
+    """
+    Accept-Encoding anunciado à Edge Function: brotli só se houver decoder
+    instalado (requests/httpx usam brotli ou brotlicffi), gzip sempre.
+    """
+    if any(importlib.util.find_spec(name) is not None for name in ("brotli", "brotlicffi")):
+        return "br, gzip"
+    return "gzip"
+
+
+def create_transport(
+    default_headers: Optional[Dict[str, str]] = None,
+    prefer_http2: bool = True
+) -> BaseTransport:
+    """Cria o melhor transporte disponível (HTTP/2 se possível)"""
+    if prefer_http2 and http2_available():
+        return Http2Transport(default_headers)
+    return RequestsTransport(default_headers)
@@ -0,0 +1,137 @@
+"""
+DLG Connect - User State
+Estado do usuário logado exposto ao QML, com um sinal de mudança por propriedade
+"""
+
+from typing import Optional, Dict, Any
+
+from PySide6.QtCore import QObject, Property, Signal
+
+from .license_clock import license_clock, parse_timestamp
+from .supabase_client import api
+
+
+# Duração usada na barra de progresso quando a licença não informa o total
+DEFAULT_TOTAL_DAYS = 30
+# Aviso de vencimento no Dashboard a partir daqui (segundos)
+EXPIRING_SOON = 3 * 24 * 60 * 60
+
+
+def snapshot_from_api() -> Dict[str, Any]:
+    """Valores atuais do cliente (usuário, licença/trial), já no formato exibido"""
+    user = api.user or {}
+    access = api.license or api.trial or {}
+    expires = parse_timestamp(access.get("expires_at"))
+
+    # Hora do servidor (LicenseClock): mudar o relógio do sistema não altera os dias
+    remaining = license_clock.seconds_until(access.get("expires_at"))
+    days = license_clock.days_until(access.get("expires_at"))
+    if days is None:
+        days = access.get("days_remaining")
+    days = max(0, int(days or 0))
+
+    return {
+        "authenticated": api.is_authenticated,
+        "userId": user.get("id") or "",
+        "email": user.get("email") or "",
+        "name": api.get_user_display_name(),
+        "avatar": api.get_user_avatar(),
+        "planName": api.get_plan_name(),
+        "accessType": api.get_access_type(),
+        "expiresAt": expires.astimezone().strftime("%d/%m/%Y") if expires else "",
+        "daysRemaining": days,
+        "totalDays": max(days, int(access.get("total_days") or DEFAULT_TOTAL_DAYS)),
+        "expiringSoon": remaining is not None and 0 < remaining <= EXPIRING_SOON,
+    }
+
+
+class UserState(QObject):
+    """
+    Usuário, plano e validade do acesso para bindings no QML.
+
+    refresh() é chamado pelo Backend quando login, verify_session,
+    check_license, check_trial, register_trial ou logout retornam, e pelo
+    LicenseScheduler quando os dias restantes mudam; só as propriedades
+    que mudaram emitem sinal, então Dashboard/Sidebar se atualizam sem
+    chamar slots nem montar JSON.
+    """
+
+    authenticatedChanged = Signal(name="authenticatedChanged")
+    userIdChanged = Signal(name="userIdChanged")
+    emailChanged = Signal(name="emailChanged")
+    nameChanged = Signal(name="nameChanged")
+    avatarChanged = Signal(name="avatarChanged")
+    planNameChanged = Signal(name="planNameChanged")
+    accessTypeChanged = Signal(name="accessTypeChanged")
+    expiresAtChanged = Signal(name="expiresAtChanged")
+    daysRemainingChanged = Signal(name="daysRemainingChanged")
+    totalDaysChanged = Signal(name="totalDaysChanged")
+    expiringSoonChanged = Signal(name="expiringSoonChanged")
+    # Qualquer propriedade mudou (uma vez por refresh)
+    changed = Signal(name="changed")
+
+    def __init__(self, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self._values = snapshot_from_api()
+
+    def refresh(self) -> bool:
+        """Relê o estado do cliente; retorna True se algo mudou"""
+        values = snapshot_from_api()
+        changed = [key for key, value in values.items() if self._values.get(key) != value]
+        self._values = values
+        for key in changed:
+            getattr(self, f"{key}Changed").emit()
+        if changed:
+            self.changed.emit()
+        return bool(changed)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return dict(self._values)
+
+    # ========== PROPRIEDADES ==========
+
+    @Property(bool, notify=authenticatedChanged)
+    def authenticated(self) -> bool:
+        return self._values["authenticated"]
+
+    @Property(str, notify=userIdChanged)
+    def userId(self) -> str:
+        return self._values["userId"]
+
+    @Property(str, notify=emailChanged)
+    def email(self) -> str:
+        return self._values["email"]
+
+    @Property(str, notify=nameChanged)
+    def name(self) -> str:
+        return self._values["name"]
+
+    @Property(str, notify=avatarChanged)
+    def avatar(self) -> str:
+        return self._values["avatar"]
+
+    @Property(str, notify=planNameChanged)
+    def planName(self) -> str:
+        return self._values["planName"]
+
+    @Property(str, notify=accessTypeChanged)
+    def accessType(self) -> str:
+        """'license', 'trial' ou 'none'"""
+        return self._values["accessType"]
+
+    @Property(str, notify=expiresAtChanged)
+    def expiresAt(self) -> str:
+        """Data de expiração (dd/mm/aaaa) ou vazio"""
+        return self._values["expiresAt"]
+
+    @Property(int, notify=daysRemainingChanged)
+    def daysRemaining(self) -> int:
+        return self._values["daysRemaining"]
+
+    @Property(int, notify=totalDaysChanged)
+    def totalDays(self) -> int:
+        return self._values["totalDays"]
+
+    @Property(bool, notify=expiringSoonChanged)
+    def expiringSoon(self) -> bool:
+        return self._values["expiringSoon"]
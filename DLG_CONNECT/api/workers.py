@@ -0,0 +1,103 @@
+"""
+DLG Connect - Workers
+Executa chamadas bloqueantes da API fora da thread da interface (GUI)
+"""
+
+import itertools
+from typing import Callable, Dict, Any, Optional, Tuple
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal, Slot
+
+from .logger import get_logger
+
+logger = get_logger("worker")
+
+
+class _WorkerSignals(QObject):
+    """Sinais emitidos pelos workers (entregues na thread da GUI)"""
+
+    finished = Signal(int, object)  # ticket, resultado
+
+
+class _ApiWorker(QRunnable):
+    """Executa uma função bloqueante em uma thread do pool"""
+
+    def __init__(self, ticket: int, signals: _WorkerSignals, fn: Callable, args: tuple, kwargs: dict):
+        super().__init__()
+        self._ticket = ticket
+        self._signals = signals
+        self._fn = fn
+        self._args = args
+        self._kwargs = kwargs
+        self.setAutoDelete(True)
+
+    def run(self):
+        try:
+            result = self._fn(*self._args, **self._kwargs)
+        except Exception as e:
+            logger.exception("Erro na tarefa")
+            result = {"success": False, "error": f"Erro: {str(e)}"}
+        self._signals.finished.emit(self._ticket, result)
+
+
+class TaskRunner(QObject):
+    """
+    Fila de tarefas em background com entrega do resultado na thread da GUI.
+
+    Cada tarefa tem um nome (ex: "login"). Cancelar um nome descarta o
+    resultado das tarefas em andamento com esse nome - o callback não é
+    chamado quando a resposta chegar.
+    """
+
+    MAX_THREADS = 4
+
+    def __init__(self, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(self.MAX_THREADS)
+        self._signals = _WorkerSignals()
+        self._signals.finished.connect(self._on_finished)
+        self._tickets = itertools.count(1)
+        # ticket -> (nome, callback)
+        self._pending: Dict[int, Tuple[str, Callable[[Any], None]]] = {}
+
+    def submit(self, name: str, fn: Callable, callback: Callable[[Any], None], *args, **kwargs) -> int:
+        """Agenda fn(*args, **kwargs) no pool; callback(result) roda na thread da GUI"""
+        ticket = next(self._tickets)
+        self._pending[ticket] = (name, callback)
+        self._pool.start(_ApiWorker(ticket, self._signals, fn, args, kwargs))
+        return ticket
+
+    def cancel(self, name: Optional[str] = None) -> int:
+        """Descarta tarefas pendentes (todas, ou apenas as com esse nome)"""
+        tickets = [
+            ticket for ticket, (task_name, _) in self._pending.items()
+            if name is None or task_name == name
+        ]
+        for ticket in tickets:
+            del self._pending[ticket]
+        return len(tickets)
+
+    def is_running(self, name: str) -> bool:
+        """Verifica se existe tarefa pendente com esse nome"""
+        return any(task_name == name for task_name, _ in self._pending.values())
+
+    def has_pending(self) -> bool:
+        return bool(self._pending)
+
+    def wait_for_done(self, timeout_ms: int = -1) -> bool:
+        """Aguarda as threads terminarem (usado no encerramento do app)"""
+        return self._pool.waitForDone(timeout_ms)
+
+    @Slot(int, object)
+    def _on_finished(self, ticket: int, result: Any):
+        entry = self._pending.pop(ticket, None)
+        if entry is None:
+            # Tarefa cancelada - resultado descartado
+            return
+
+        name, callback = entry
+        try:
+            callback(result)
+        except Exception:
+            logger.exception("Erro no callback de '%s'", name)
@@ -0,0 +1,4 @@
+"""
+DLG Connect - Bench
+Stand-in local do bot-auth e benchmarks reproduzíveis do cliente
+"""
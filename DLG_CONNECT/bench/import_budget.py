@@ -0,0 +1,96 @@
+"""
+DLG Connect - Import budget
+Verifica o custo de importar o pacote api (python -X importtime) e seus efeitos colaterais
+
+Uso (dentro de DLG_CONNECT/):
+    python -m bench.import_budget              # código de saída 1 se algum orçamento estourar
+    python -m bench.import_budget --runs 9
+
+Cada import roda em um processo novo, com HOME temporário: além do tempo,
+falha se o import carregar módulos pesados (Qt, requests...) ou criar a
+pasta de dados do app.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, Any, List, Tuple
+
+
+APP_DIR = Path(__file__).resolve().parent.parent
+
+# módulo -> (orçamento em ms do tempo cumulativo, módulos que não podem ser carregados)
+BUDGETS: Dict[str, Tuple[float, Tuple[str, ...]]] = {
+    "api": (5.0, ("PySide6", "requests", "httpx", "cryptography", "api.supabase_client")),
+    "api.supabase_client": (90.0, ("PySide6", "requests", "httpx", "cryptography")),
+}
+
+# Imprime os módulos proibidos que foram carregados (última linha da saída)
+_PROBE = "import sys, {module}; print(','.join(m for m in {forbidden!r} if m in sys.modules))"
+
+
+def measure_import(module: str, forbidden: Tuple[str, ...] = ()) -> Dict[str, Any]:
+    """Importa `module` em um processo novo: tempo cumulativo (ms), módulos proibidos carregados e pastas criadas"""
+    home = Path(tempfile.mkdtemp(prefix="dlg-import-"))
+    env = dict(os.environ, HOME=str(home), APPDATA=str(home))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE.format(module=module, forbidden=forbidden)],
+        cwd=APP_DIR, env=env, capture_output=True, text=True, timeout=60
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} falhou:\n{result.stderr[-2000:]}")
+
+    cumulative_us = None
+    for line in result.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == module:
+            cumulative_us = int(parts[1])
+
+    output = result.stdout.strip().splitlines()
+    loaded = [name for name in (output[-1] if output else "").split(",") if name]
+    return {
+        "ms": (cumulative_us or 0) / 1000,
+        "loaded": loaded,
+        "created": sorted(path.name for path in home.iterdir()),
+    }
+
+
+def check(runs: int = 5) -> List[str]:
+    """Mede cada módulo de BUDGETS (mediana de `runs`) e retorna as violações"""
+    failures = []
+    for module, (budget_ms, forbidden) in BUDGETS.items():
+        samples = [measure_import(module, forbidden) for _ in range(runs)]
+        median_ms = statistics.median(sample["ms"] for sample in samples)
+        loaded = sorted({name for sample in samples for name in sample["loaded"]})
+        created = sorted({name for sample in samples for name in sample["created"]})
+
+        status = "ok" if median_ms <= budget_ms and not loaded and not created else "FALHOU"
+        print(f"  import {module:<24} p50={median_ms:8.2f}ms  orçamento={budget_ms:.0f}ms  {status}")
+
+        if median_ms > budget_ms:
+            failures.append(f"import {module}: {median_ms:.2f}ms > {budget_ms:.0f}ms")
+        if loaded:
+            failures.append(f"import {module} carregou {', '.join(loaded)}")
+        if created:
+            failures.append(f"import {module} criou {', '.join(created)} no HOME")
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Orçamento de tempo de import do pacote api")
+    parser.add_argument("--runs", type=int, default=5, help="processos por módulo (usa a mediana)")
+    args = parser.parse_args()
+
+    failures = check(max(1, args.runs))
+    for failure in failures:
+        print(f"  ✗ {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
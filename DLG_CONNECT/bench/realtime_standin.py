@@ -0,0 +1,286 @@
+"""
+DLG Connect - Realtime stand-in
+Servidor websocket local que imita o Supabase Realtime (protocolo Phoenix, postgres_changes)
+
+Uso:
+    python -m bench.realtime_standin --port 54322
+    DLG_REALTIME_URL=http://127.0.0.1:54322/realtime/v1 python main.py
+
+Comandos no terminal (uma linha por mudança empurrada para os clientes):
+    ban <user_id> [motivo]
+    unban <user_id>
+    maintenance on|off
+    license <user_id> <status>
+    device_off <user_id> <device_id>
+    drop                    # derruba as conexões (testa a reconexão)
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import threading
+from datetime import datetime, timezone
+from typing import Optional, Dict, Any, List
+
+from websockets.asyncio.server import serve, ServerConnection
+from websockets.http11 import Response
+from websockets.datastructures import Headers
+from websockets.exceptions import ConnectionClosed
+
+
+ENDPOINT_PATH = "/realtime/v1"
+
+
+def _matches(change_filter: Optional[str], record: Dict[str, Any]) -> bool:
+    """Filtro "coluna=eq.valor" do postgres_changes (só eq, como o app usa)"""
+    if not change_filter:
+        return True
+    column, _, condition = change_filter.partition("=")
+    operator, _, value = condition.partition(".")
+    return operator == "eq" and str(record.get(column)) == value
+
+
+class RealtimeStandIn:
+    """Realtime local em uma thread: aceita phx_join/heartbeat/broadcast e empurra mudanças de tabela"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.host = host
+        self.port = port
+        # False = recusa novas conexões (HTTP 503), como o Realtime fora do ar
+        self.accepting = True
+        self.connections = 0
+        self.joins: List[Dict[str, Any]] = []
+        self._ids = itertools.count(1)
+        # conexão -> {topic: [bindings com id]}
+        self._clients: Dict[ServerConnection, Dict[str, List[Dict[str, Any]]]] = {}
+        self._changed = threading.Condition()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}{ENDPOINT_PATH}"
+
+    @property
+    def subscribed(self) -> int:
+        """Canais inscritos nas conexões abertas"""
+        return sum(len(topics) for topics in self._clients.values())
+
+    def start(self) -> "RealtimeStandIn":
+        ready = threading.Event()
+        self._loop = asyncio.new_event_loop()
+
+        async def listen():
+            self._server = await serve(self._handle, self.host, self.port, process_request=self._process_request)
+            self.port = self._server.sockets[0].getsockname()[1]
+
+        def run():
+            asyncio.set_event_loop(self._loop)
+            self._loop.run_until_complete(listen())
+            ready.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=run, name="realtime-standin", daemon=True)
+        self._thread.start()
+        ready.wait(10)
+        return self
+
+    def stop(self):
+        async def shutdown():
+            self._server.close()
+            await self._server.wait_closed()
+
+        asyncio.run_coroutine_threadsafe(shutdown(), self._loop).result(10)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(10)
+
+    def wait_subscribed(self, count: int = 1, timeout: float = 10.0) -> bool:
+        """Espera `count` canais inscritos (ex: depois de uma reconexão)"""
+        with self._changed:
+            return self._changed.wait_for(lambda: self.subscribed >= count, timeout)
+
+    # ========== MUDANÇAS ==========
+
+    def push_change(
+        self,
+        table: str,
+        record: Dict[str, Any],
+        event: str = "UPDATE",
+        old_record: Optional[Dict[str, Any]] = None,
+    ) -> int:
+        """Empurra uma mudança de `table` para os canais cujo filtro casa; retorna quantos receberam"""
+        return asyncio.run_coroutine_threadsafe(
+            self._broadcast(table, event, record, old_record or {}), self._loop
+        ).result(10)
+
+    def ban(self, user_id: str, reason: str = "Violação dos termos") -> int:
+        return self.push_change("profiles", {"user_id": user_id, "banned": True, "ban_reason": reason})
+
+    def unban(self, user_id: str) -> int:
+        return self.push_change("profiles", {"user_id": user_id, "banned": False, "ban_reason": None})
+
+    def set_maintenance(self, active: bool) -> int:
+        return self.push_change("system_settings", {"key": "maintenance_mode", "value": "true" if active else "false"})
+
+    def update_license(self, user_id: str, status: str = "active") -> int:
+        return self.push_change("licenses", {"user_id": user_id, "status": status})
+
+    def deactivate_device(self, user_id: str, device_id: str) -> int:
+        return self.push_change("bot_device_sessions", {"user_id": user_id, "device_id": device_id, "is_active": False})
+
+    def close_connections(self) -> int:
+        """Fecha todas as conexões com handshake de fechamento (ex: deploy do Realtime)"""
+        async def close():
+            clients = list(self._clients)
+            for connection in clients:
+                await connection.close()
+            return len(clients)
+
+        return asyncio.run_coroutine_threadsafe(close(), self._loop).result(10)
+
+    def drop_connections(self) -> int:
+        """Fecha todas as conexões sem handshake de fechamento (queda de rede)"""
+        async def drop():
+            clients = list(self._clients)
+            for connection in clients:
+                connection.transport.abort()
+            return len(clients)
+
+        return asyncio.run_coroutine_threadsafe(drop(), self._loop).result(10)
+
+    # ========== PROTOCOLO ==========
+
+    def _process_request(self, connection: ServerConnection, request):
+        if not self.accepting:
+            return Response(503, "Service Unavailable", Headers(), b"")
+        return None
+
+    async def _handle(self, connection: ServerConnection):
+        self.connections += 1
+        self._clients[connection] = {}
+        try:
+            async for raw in connection:
+                message = json.loads(raw)
+                await self._on_message(connection, message)
+        except Exception:
+            pass  # conexão derrubada
+        finally:
+            self._clients.pop(connection, None)
+            self._notify()
+
+    async def _on_message(self, connection: ServerConnection, message: Dict[str, Any]):
+        topic, event, ref = message.get("topic"), message.get("event"), message.get("ref")
+        payload = message.get("payload") or {}
+
+        if event == "phx_join":
+            bindings = [
+                {"id": next(self._ids), **binding}
+                for binding in payload.get("config", {}).get("postgres_changes", [])
+            ]
+            self._clients[connection][topic] = bindings
+            self.joins.append({"topic": topic, "access_token": payload.get("access_token"), "bindings": bindings})
+            await self._reply(connection, topic, ref, {"postgres_changes": bindings})
+            self._notify()
+        elif event == "phx_leave":
+            self._clients[connection].pop(topic, None)
+            await self._reply(connection, topic, ref, {})
+            self._notify()
+        elif event in ("heartbeat", "broadcast"):
+            # broadcast: só o ack (config broadcast.ack); ninguém mais recebe
+            await self._reply(connection, topic, ref, {})
+        elif event == "access_token":
+            for join in self.joins:
+                if join["topic"] == topic:
+                    join["access_token"] = payload.get("access_token")
+
+    @staticmethod
+    async def _reply(connection: ServerConnection, topic: str, ref: Optional[str], response: Dict[str, Any]):
+        await connection.send(json.dumps({
+            "topic": topic,
+            "event": "phx_reply",
+            "payload": {"status": "ok", "response": response},
+            "ref": ref,
+        }))
+
+    async def _broadcast(self, table: str, event: str, record: Dict[str, Any], old_record: Dict[str, Any]) -> int:
+        delivered = 0
+        for connection, topics in list(self._clients.items()):
+            for topic, bindings in topics.items():
+                ids = [
+                    binding["id"] for binding in bindings
+                    if binding.get("table") == table
+                    and binding.get("event") in ("*", event)
+                    and _matches(binding.get("filter"), record or old_record)
+                ]
+                if not ids:
+                    continue
+                try:
+                    await connection.send(json.dumps({
+                        "topic": topic,
+                        "event": "postgres_changes",
+                        "payload": {
+                            "ids": ids,
+                            "data": {
+                                "schema": "public",
+                                "table": table,
+                                "commit_timestamp": datetime.now(timezone.utc).isoformat(),
+                                "type": event,
+                                "errors": None,
+                                "columns": [],
+                                "record": record,
+                                "old_record": old_record,
+                            },
+                        },
+                        "ref": None,
+                    }))
+                except ConnectionClosed:
+                    continue  # cliente fechando a conexão
+                delivered += 1
+        return delivered
+
+    def _notify(self):
+        with self._changed:
+            self._changed.notify_all()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stand-in local do Supabase Realtime")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=54322)
+    args = parser.parse_args()
+
+    server = RealtimeStandIn(args.host, args.port).start()
+    print(f"Realtime stand-in em {server.url}")
+    print(__doc__.split("Comandos no terminal", 1)[1].split("\n", 1)[1])
+
+    commands = {
+        "ban": lambda user_id, *reason: server.ban(user_id, " ".join(reason) or "Violação dos termos"),
+        "unban": server.unban,
+        "maintenance": lambda state: server.set_maintenance(state == "on"),
+        "license": server.update_license,
+        "device_off": server.deactivate_device,
+        "drop": server.drop_connections,
+    }
+    try:
+        while True:
+            line = input("> ").split()
+            if not line:
+                continue
+            command = commands.get(line[0])
+            if command is None:
+                print(f"comando desconhecido: {line[0]}")
+                continue
+            try:
+                print(f"entregue a {command(*line[1:])} canal(is)")
+            except TypeError:
+                print("argumentos inválidos")
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
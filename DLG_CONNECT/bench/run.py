@@ -0,0 +1,809 @@
+"""
+DLG Connect - Benchmarks
+Mede o cliente da API e o Backend contra o stand-in local do bot-auth
+
+Uso (dentro de DLG_CONNECT/):
+    python -m bench.run                          # todos os benchmarks
+    python -m bench.run --only client_overhead,auto_login --iterations 50
+    python -m bench.run --compare bench/results/antes.json bench/results/depois.json
+
+Os resultados são gravados em bench/results/<versão>-<data>.json.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+from .import_budget import BUDGETS, measure_import
+from .realtime_standin import RealtimeStandIn
+from .standin import (
+    StandInServer, StandInConfig, BENCH_EMAIL, BENCH_PASSWORD, BENCH_USER, BENCH_USER_2,
+    generate_entitlement_keys,
+)
+
+
+APP_DIR = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+# Variação de p50 considerada regressão no --compare
+REGRESSION_THRESHOLD = 0.10
+
+# Tamanho da lista no benchmark da página Contas
+ACCOUNT_ROWS = 10_000
+
+# Chamadas simultâneas por rajada no benchmark de coalescência
+COALESCING_BURST = 8
+
+# Benchmark do relógio da licença: validade da licença e relógio do stand-in adiantado (segundos)
+LICENSE_TEST_SECONDS = 1.0
+LICENSE_CLOCK_OFFSET = 3600.0
+
+BENCHMARKS: Dict[str, Callable[["BenchContext"], Dict[str, Dict[str, Any]]]] = {}
+
+
+def benchmark(name: str):
+    """Registra uma função de benchmark (retorna {métrica: resumo})"""
+    def register(fn):
+        BENCHMARKS[name] = fn
+        return fn
+    return register
+
+
+def summarize(samples: List[float], unit: str = "ms") -> Dict[str, Any]:
+    ordered = sorted(samples)
+    p95_index = min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))
+    return {
+        "unit": unit,
+        "n": len(ordered),
+        "p50": round(statistics.median(ordered), 4),
+        "p95": round(ordered[p95_index], 4),
+        "mean": round(statistics.fmean(ordered), 4),
+        "min": round(ordered[0], 4),
+        "max": round(ordered[-1], 4),
+    }
+
+
+class BenchContext:
+    """Stand-ins, pasta de dados isolada e parâmetros da execução"""
+
+    def __init__(
+        self, server: StandInServer, realtime: RealtimeStandIn, home: Path,
+        iterations: int, latency_ms: float, jitter_ms: float
+    ):
+        self.server = server
+        self.realtime = realtime
+        self.home = home
+        self.iterations = iterations
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+
+    def set_latency(self, latency_ms: float, jitter_ms: float = 0.0):
+        self.server.config.latency_ms = latency_ms
+        self.server.config.jitter_ms = jitter_ms
+
+    def network_latency(self):
+        """Latência configurada na linha de comando (simula a rede real)"""
+        self.set_latency(self.latency_ms, self.jitter_ms)
+
+
+def prepare_environment(home: Path, api_url: str, realtime_url: str):
+    """Isola a pasta de dados do app e aponta o cliente para os stand-ins (antes de importar api)"""
+    os.environ["HOME"] = str(home)
+    os.environ["APPDATA"] = str(home)
+    os.environ["DLG_API_URL"] = api_url
+    os.environ["DLG_REALTIME_URL"] = realtime_url
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    if str(APP_DIR) not in sys.path:
+        sys.path.insert(0, str(APP_DIR))
+
+
+def reset_client():
+    """Volta o cliente ao estado de um app recém-aberto (mantendo a sessão em disco)"""
+    from api.supabase_client import DLGApiClient, api
+
+    DLGApiClient._bootstrap_future = None
+    DLGApiClient._server_capabilities = None
+    DLGApiClient._etags.clear()
+    DLGApiClient._warm_profiles.clear()
+    api._current_user = None
+    api._license_info = None
+    api._trial_info = None
+
+
+def wait_for(app, condition: Callable[[], bool], timeout: float = 30.0) -> bool:
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        if time.perf_counter() > deadline:
+            return False
+        app.processEvents()
+        time.sleep(0.0005)
+    return True
+
+
+# ========== BENCHMARKS ==========
+
+@benchmark("client_overhead")
+def bench_client_overhead(ctx: BenchContext) -> Dict[str, Dict[str, Any]]:
+    """Tempo gasto no cliente por chamada (serialização, política, métricas, parse), sem a rede"""
+    from api.supabase_client import api
+    from api.transport import BaseTransport, create_transport
+
+    class TimingTransport(BaseTransport):
+        def __init__(self, inner: BaseTransport):
+            super().__init__()
+            self.inner = inner
+            self.last = 0.0
+
+        def post(self, url, body, timeout, headers=None):
+            start = time.perf_counter()
+            try:
+                return self.inner.post(url, body, timeout, headers)
+            finally:
+                self.last = time.perf_counter() - start
+
+        def close(self):
+            self.inner.close()
+
+    ctx.set_latency(0)
+    transport = TimingTransport(create_transport(api._get_transport()._default_headers))
+    api.set_transport(transport)
+
+    overhead, round_trip = [], []
+    api._api_request("get_recaptcha_settings")  # aquece conexão/imports
+    for _ in range(ctx.iterations * 10):
+        # Sem o memo, toda chamada passa pelo transporte (304 com If-None-Match)
+        api._single_flight.invalidate()
+        start = time.perf_counter()
+        api._api_request("get_recaptcha_settings")
+        total = time.perf_counter() - start
+        round_trip.append(total * 1000)
+        overhead.append((total - transport.last) * 1e6)
+
+    api.set_transport(create_transport(transport.inner._default_headers))
+    return {
+        "client_overhead": summarize(overhead, "us"),
+        "local_round_trip": summarize(round_trip),
+    }
+
+
+@benchmark("device_info")
+def bench_device_info(ctx: BenchContext) -> Dict[str, Dict[str, Any]]:
+    """Custo por chamada de _get_device_info() e device_fingerprint (dados em cache)"""
+    from api.supabase_client import api
+
+    api._get_device_info()
+    results = {}
+    for name, fn in (
+        ("device_info_call", api._get_device_info),
+        ("device_fingerprint_call", lambda: api.device_fingerprint),
+    ):
+        samples = []
+        for _ in range(ctx.iterations):
+            start = time.perf_counter()
+            for _ in range(1000):
+                fn()
+            samples.append((time.perf_counter() - start) * 1e6 / 1000)
+        results[name] = summarize(samples, "us")
+    return results
+
+
+@benchmark("login_to_dashboard")
+def bench_login(ctx: BenchContext) -> Dict[str, Dict[str, Any]]:
+    """Backend.login() até o sinal loginSuccess (o que leva a UI ao Dashboard)"""
+    from PySide6.QtCore import QCoreApplication
+    from api.bridge import Backend
+    from api.supabase_client import api
+
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv[:1])
+    ctx.network_latency()
+    reset_client()
+    backend = Backend()
+    wait_for(app, lambda: not backend._bootstrap_pending)
+
+    samples = []
+    for _ in range(ctx.iterations):
+        api.clear_local_session()
+        received = []
+        # Um único bound method: cada acesso a received.append cria outro
+        on_login = received.append
+        backend.loginSuccess.connect(on_login)
+        start = time.perf_counter()
+        backend.login(BENCH_EMAIL, BENCH_PASSWORD, "")
+        if wait_for(app, lambda: bool(received)):
+            samples.append((time.perf_counter() - start) * 1000)
+        backend.loginSuccess.disconnect(on_login)
+
+    # Canal Realtime aberto pelo login: senão continua inscrito nos próximos benchmarks
+    backend._push.stop()
+    backend.cancelPending()
+    return {"login_to_dashboard": summarize(samples)}
+
+
+@benchmark("auto_login")
+def bench_auto_login(ctx: BenchContext) -> Dict[str, Dict[str, Any]]:
+    """App aberto com sessão salva: criação do Backend + verifySession até loginSuccess"""
+    from PySide6.QtCore import QCoreApplication
+    from api.bridge import Backend
+    from api.supabase_client import api
+
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv[:1])
+    ctx.network_latency()
+    api.full_login(BENCH_EMAIL, BENCH_PASSWORD)
+
+    samples = []
+    for _ in range(ctx.iterations):
+        reset_client()
+        received = []
+        start = time.perf_counter()
+        backend = Backend()
+        backend.loginSuccess.connect(received.append)
+        backend.verifySession()
+        if wait_for(app, lambda: bool(received)):
+            samples.append((time.perf_counter() - start) * 1000)
+        backend._push.stop()
+        backend.cancelPending()
+        backend.deleteLater()
+
+    return {"auto_login": summarize(samples)}
+
+
+def _launch_main(home: Path) -> Optional[Dict[str, float]]:
+    """Roda main.py até gravar startup_timings.jsonl e retorna as fases medidas"""
+    env = dict(os.environ, HOME=str(home), APPDATA=str(home))
+    timings_file = _logs_folder(home) / "startup_timings.jsonl"
+    previous = len(timings_file.read_text(encoding="utf-8").splitlines()) if timings_file.exists() else 0
+
+    def written() -> bool:
+        return timings_file.exists() and len(timings_file.read_text(encoding="utf-8").splitlines()) > previous
+
+    process = subprocess.Popen(
+        [sys.executable, str(APP_DIR / "main.py")],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        deadline = time.perf_counter() + 60
+        while not written() and process.poll() is None and time.perf_counter() < deadline:
+            time.sleep(0.05)
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+    if not written():
+        return None
+    return json.loads(timings_file.read_text(encoding="utf-8").splitlines()[-1]).get("phases_ms", {})
+
+
+@benchmark("cold_start")
+def bench_cold_start(ctx: BenchContext) -> Dict[str, Dict[str, Any]]:
+    """
+    main.py em processo novo, até todas as fases do StartupProfiler (inclui
+    first_frame). Cada pasta de dados é usada duas vezes: a primeira execução
+    compila o QML ("cold_start"), a segunda usa o cache em disco ("warm_start").
+    """
+    ctx.network_latency()
+    phases: Dict[str, List[float]] = {}
+    runs = max(1, ctx.iterations // 4)
+
+    for i in range(runs):
+        home = Path(tempfile.mkdtemp(prefix="dlg-bench-cold-"))
+        for label in ("cold_start", "warm_start"):
+            measured = _launch_main(home)
+            if measured is None:
+                print(f"  {label}: execução {i + 1} não gerou startup_timings.jsonl")
+                continue
+            for phase, ms in measured.items():
+                phases.setdefault(f"{label}.{phase}", []).append(ms)
+
+    return {name: summarize(samples) for name, samples in phases.items()}
+
+
+@benchmark("import_time")
+def bench_import_time(ctx: BenchContext) -> Dict[str, Dict[str, Any]]:
+    """python -X importtime de cada módulo de bench/import_budget.py (processo novo por amostra)"""
+    results = {}
+    for module, (_, forbidden) in BUDGETS.items():
+        samples = [measure_import(module, forbidden)["ms"] for _ in range(max(1, ctx.iterations // 4))]
+        results[f"import_time.{module}"] = summarize(samples)
+    return results
+
+
+@benchmark("accounts_model")
+def bench_accounts_model(ctx: BenchContext) -> Dict[str, Dict[str, Any]]:
+    """Lista da página Contas com ACCOUNT_ROWS linhas: carga, atualização, filtro e memória"""
+    from PySide6.QtCore import QCoreApplication
+    from api.accounts_model import AccountsModel, AccountsFilterModel
+
+    QCoreApplication.instance() or QCoreApplication(sys.argv[:1])
+    statuses = ("active", "active", "active", "flood_2d", "flood_7d", "banned")
+    now = time.time()
+    rows = [
+        {
+            "path": f"55{11 + i % 80}9{i:08d}.session",
+            "phone": f"+55 {11 + i % 80} 9{i // 10000:04d}-{i % 10000:04d}",
+            "status": statuses[i % len(statuses)],
+            "addedToday": i % 250,
+            "lastUsed": now - i * 37,
+        }
+        for i in range(ACCOUNT_ROWS)
+    ]
+
+    load, update, memory = [], [], []
+    for _ in range(max(1, ctx.iterations // 4)):
+        start = time.perf_counter()
+        model = AccountsModel()
+        view = AccountsFilterModel(model)
+        model.reload(rows)
+        load.append((time.perf_counter() - start) * 1000)
+
+    # Memória Python das linhas (passada separada: o tracemalloc deixa tudo mais lento)
+    for _ in range(2):
+        tracemalloc.start()
+        probe = AccountsModel()
+        AccountsFilterModel(probe).deleteLater()
+        probe.reload(rows)
+        memory.append(tracemalloc.get_traced_memory()[0] / 1024 / 1024)
+        tracemalloc.stop()
+
+    # Scan com poucas mudanças: 10 contas alteradas, 5 removidas, 5 novas
+    for n in range(ctx.iterations):
+        changed = [dict(row) for row in rows[5:]]
+        for row in changed[:10]:
+            row["addedToday"] += n + 1
+        changed += [
+            dict(rows[0], path=f"novo-{n}-{i}.session", phone=f"+55 99 9{n:04d}-{i:04d}")
+            for i in range(5)
+        ]
+        start = time.perf_counter()
+        model.reload(changed)
+        update.append((time.perf_counter() - start) * 1000)
+        model.reload(rows)
+
+    queries = ["1", "11 9", "banida", "9000", "+55 42 90001-2345", "ativa", "xyz", ""]
+    filtering = []
+    for _ in range(ctx.iterations):
+        for query in queries:
+            start = time.perf_counter()
+            view.searchQuery = query
+            view.rowCount()
+            filtering.append((time.perf_counter() - start) * 1000)
+
+    return {
+        "accounts_model.load_10k": summarize(load),
+        "accounts_model.update_20_rows": summarize(update),
+        "accounts_model.filter_keystroke": summarize(filtering),
+        "accounts_model.memory_10k": summarize(memory, "MiB"),
+    }
+
+
+# Handler de teste: aceita payload nativo ou JSON (mesmo custo de leitura nos dois modos)
+_PAYLOAD_QML = b"""
+import QtQml 2.15
+QtObject {
+    property var backend
+    property int received: 0
+    property int calls: 0
+    property var conn: Connections {
+        target: backend
+        function onActionProgress(state) {
+            var data = typeof state === "string" ? JSON.parse(state) : state
+            received += data.processed >= 0 ? 1 : 0
+        }
+    }
+    onCallsChanged: {
+        for (var i = 0; i < calls; i++) {
+            var info = backend.getUserInfo()
+            if (typeof info === "string") info = JSON.parse(info)
+            received += info.accessType ? 1 : 0
+        }
+    }
+}
+"""
+
+
+@benchmark("bridge_payloads")
+def bench_bridge_payloads(ctx: BenchContext) -> Dict[str, Dict[str, Any]]:
+    """Sinal (actionProgress) e slot (getUserInfo) com payload nativo vs JSON, incluindo o handler QML"""
+    from PySide6.QtCore import QCoreApplication, QUrl
+    from PySide6.QtQml import QQmlComponent, QQmlEngine
+    from api.bridge import Backend
+
+    QCoreApplication.instance() or QCoreApplication(sys.argv[:1])
+    backend = Backend()
+    engine = QQmlEngine()
+    component = QQmlComponent(engine)
+    component.setData(_PAYLOAD_QML, QUrl())
+    handler = component.createWithInitialProperties({"backend": backend})
+
+    # Mesmo formato do JobRunner.snapshot()
+    state = {
+        "jobId": "3f2a9c1e", "action": "add", "status": "running", "processed": 120, "failed": 3,
+        "done": 123, "total": 5000, "progress": 2, "currentAccount": "5511912345678",
+        "activeAccounts": 18, "queued": 0, "error": "",
+    }
+    batch = 200
+    results = {}
+    for mode, json_payloads in (("native", False), ("json", True)):
+        backend.jsonPayloads = json_payloads
+        signal_us, slot_us = [], []
+        for _ in range(ctx.iterations):
+            start = time.perf_counter()
+            for _ in range(batch):
+                backend.actionProgress.emit(backend._payload(state))
+            signal_us.append((time.perf_counter() - start) * 1e6 / batch)
+
+            start = time.perf_counter()
+            handler.setProperty("calls", 0)
+            handler.setProperty("calls", batch)
+            slot_us.append((time.perf_counter() - start) * 1e6 / batch)
+        results[f"bridge_payloads.signal_{mode}"] = summarize(signal_us, "us")
+        results[f"bridge_payloads.slot_{mode}"] = summarize(slot_us, "us")
+
+    handler.deleteLater()
+    backend.cancelPending()
+    backend.deleteLater()
+    return results
+
+
+def _logs_folder(home: Path) -> Path:
+    """Mesma regra do SessionManager._get_app_data_path()"""
+    system = platform.system()
+    if system == "Windows":
+        return home / "DLG Connect" / "logs"
+    if system == "Darwin":
+        return home / "Library" / "Application Support" / "DLG Connect" / "logs"
+    return home / ".dlg-connect" / "logs"
+
+
+@benchmark("request_coalescing")
+def bench_request_coalescing(ctx: BenchContext) -> Dict[str, Dict[str, Any]]:
+    """
+    Rajadas de COALESCING_BURST chamadas idênticas e simultâneas (verify_session,
+    como os dois timers do Login.qml): requisições que chegam ao servidor e
+    tempo até todas terminarem.
+    """
+    import threading
+    from api.supabase_client import api
+
+    ctx.network_latency()
+    api.full_login(BENCH_EMAIL, BENCH_PASSWORD)
+
+    request_samples, burst_samples = [], []
+    for _ in range(ctx.iterations):
+        ctx.server.reset_counters()
+        threads = [threading.Thread(target=api.verify_session) for _ in range(COALESCING_BURST)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        burst_samples.append((time.perf_counter() - start) * 1000)
+        request_samples.append(float(ctx.server.calls.count("verify_session")))
+
+    return {
+        "request_coalescing.burst": summarize(burst_samples),
+        "request_coalescing.requests": summarize(request_samples, unit="req"),
+    }
+
+
+@benchmark("realtime_push")
+def bench_realtime_push(ctx: BenchContext) -> Dict[str, Dict[str, Any]]:
+    """
+    Canal Realtime contra o stand-in websocket: mudança no servidor até o
+    sinal no Backend (ban -> userBanned) e queda de conexão até reinscrever.
+    """
+    from PySide6.QtCore import QCoreApplication
+    from api.bridge import Backend
+
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv[:1])
+    ctx.set_latency(0)
+    reset_client()
+    backend = Backend()
+    wait_for(app, lambda: not backend._bootstrap_pending)
+
+    subscribed = lambda: ctx.realtime.subscribed >= 1
+    push_samples, reconnect_samples = [], []
+    for _ in range(ctx.iterations):
+        logged_in = []
+        on_login = logged_in.append
+        backend.loginSuccess.connect(on_login)
+        backend.login(BENCH_EMAIL, BENCH_PASSWORD, "")
+        ok = wait_for(app, lambda: bool(logged_in)) and wait_for(app, subscribed, timeout=10)
+        backend.loginSuccess.disconnect(on_login)
+        if not ok:
+            continue
+
+        # Queda de rede: tempo sem push até o canal estar inscrito de novo (inclui o backoff)
+        start = time.perf_counter()
+        ctx.realtime.drop_connections()
+        wait_for(app, lambda: not subscribed(), timeout=5)
+        if wait_for(app, subscribed, timeout=10):
+            reconnect_samples.append((time.perf_counter() - start) * 1000)
+
+        banned = []
+        on_banned = banned.append
+        backend.userBanned.connect(on_banned)
+        start = time.perf_counter()
+        ctx.realtime.ban(BENCH_USER["id"])
+        if wait_for(app, lambda: bool(banned), timeout=5):
+            push_samples.append((time.perf_counter() - start) * 1000)
+        backend.userBanned.disconnect(on_banned)
+
+    backend._push.stop()
+    backend.cancelPending()
+    return {
+        "realtime_push.ban_to_signal": summarize(push_samples),
+        "realtime_push.reconnect": summarize(reconnect_samples),
+    }
+
+
+@benchmark("conditional_requests")
+def bench_conditional_requests(ctx: BenchContext) -> Dict[str, Dict[str, Any]]:
+    """
+    Bytes de resposta por chamada com o servidor "antigo" (sem ETag, fields
+    e compressão) e com o atual: get_recaptcha_settings revalidado (304) e
+    full_login_check com a seleção de campos. Mais a ida e volta do
+    get_recaptcha_settings com a latência de rede configurada.
+    """
+    from api.supabase_client import api
+
+    config = ctx.server.config
+    ctx.network_latency()
+
+    def measure(action: Callable[[], Any]) -> Tuple[List[float], List[float]]:
+        reset_client()
+        action()  # primeira chamada: guarda o ETag
+        byte_samples, time_samples = [], []
+        for _ in range(ctx.iterations):
+            api._single_flight.invalidate()
+            ctx.server.reset_counters()
+            start = time.perf_counter()
+            action()
+            time_samples.append((time.perf_counter() - start) * 1000)
+            byte_samples.append(float(ctx.server.bytes_out))
+        return byte_samples, time_samples
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for label, enabled in (("plain", False), ("optimized", True)):
+        config.etag = config.fields = config.compression = enabled
+        recaptcha_bytes, recaptcha_times = measure(api.load_recaptcha_settings)
+        login_bytes, _ = measure(lambda: api.full_login(BENCH_EMAIL, BENCH_PASSWORD))
+        results[f"conditional_requests.recaptcha_bytes_{label}"] = summarize(recaptcha_bytes, unit="B")
+        results[f"conditional_requests.recaptcha_{label}"] = summarize(recaptcha_times)
+        results[f"conditional_requests.login_bytes_{label}"] = summarize(login_bytes, unit="B")
+
+    config.etag = config.fields = config.compression = True
+    return results
+
+
+@benchmark("license_scheduler")
+def bench_license_scheduler(ctx: BenchContext) -> Dict[str, Dict[str, Any]]:
+    """
+    Relógio local da licença contra o stand-in com o relógio adiantado 1h:
+    erro da hora do servidor estimada, atraso do licenseExpired em relação
+    ao vencimento e verify_session feitos até ele.
+    """
+    from PySide6.QtCore import QCoreApplication
+    from api.bridge import Backend
+    from api.license_clock import license_clock, parse_timestamp
+
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv[:1])
+    config = ctx.server.config
+    config.clock_offset_s = LICENSE_CLOCK_OFFSET
+    config.license_seconds = LICENSE_TEST_SECONDS
+    ctx.set_latency(0)
+    reset_client()
+    license_clock.reset()
+    backend = Backend()
+    wait_for(app, lambda: not backend._bootstrap_pending)
+
+    skew_samples, lateness_samples, request_samples = [], [], []
+    for _ in range(ctx.iterations):
+        expired = []
+        on_expired = expired.append
+        backend.licenseExpired.connect(on_expired)
+        ctx.server.reset_counters()
+        backend.login(BENCH_EMAIL, BENCH_PASSWORD, "")
+        ok = wait_for(app, lambda: bool(expired), timeout=LICENSE_TEST_SECONDS + 5)
+        backend.licenseExpired.disconnect(on_expired)
+        if not ok:
+            continue
+        expires = parse_timestamp(backend._license.expires_at).timestamp()
+        lateness_samples.append((ctx.server.now().timestamp() - expires) * 1000)
+        skew_samples.append(abs(license_clock.skew() - LICENSE_CLOCK_OFFSET) * 1000)
+        request_samples.append(float(ctx.server.calls.count("verify_session")))
+        backend._license.stop()
+
+    backend._push.stop()
+    backend.cancelPending()
+    config.clock_offset_s = 0.0
+    config.license_seconds = StandInConfig.license_seconds
+    license_clock.reset()
+    return {
+        "license_scheduler.skew_error": summarize(skew_samples),
+        "license_scheduler.expired_lateness": summarize(lateness_samples),
+        "license_scheduler.revalidations": summarize(request_samples, unit="req"),
+    }
+
+
+@benchmark("profile_switch")
+def bench_profile_switch(ctx: BenchContext) -> Dict[str, Dict[str, Any]]:
+    """
+    Troca entre dois operadores logados: switchProfile até o userState do
+    outro (sem rede, pelo entitlement do perfil) e até o servidor confirmar
+    em segundo plano, contra logout + login do outro operador.
+    """
+    from PySide6.QtCore import QCoreApplication
+    from api.bridge import Backend
+    from api.supabase_client import DLGApiClient, api
+
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv[:1])
+    ctx.network_latency()
+    # Sem entitlement válido a troca espera o servidor
+    ctx.server.config.entitlement_key, public_key = generate_entitlement_keys()
+    previous_key, DLGApiClient.ENTITLEMENT_PUBLIC_KEY = DLGApiClient.ENTITLEMENT_PUBLIC_KEY, public_key
+    reset_client()
+    backend = Backend()
+    wait_for(app, lambda: not backend._bootstrap_pending)
+
+    users = (BENCH_USER, BENCH_USER_2)
+    for user in users:
+        received = []
+        on_login = received.append
+        backend.loginSuccess.connect(on_login)
+        backend.login(user["email"], BENCH_PASSWORD, "")
+        wait_for(app, lambda: bool(received))
+        backend.loginSuccess.disconnect(on_login)
+
+    switch_samples, confirmed_samples, relogin_samples = [], [], []
+    for i in range(ctx.iterations):
+        target = users[i % 2]
+        start = time.perf_counter()
+        backend.switchProfile(target["id"])
+        switched = backend.userState.userId == target["id"]
+        elapsed = (time.perf_counter() - start) * 1000
+        if switched:
+            switch_samples.append(elapsed)
+        if wait_for(app, lambda: not backend._revalidating):
+            confirmed_samples.append((time.perf_counter() - start) * 1000)
+
+    for i in range(ctx.iterations):
+        target = users[i % 2]
+        logged_out, received = [], []
+        on_logout = lambda: logged_out.append(True)
+        on_login = received.append
+        backend.logoutSuccess.connect(on_logout)
+        backend.loginSuccess.connect(on_login)
+        start = time.perf_counter()
+        backend.logout()
+        if wait_for(app, lambda: bool(logged_out)):
+            backend.login(target["email"], BENCH_PASSWORD, "")
+            if wait_for(app, lambda: bool(received)):
+                relogin_samples.append((time.perf_counter() - start) * 1000)
+        backend.logoutSuccess.disconnect(on_logout)
+        backend.loginSuccess.disconnect(on_login)
+
+    backend._push.stop()
+    backend._license.stop()
+    backend.cancelPending()
+    ctx.server.config.entitlement_key = ""
+    DLGApiClient.ENTITLEMENT_PUBLIC_KEY = previous_key
+    return {
+        "profile_switch.switch": summarize(switch_samples),
+        "profile_switch.confirmed": summarize(confirmed_samples),
+        "profile_switch.relogin": summarize(relogin_samples),
+    }
+
+
+# ========== EXECUÇÃO / COMPARAÇÃO ==========
+
+def run(names: List[str], iterations: int, latency_ms: float, jitter_ms: float) -> Dict[str, Any]:
+    home = Path(tempfile.mkdtemp(prefix="dlg-bench-"))
+    server = StandInServer(StandInConfig(latency_ms=latency_ms, jitter_ms=jitter_ms)).start()
+    realtime = RealtimeStandIn().start()
+    prepare_environment(home, server.url, realtime.url)
+
+    ctx = BenchContext(server, realtime, home, iterations, latency_ms, jitter_ms)
+    results: Dict[str, Dict[str, Any]] = {}
+    for name in names:
+        print(f"▶ {name}")
+        start = time.perf_counter()
+        try:
+            results.update(BENCHMARKS[name](ctx))
+        except Exception as e:
+            print(f"  {name} falhou: {e}")
+            results[name] = {"error": str(e)}
+        print(f"  ({time.perf_counter() - start:.1f}s)")
+
+    server.stop()
+    realtime.stop()
+    return {
+        "version": _app_version(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {"iterations": iterations, "latency_ms": latency_ms, "jitter_ms": jitter_ms},
+        "results": results,
+    }
+
+
+def _app_version() -> str:
+    try:
+        source = (APP_DIR / "main.py").read_text(encoding="utf-8")
+        for line in source.splitlines():
+            if line.startswith("APP_VERSION"):
+                return line.split("=", 1)[1].strip().strip("\"'")
+    except OSError:
+        pass
+    return "unknown"
+
+
+def print_results(report: Dict[str, Any]):
+    print(f"\nDLG Connect {report['version']} - {report['timestamp']}")
+    for metric, summary in report["results"].items():
+        if "error" in summary:
+            print(f"  {metric:34} ERRO: {summary['error']}")
+            continue
+        unit = summary["unit"]
+        print(f"  {metric:34} p50={summary['p50']:>10.3f}{unit}  p95={summary['p95']:>10.3f}{unit}  n={summary['n']}")
+
+
+def compare(old_path: Path, new_path: Path) -> int:
+    """Compara o p50 de dois resultados; retorna 1 se houver regressão"""
+    old = json.loads(Path(old_path).read_text(encoding="utf-8"))
+    new = json.loads(Path(new_path).read_text(encoding="utf-8"))
+    print(f"{old['version']} ({old['timestamp']}) -> {new['version']} ({new['timestamp']})")
+
+    regressions = 0
+    for metric, summary in new["results"].items():
+        before = old["results"].get(metric)
+        if not before or "p50" not in before or "p50" not in summary:
+            continue
+        delta = (summary["p50"] - before["p50"]) / before["p50"] if before["p50"] else 0.0
+        flag = ""
+        if delta > REGRESSION_THRESHOLD:
+            flag = "  ⚠ regressão"
+            regressions += 1
+        print(f"  {metric:34} {before['p50']:>10.3f} -> {summary['p50']:>10.3f} {summary['unit']:3} ({delta:+.1%}){flag}")
+    return 1 if regressions else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks do DLG Connect contra o stand-in local")
+    parser.add_argument("--only", help=f"lista separada por vírgula: {', '.join(BENCHMARKS)}")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=80.0, help="latência simulada da rede (ms)")
+    parser.add_argument("--jitter", type=float, default=10.0, help="variação ± da latência (ms)")
+    parser.add_argument("--output", type=Path, help="arquivo JSON de saída")
+    parser.add_argument("--compare", nargs=2, type=Path, metavar=("ANTES", "DEPOIS"))
+    args = parser.parse_args()
+
+    if args.compare:
+        return compare(*args.compare)
+
+    names = args.only.split(",") if args.only else list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"benchmark desconhecido: {', '.join(unknown)}")
+
+    report = run(names, args.iterations, args.latency, args.jitter)
+    print_results(report)
+
+    output = args.output or RESULTS_DIR / f"{report['version']}-{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"\nResultados em {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,491 @@
+"""
+DLG Connect - bot-auth stand-in
+Servidor local que imita a Edge Function bot-auth (para benchmarks e testes manuais)
+
+Uso:
+    python -m bench.standin --port 54321 --latency 80 --jitter 20
+    DLG_API_URL=http://127.0.0.1:54321/functions/v1/bot-auth python main.py
+
+Com --tls-cert/--tls-key serve HTTPS (o cliente precisa confiar no
+certificado, ex: REQUESTS_CA_BUNDLE=cert.pem).
+"""
+
+import argparse
+import base64
+import gzip
+import hashlib
+import importlib
+import json
+import math
+import random
+import socket
+import ssl
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Optional, Dict, Any, List, Tuple
+
+
+ENDPOINT_PATH = "/functions/v1/bot-auth"
+
+BENCH_EMAIL = "bench@dlg.local"
+BENCH_PASSWORD = "bench"
+BENCH_USER = {
+    "id": "00000000-0000-4000-8000-000000000001",
+    "email": BENCH_EMAIL,
+    "name": "Bench User",
+    "avatar": "🤖",
+}
+# Segundo operador (troca de perfis); mesma senha
+BENCH_USER_2 = {
+    "id": "00000000-0000-4000-8000-000000000002",
+    "email": "bench2@dlg.local",
+    "name": "Bench Operator",
+    "avatar": "🛰️",
+}
+BENCH_USERS = {user["email"]: user for user in (BENCH_USER, BENCH_USER_2)}
+
+# Resultado do login/verify_session (mesmos reasons da Edge Function)
+SCENARIOS = ("ok", "trial", "banned", "maintenance", "no_license", "device_limit")
+
+# Mesmas regras de resposta da Edge Function (ETag, "fields", compressão).
+# Só os nomes de ação do handleAction do bot-auth: nome divergente no
+# cliente recebe "Ação inválida" aqui também e quebra os testes
+CONDITIONAL_ACTIONS = {"get_recaptcha_settings", "check_trial_eligibility", "validate_license"}
+ALWAYS_FIELDS = {"success", "error", "code", "reason", "access"}
+COMPRESS_MIN_BYTES = 512
+
+PLAN_FEATURES = [
+    "Automação de curtidas e seguidores",
+    "Agendamento de ações por perfil",
+    "Anti-ban com intervalos aleatórios",
+    "Limites diários configuráveis",
+    "Relatórios de atividade",
+    "Suporte prioritário",
+    "Atualizações automáticas",
+    "Múltiplos perfis por dispositivo",
+]
+
+
+def _load_brotli():
+    """Encoder brotli, se instalado (opcional, como no cliente)"""
+    for name in ("brotli", "brotlicffi"):
+        try:
+            return importlib.import_module(name)
+        except ImportError:
+            continue
+    return None
+
+
+brotli = _load_brotli()
+
+
+def select_fields(body: Dict[str, Any], fields: Any) -> Dict[str, Any]:
+    if not isinstance(fields, list) or not fields:
+        return body
+    wanted = ALWAYS_FIELDS.union(map(str, fields))
+    return {key: value for key, value in body.items() if key in wanted}
+
+
+def pick_encoding(accept_encoding: str, brotli_available: bool) -> Optional[str]:
+    accepted = {}
+    for part in accept_encoding.split(","):
+        name, _, options = part.strip().lower().partition(";")
+        q = options.strip()[2:] if options.strip().startswith("q=") else "1"
+        try:
+            accepted[name] = float(q)
+        except ValueError:
+            accepted[name] = 0.0
+    if brotli_available and accepted.get("br", 0) > 0:
+        return "br"
+    if accepted.get("gzip", 0) > 0:
+        return "gzip"
+    return None
+
+
+def generate_entitlement_keys() -> Tuple[str, str]:
+    """
+    Par Ed25519 novo: (privada PKCS8 em base64 para StandInConfig.entitlement_key,
+    pública crua em base64 para DLGApiClient.ENTITLEMENT_PUBLIC_KEY)
+    """
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+
+    key = Ed25519PrivateKey.generate()
+    private = key.private_bytes(
+        serialization.Encoding.DER, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    )
+    public = key.public_key().public_bytes(serialization.Encoding.Raw, serialization.PublicFormat.Raw)
+    return base64.b64encode(private).decode("ascii"), base64.b64encode(public).decode("ascii")
+
+
+@dataclass
+class StandInConfig:
+    """Comportamento do stand-in (alterável em tempo de execução)"""
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    fail_rate: float = 0.0        # fração das requisições que recebem 503
+    drop_rate: float = 0.0        # fração das requisições com conexão encerrada sem resposta
+    scenario: str = "ok"
+    batch: bool = True            # anuncia/aceita a ação "batch"
+    etag: bool = True             # ETag/304 nas ações de leitura
+    fields: bool = True           # respeita o parâmetro "fields"
+    compression: bool = True      # gzip/br conforme Accept-Encoding
+    license_seconds: float = 30 * 24 * 60 * 60   # validade da licença a partir de agora
+    clock_offset_s: float = 0.0   # relógio do servidor adiantado em relação à máquina (header Date)
+    recaptcha_enabled: bool = False
+    # Ed25519 PKCS8 em base64 (como BOT_ENTITLEMENT_PRIVATE_KEY); vazio = sem entitlement
+    entitlement_key: str = ""
+    action_latency_ms: Dict[str, float] = field(default_factory=dict)
+
+
+class StandInServer:
+    """bot-auth local em uma thread, com latência, jitter e falhas configuráveis"""
+
+    def __init__(
+        self,
+        config: Optional[StandInConfig] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        ssl_context: Optional[ssl.SSLContext] = None,
+    ):
+        self.config = config or StandInConfig()
+        self.calls: List[str] = []
+        self.connections = 0
+        self.not_modified = 0
+        self.bytes_out = 0            # corpos enviados, já comprimidos
+        self._lock = threading.Lock()
+        self._random = random.Random(1234)
+        self._sockets: set = set()    # conexões abertas (keep-alive)
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._tls = ssl_context is not None
+        if ssl_context is not None:
+            # Handshake na thread da conexão (no primeiro read), não no accept
+            self._httpd.socket = ssl_context.wrap_socket(
+                self._httpd.socket, server_side=True, do_handshake_on_connect=False
+            )
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        scheme = "https" if self._tls else "http"
+        return f"{scheme}://{host}:{port}{ENDPOINT_PATH}"
+
+    def start(self) -> "StandInServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="bot-auth-standin", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Para de aceitar e derruba as conexões keep-alive (servidor fora do ar)"""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        with self._lock:
+            sockets, self._sockets = list(self._sockets), set()
+        for sock in sockets:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def reset_counters(self):
+        with self._lock:
+            self.calls.clear()
+            self.connections = 0
+            self.not_modified = 0
+            self.bytes_out = 0
+
+    # ========== COMPORTAMENTO ==========
+
+    @property
+    def capabilities(self) -> str:
+        enabled = {"batch": self.config.batch, "etag": self.config.etag, "fields": self.config.fields}
+        return ",".join(name for name, on in enabled.items() if on)
+
+    def _delay(self, action: str):
+        base = self.config.action_latency_ms.get(action, self.config.latency_ms)
+        jitter = self.config.jitter_ms
+        with self._lock:
+            delay = base + (self._random.uniform(-jitter, jitter) if jitter else 0.0)
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+    def _roll(self, rate: float) -> bool:
+        if rate <= 0:
+            return False
+        with self._lock:
+            return self._random.random() < rate
+
+    def handle_action(self, action: str, params: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        """Resposta (status, corpo) no mesmo formato da Edge Function"""
+        if action == "get_recaptcha_settings":
+            return 200, {
+                "success": True,
+                "enabled": self.config.recaptcha_enabled,
+                "site_key": "standin-site-key" if self.config.recaptcha_enabled else "",
+            }
+
+        if action == "full_login_check":
+            user = BENCH_USERS.get(params.get("email"))
+            if user is None or params.get("password") != BENCH_PASSWORD:
+                return 200, {
+                    "success": False,
+                    "access": False,
+                    "reason": "invalid_credentials",
+                    "error": "Email ou senha incorretos",
+                }
+            return 200, self._access_result(user, params.get("device_fingerprint", ""))
+
+        if action == "verify_session":
+            user = next((u for u in BENCH_USERS.values() if u["id"] == params.get("user_id")), None)
+            if user is None:
+                return 200, {
+                    "success": False,
+                    "access": False,
+                    "reason": "user_not_found",
+                    "should_clear_session": True,
+                }
+            return 200, self._access_result(user, params.get("device_fingerprint", ""))
+
+        if action == "check_trial_eligibility":
+            return 200, {"success": True, "eligible": True, "trial_days": 3, "max_devices": 1}
+
+        if action == "register_trial":
+            return 200, {"success": True, "trial": {"active": True, "days": 3}}
+
+        if action == "validate_license":
+            license = self._license()
+            return 200, {
+                "success": True,
+                "valid": True,
+                "is_trial": self.config.scenario == "trial",
+                "plan_name": license["plan_name"],
+                "expires_at": license["expires_at"],
+                "max_devices": 1,
+                "features": list(PLAN_FEATURES),
+            }
+
+        if action == "logout":
+            return 200, {"success": True}
+
+        return 400, {"success": False, "error": "Ação inválida"}
+
+    def now(self) -> datetime:
+        """Hora do "servidor" (com o clock_offset_s configurado)"""
+        return datetime.now(timezone.utc) + timedelta(seconds=self.config.clock_offset_s)
+
+    def _license(self) -> Dict[str, Any]:
+        expires_at = self.now() + timedelta(seconds=self.config.license_seconds)
+        return {
+            "plan_name": "Pro" if self.config.scenario != "trial" else "Trial",
+            "expires_at": expires_at.isoformat(),
+            "days_remaining": math.ceil(self.config.license_seconds / 86400),
+        }
+
+    def _sign_entitlement(self, claims: Dict[str, Any]) -> Optional[str]:
+        """Entitlement "payload.assinatura" como o signEntitlement do bot-auth"""
+        if not self.config.entitlement_key:
+            return None
+        from cryptography.hazmat.primitives.serialization import load_der_private_key
+
+        key = load_der_private_key(base64.b64decode(self.config.entitlement_key), None)
+        now = int(time.time())
+        license_exp = int(datetime.fromisoformat(claims["expires_at"]).timestamp())
+        encode = lambda data: base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+        payload = encode(json.dumps({**claims, "iat": now, "exp": min(now + 24 * 3600, license_exp)}).encode())
+        return f"{payload}.{encode(key.sign(payload.encode('ascii')))}"
+
+    def _access_result(self, user: Dict[str, Any], device_fingerprint: str = "") -> Dict[str, Any]:
+        scenario = self.config.scenario
+        if scenario in ("ok", "trial"):
+            license = self._license()
+            entitlement = self._sign_entitlement({
+                "sub": user["id"],
+                "email": user["email"],
+                "name": user.get("name", ""),
+                "avatar": user.get("avatar", ""),
+                "plan": license["plan_name"],
+                "is_trial": scenario == "trial",
+                "expires_at": license["expires_at"],
+                "fp": device_fingerprint,
+            })
+            return {
+                "success": True,
+                "access": True,
+                "is_trial": scenario == "trial",
+                "plan_name": license["plan_name"],
+                "expires_at": license["expires_at"],
+                "max_devices": 1,
+                "features": list(PLAN_FEATURES),
+                "entitlement": entitlement,
+                "user": dict(user),
+            }
+        if scenario == "banned":
+            return {"success": False, "access": False, "reason": "banned", "ban_reason": "Stand-in: conta suspensa"}
+        if scenario == "maintenance":
+            return {"success": False, "access": False, "reason": "maintenance", "message": "Stand-in em manutenção"}
+        if scenario == "no_license":
+            return {"success": False, "access": False, "reason": "no_license", "trial_eligible": True, "trial_days": 3}
+        return {
+            "success": False,
+            "access": False,
+            "reason": "device_limit",
+            "active_devices": 1,
+            "max_devices": 1,
+            "devices": [{
+                "device_id": "standin-device",
+                "device_name": "Stand-in PC",
+                "device_os": "Windows 11",
+                "last_activity_at": datetime.now(timezone.utc).isoformat(),
+            }],
+        }
+
+    # ========== HTTP ==========
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Cabeçalho e corpo saem em writes separados: sem isso o Nagle + ACK atrasado somam ~40ms
+            disable_nagle_algorithm = True
+
+            def date_time_string(self, timestamp=None):
+                # Header Date com a hora do "servidor"
+                return super().date_time_string(server.now().timestamp())
+
+            def setup(self):
+                super().setup()
+                with server._lock:
+                    server.connections += 1
+                    server._sockets.add(self.connection)
+
+            def finish(self):
+                with server._lock:
+                    server._sockets.discard(self.connection)
+                super().finish()
+
+            def do_POST(self):
+                started = time.perf_counter()
+                length = int(self.headers.get("Content-Length", 0))
+                try:
+                    params = json.loads(self.rfile.read(length) or b"{}")
+                except ValueError:
+                    params = {}
+                action = params.pop("action", "")
+                fields = params.pop("fields", None) if server.config.fields else None
+                with server._lock:
+                    server.calls.append(action)
+
+                if server._roll(server.config.drop_rate):
+                    self.close_connection = True
+                    return
+
+                server._delay(action)
+
+                if server._roll(server.config.fail_rate):
+                    status, body = 503, {"success": False, "error": "Stand-in: falha injetada"}
+                elif action == "batch" and server.config.batch:
+                    results = []
+                    for request in params.get("requests", []):
+                        sub_action = request.pop("action", "")
+                        sub_fields = request.pop("fields", None) if server.config.fields else None
+                        sub_status, sub_body = server.handle_action(sub_action, request)
+                        results.append({**select_fields(sub_body, sub_fields), "_status": sub_status})
+                    status, body = 200, {"success": True, "results": results}
+                else:
+                    status, body = server.handle_action(action, params)
+                    body = select_fields(body, fields)
+
+                payload = json.dumps(body).encode("utf-8")
+                headers = {"Vary": "Accept-Encoding"}
+                if server.config.etag and status == 200 and action in CONDITIONAL_ACTIONS:
+                    etag = '"%s"' % hashlib.sha256(payload).hexdigest()[:22]
+                    headers["ETag"] = etag
+                    headers["Cache-Control"] = "no-cache"
+                    if etag in (tag.strip() for tag in self.headers.get("If-None-Match", "").split(",")):
+                        with server._lock:
+                            server.not_modified += 1
+                        status, payload = 304, b""
+
+                if status != 304:
+                    headers["Content-Type"] = "application/json"
+                    encoding = None
+                    if server.config.compression and len(payload) >= COMPRESS_MIN_BYTES:
+                        encoding = pick_encoding(self.headers.get("Accept-Encoding", ""), brotli is not None)
+                    if encoding == "br":
+                        payload = brotli.compress(payload)
+                    elif encoding == "gzip":
+                        payload = gzip.compress(payload)
+                    if encoding:
+                        headers["Content-Encoding"] = encoding
+
+                with server._lock:
+                    server.bytes_out += len(payload)
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(payload)))
+                if server.capabilities:
+                    self.send_header("X-Bot-Auth-Capabilities", server.capabilities)
+                self.send_header("Server-Timing", f"app;dur={(time.perf_counter() - started) * 1000:.1f}")
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stand-in local da Edge Function bot-auth")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=54321)
+    parser.add_argument("--latency", type=float, default=0.0, help="latência base (ms)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="variação ± da latência (ms)")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="fração de respostas 503")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="fração de conexões derrubadas")
+    parser.add_argument("--scenario", choices=SCENARIOS, default="ok")
+    parser.add_argument("--no-batch", action="store_true", help="simula servidor sem a ação batch")
+    parser.add_argument("--recaptcha", action="store_true", help="anuncia reCAPTCHA habilitado")
+    parser.add_argument("--no-etag", action="store_true", help="sem ETag/304 nas ações de leitura")
+    parser.add_argument("--no-fields", action="store_true", help="ignora o parâmetro fields")
+    parser.add_argument("--no-compression", action="store_true", help="respostas sem gzip/br")
+    parser.add_argument("--tls-cert", help="certificado PEM (serve HTTPS)")
+    parser.add_argument("--tls-key", help="chave privada PEM do certificado")
+    args = parser.parse_args()
+
+    config = StandInConfig(
+        latency_ms=args.latency,
+        jitter_ms=args.jitter,
+        fail_rate=args.fail_rate,
+        drop_rate=args.drop_rate,
+        scenario=args.scenario,
+        batch=not args.no_batch,
+        recaptcha_enabled=args.recaptcha,
+        etag=not args.no_etag,
+        fields=not args.no_fields,
+        compression=not args.no_compression,
+    )
+    ssl_context = None
+    if args.tls_cert:
+        ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        ssl_context.load_cert_chain(args.tls_cert, args.tls_key)
+    server = StandInServer(config, args.host, args.port, ssl_context).start()
+    print(f"bot-auth stand-in em {server.url}")
+    print(f"Login: {' ou '.join(BENCH_USERS)} / {BENCH_PASSWORD}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
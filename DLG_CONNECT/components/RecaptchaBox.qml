@@ -0,0 +1,150 @@
+import QtQuick 2.15
+import QtQuick.Layouts 1.15
+import ".."
+
+// Caixa "Não sou um robô" do login - carregada só quando o reCAPTCHA está habilitado
+Rectangle {
+    id: root
+    
+    // Verificação concluída (controlada pela tela de login, que também a reseta)
+    property bool verified: false
+    
+    signal tokenReady(string token)
+    
+    implicitHeight: 74
+    radius: 6
+    clip: true
+    color: Theme.muted
+    border.width: 1
+    border.color: root.verified ? Theme.accent : Theme.border
+    
+    Behavior on border.color { ColorAnimation { duration: 200 } }
+    
+    RowLayout {
+        anchors.fill: parent
+        anchors.leftMargin: 16
+        anchors.rightMargin: 16
+        spacing: 14
+        
+        // Checkbox área
+        Rectangle {
+            id: recaptchaCheckbox
+            Layout.preferredWidth: 26
+            Layout.preferredHeight: 26
+            radius: 4
+            color: root.verified ? Theme.accent : 
+                   (recaptchaCheckMouse.containsMouse ? Qt.rgba(1, 1, 1, 0.1) : "transparent")
+            border.width: root.verified ? 0 : 2
+            border.color: recaptchaCheckMouse.containsMouse ? Theme.primary : Theme.border
+            
+            property bool isVerifying: false
+            
+            Behavior on border.color { ColorAnimation { duration: 150 } }
+            Behavior on color { ColorAnimation { duration: 150 } }
+            
+            // Checkmark quando verificado
+            Text {
+                visible: root.verified
+                anchors.centerIn: parent
+                text: "✓"
+                font.pixelSize: 16
+                font.weight: Font.Bold
+                color: Theme.background
+                
+                scale: root.verified ? 1.0 : 0.5
+                opacity: root.verified ? 1.0 : 0.0
+                
+                Behavior on scale { NumberAnimation { duration: 200; easing.type: Easing.OutBack } }
+                Behavior on opacity { NumberAnimation { duration: 150 } }
+            }
+            
+            // Loading spinner durante verificação
+            Rectangle {
+                visible: recaptchaCheckbox.isVerifying
+                anchors.centerIn: parent
+                width: 18
+                height: 18
+                radius: 9
+                color: "transparent"
+                border.width: 2
+                border.color: Theme.primary
+                
+                Rectangle {
+                    width: 9
+                    height: 2
+                    radius: 1
+                    color: Theme.primary
+                    anchors.right: parent.right
+                    anchors.verticalCenter: parent.verticalCenter
+                }
+                
+                RotationAnimation on rotation {
+                    from: 0
+                    to: 360
+                    duration: 700
+                    loops: Animation.Infinite
+                    running: recaptchaCheckbox.isVerifying
+                }
+            }
+            
+            MouseArea {
+                id: recaptchaCheckMouse
+                anchors.fill: parent
+                hoverEnabled: true
+                cursorShape: (recaptchaCheckbox.isVerifying || root.verified) ? 
+                             Qt.ArrowCursor : Qt.PointingHandCursor
+                enabled: !recaptchaCheckbox.isVerifying && !root.verified
+                
+                onClicked: {
+                    if (recaptchaCheckbox.isVerifying || root.verified) return
+                    
+                    console.log("Iniciando verificação reCAPTCHA...")
+                    recaptchaCheckbox.isVerifying = true
+                    verifyTimer.start()
+                }
+            }
+            
+            Timer {
+                id: verifyTimer
+                interval: 800 + Math.random() * 400
+                repeat: false
+                onTriggered: {
+                    console.log("reCAPTCHA verificado com sucesso")
+                    root.tokenReady("03AGdBq" + Date.now() + "_verified")
+                    recaptchaCheckbox.isVerifying = false
+                }
+            }
+        }
+        
+        // Texto
+        Text {
+            text: recaptchaCheckbox.isVerifying ? "Verificando..." : 
+                  (root.verified ? "Verificado" : "Não sou um robô")
+            font.pixelSize: 14
+            color: root.verified ? Theme.accent : Theme.foreground
+            
+            Behavior on color { ColorAnimation { duration: 150 } }
+        }
+        
+        Item { Layout.fillWidth: true }
+        
+        // Logo/ícone simplificado
+        Column {
+            spacing: 2
+            Layout.alignment: Qt.AlignVCenter
+            
+            Icon {
+                anchors.horizontalCenter: parent.horizontalCenter
+                name: "shield"
+                size: 20
+                color: Theme.mutedForeground
+            }
+            
+            Text {
+                text: "Segurança"
+                font.pixelSize: 9
+                color: Theme.subtleForeground
+            }
+        }
+    }
+}
@@ -6,6 +6,8 @@ Rectangle {
     id: root
     
     property int currentIndex: 0
+    // Backend.userState (nome/plano do usuário logado)
+    property var userState: null
     property var menuItems: [
         { label: "Dashboard", icon: "home", color: "#3b82f6" },
         { label: "Contas", icon: "users", color: "#10b981" },
@@ -182,6 +184,51 @@ Rectangle {
             Item { Layout.fillHeight: true }
         }
         
+        // Usuário logado
+        RowLayout {
+            visible: root.userState !== null && root.userState.authenticated
+            Layout.fillWidth: true
+            Layout.leftMargin: 16
+            Layout.rightMargin: 16
+            Layout.bottomMargin: 10
+            spacing: 10
+            
+            Rectangle {
+                Layout.preferredWidth: 30
+                Layout.preferredHeight: 30
+                radius: 15
+                color: Qt.rgba(Theme.primary.r, Theme.primary.g, Theme.primary.b, 0.15)
+                
+                Text {
+                    anchors.centerIn: parent
+                    text: root.userState ? root.userState.avatar : ""
+                    font.pixelSize: 14
+                }
+            }
+            
+            ColumnLayout {
+                Layout.fillWidth: true
+                spacing: 1
+                
+                Text {
+                    Layout.fillWidth: true
+                    text: root.userState ? root.userState.name : ""
+                    font.pixelSize: 12
+                    font.weight: Font.Medium
+                    color: Theme.foreground
+                    elide: Text.ElideRight
+                }
+                
+                Text {
+                    Layout.fillWidth: true
+                    text: root.userState ? root.userState.planName : ""
+                    font.pixelSize: 10
+                    color: Theme.mutedForeground
+                    elide: Text.ElideRight
+                }
+            }
+        }
+        
         // Footer / Logout
         Rectangle {
             Layout.fillWidth: true
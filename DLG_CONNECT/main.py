@@ -2,15 +2,25 @@
 """
 DLG Connect - QML Application
 Teste com: python DLG_CONNECT/main.py
+Cache do QML compilado (instalador): python DLG_CONNECT/main.py --precompile-qml
 Requisitos: pip install PySide6 supabase
 """
 
+import time
+
+# Referência para as medições de startup (antes de qualquer import pesado)
+_PROCESS_START = time.perf_counter()
+
 import sys
 import os
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from pathlib import Path
 
 from PySide6.QtWidgets import QApplication
-from PySide6.QtQml import QQmlApplicationEngine, qmlRegisterType
+from PySide6.QtQml import QQmlApplicationEngine, QQmlComponent, qmlRegisterType, qmlRegisterUncreatableType
 from PySide6.QtCore import QUrl
 from PySide6.QtGui import QIcon
 
@@ -19,47 +29,215 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 # Importa a bridge
 from api.bridge import Backend
+from api.accounts_model import AccountsModel, AccountsFilterModel
+from api.log_model import LogModel
+from api.user_state import UserState
+from api.supabase_client import api
+from api.session_manager import session_manager
+from api.logger import get_logger, setup_logging
+
+
+APP_VERSION = "2.0.1"
+
+logger = get_logger("startup")
+
+
+class StartupProfiler:
+    """Mede as fases do startup (ms desde o início do processo) e grava nos logs"""
+
+    PHASES = ("imports", "qapplication", "qml_compile", "first_frame", "first_network_response")
+    TIMINGS_FILE = "startup_timings.jsonl"
+
+    def __init__(self, origin: float):
+        self._origin = origin
+        self._marks = {}
+        self._required = set(self.PHASES)
+        self._lock = threading.Lock()
+        self._written = False
+
+    def mark(self, phase: str):
+        """Registra o fim de uma fase (apenas a primeira marcação conta)"""
+        with self._lock:
+            if phase in self._marks:
+                return
+            self._marks[phase] = round((time.perf_counter() - self._origin) * 1000, 1)
+            complete = self._required.issubset(self._marks)
+
+        if complete:
+            self.write()
+
+    def skip(self, phase: str):
+        """Fase que não vai acontecer nesta execução (não espera por ela para gravar)"""
+        with self._lock:
+            self._required.discard(phase)
+            complete = self._required.issubset(self._marks)
+
+        if complete:
+            self.write()
+
+    def write(self):
+        """Acrescenta as medições em logs/startup_timings.jsonl (uma linha por execução)"""
+        with self._lock:
+            if self._written:
+                return
+            self._written = True
+            marks = dict(self._marks)
+
+        entry = {
+            "version": APP_VERSION,
+            "timestamp": datetime.now().isoformat(),
+            "phases_ms": marks,
+        }
+
+        try:
+            timings_path = session_manager.get_logs_folder() / self.TIMINGS_FILE
+            with open(timings_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+        except Exception as e:
+            logger.warning("Erro ao gravar tempos: %s", e)
+
+        summary = ", ".join(f"{phase}={ms}ms" for phase, ms in marks.items())
+        logger.info(summary, extra={"fields": {"phases_ms": marks}})
+
+
+class StartupOrchestrator:
+    """
+    Executa o trabalho de inicialização em paralelo com a compilação do QML:
+    bootstrap da API, leitura da sessão salva e fingerprint do dispositivo.
+    """
+
+    def __init__(self, profiler: StartupProfiler):
+        self._profiler = profiler
+
+    def start_background_work(self):
+        # reCAPTCHA + verify_session em uma requisição, compartilhada com o Backend
+        api.start_bootstrap().add_done_callback(self._on_bootstrap_done)
+
+        executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="startup")
+        executor.submit(self._timed, "session_loaded", session_manager.preload)
+        executor.submit(self._timed, "device_fingerprint", lambda: api.device_fingerprint)
+        executor.shutdown(wait=False)
+
+    def _on_bootstrap_done(self, future):
+        # Cache válido e sem sessão salva: não houve requisição de rede
+        if future.result().get("cached"):
+            self._profiler.skip("first_network_response")
+        else:
+            self._profiler.mark("first_network_response")
+
+    def _timed(self, phase: str, fn):
+        try:
+            fn()
+        except Exception:
+            logger.exception("Erro em %s", phase)
+        self._profiler.mark(phase)
+
+    def watch_first_frame(self, engine: QQmlApplicationEngine):
+        """Marca o primeiro frame renderizado da janela principal"""
+        window = engine.rootObjects()[0]
+
+        def on_frame():
+            window.frameSwapped.disconnect(on_frame)
+            self._profiler.mark("first_frame")
+
+        window.frameSwapped.connect(on_frame)
+
+
+def precompile_qml(engine: QQmlApplicationEngine, script_dir: Path) -> int:
+    """
+    Compila todos os arquivos QML sem instanciar nada, preenchendo o cache
+    em disco (.qmlc). Usado pelo instalador/atualização (--precompile-qml)
+    para que o primeiro startup já não precise compilar o QML.
+    """
+    files = [script_dir / "main.qml", script_dir / "Theme.qml"]
+    files += sorted((script_dir / "pages").glob("*.qml"))
+    files += sorted((script_dir / "components").glob("*.qml"))
+
+    start = time.perf_counter()
+    compiled = 0
+    for qml_path in files:
+        component = QQmlComponent(engine, QUrl.fromLocalFile(str(qml_path)))
+        if component.isError():
+            logger.warning("Erro ao compilar %s: %s", qml_path.name, component.errorString())
+            continue
+        compiled += 1
+
+    logger.info("%d arquivos QML compilados em %.0fms", compiled, (time.perf_counter() - start) * 1000)
+    return compiled
 
 
 def main():
+    # Logs em arquivo (thread própria) antes de qualquer trabalho em background
+    setup_logging(session_manager.get_logs_folder())
+
+    # Cache do QML compilado na pasta do app (sobrevive entre execuções e
+    # pode ser preenchido pelo instalador com --precompile-qml)
+    os.environ.setdefault("QML_DISK_CACHE_PATH", str(session_manager.get_cache_folder() / "qml"))
+    precompile_only = "--precompile-qml" in sys.argv
+
+    profiler = StartupProfiler(_PROCESS_START)
+    profiler.mark("imports")
+
+    # Rede, sessão e fingerprint rodam enquanto o Qt sobe e o QML compila
+    orchestrator = StartupOrchestrator(profiler)
+    if not precompile_only:
+        orchestrator.start_background_work()
+
     # Configurar aplicação
     app = QApplication(sys.argv)
     app.setApplicationName("DLG Connect")
-    app.setApplicationVersion("2.0.1")
+    app.setApplicationVersion(APP_VERSION)
     app.setOrganizationName("DLG")
-    
+    profiler.mark("qapplication")
+
     # Registrar o Backend para uso no QML
     qmlRegisterType(Backend, "DLGConnect", 1, 0, "Backend")
-    
+    # Modelos da lista de contas (instâncias vêm do Backend.accounts)
+    qmlRegisterUncreatableType(AccountsModel, "DLGConnect", 1, 0, "AccountsModel", "Use Backend.accounts")
+    qmlRegisterUncreatableType(AccountsFilterModel, "DLGConnect", 1, 0, "AccountsFilterModel", "Use Backend.accounts")
+    qmlRegisterUncreatableType(LogModel, "DLGConnect", 1, 0, "LogModel", "Use Backend.actionLogs")
+    qmlRegisterUncreatableType(UserState, "DLGConnect", 1, 0, "UserState", "Use Backend.userState")
+
     # Criar engine QML
     engine = QQmlApplicationEngine()
-    
+
     # Caminho do arquivo QML principal (relativo ao script)
     script_dir = Path(__file__).parent.resolve()
     qml_file = script_dir / "main.qml"
-    
+
     # Adicionar o diretório do script ao import path do QML
     engine.addImportPath(str(script_dir))
     engine.addImportPath(str(script_dir / "pages"))
     engine.addImportPath(str(script_dir / "components"))
-    
+
     if not qml_file.exists():
-        print(f"Erro: Arquivo QML não encontrado: {qml_file}")
+        logger.error("Arquivo QML não encontrado: %s", qml_file)
         sys.exit(1)
-    
-    print(f"Carregando QML de: {qml_file}")
-    
+
+    if precompile_only:
+        sys.exit(0 if precompile_qml(engine, script_dir) else 1)
+
+    logger.info("Carregando QML de: %s", qml_file)
+
     # Carregar QML
     engine.load(QUrl.fromLocalFile(str(qml_file)))
-    
+
     # Verificar se carregou corretamente
     if not engine.rootObjects():
-        print("Erro: Falha ao carregar QML")
+        logger.error("Falha ao carregar QML")
         sys.exit(1)
-    
-    print("✓ DLG Connect iniciado com sucesso!")
-    print("✓ Backend conectado ao Lovable Cloud")
-    
+
+    profiler.mark("qml_compile")
+    orchestrator.watch_first_frame(engine)
+
+    # Se alguma fase não aconteceu (ex: sem rede), grava o que foi medido
+    app.aboutToQuit.connect(profiler.write)
+    # Gravações de sessão/estado ainda pendentes
+    app.aboutToQuit.connect(session_manager.flush)
+
+    logger.info("✓ DLG Connect %s iniciado com sucesso!", APP_VERSION)
+    logger.info("✓ Backend conectado ao Lovable Cloud")
+
     # Executar aplicação
     sys.exit(app.exec())
 
@@ -23,6 +23,48 @@ ApplicationWindow {
         id: backendInstance
     }
 
+    // true depois do loginSuccess (inclusive auto-login local pelo entitlement)
+    property bool loggedIn: false
+
+    // Revalidação em segundo plano negou o acesso: volta para o login
+    Connections {
+        target: backendInstance
+
+        function onLoginSuccess(userData) {
+            mainWindow.loggedIn = true
+        }
+
+        function onUserBanned(reason) {
+            mainWindow.revokeAccess({ banReason: reason, showBannedModal: true })
+        }
+
+        function onAccessRevoked(message) {
+            mainWindow.revokeAccess({ errorMessage: message })
+        }
+
+        function onMaintenanceMode(message) {
+            mainWindow.revokeAccess({ errorMessage: "🔧 Sistema em manutenção: " + message })
+        }
+
+        function onNoLicense(info) {
+            mainWindow.revokeAccess({
+                showNoLicenseModal: true,
+                canActivateTrial: info.can_use_trial || false,
+                trialAlreadyUsed: !info.can_use_trial,
+                trialDays: info.trial_days || 3
+            })
+        }
+
+        function onDeviceLimitReached(info) {
+            mainWindow.revokeAccess({
+                showDeviceLimitModal: true,
+                activeDevices: info.active_count,
+                maxDevices: info.max_allowed,
+                deviceLimitError: info.error
+            })
+        }
+    }
+
     // Stack view for navigation
     StackView {
         id: stackView
@@ -126,7 +168,14 @@ ApplicationWindow {
         stackView.replace(mainApp)
     }
 
-    function navigateToLogin() {
-        stackView.replace(loginPage)
+    function navigateToLogin(properties) {
+        stackView.replace(loginPage, properties || {})
+    }
+
+    function revokeAccess(properties) {
+        // Erros do login normal já são tratados pela própria tela de login
+        if (!loggedIn) return
+        loggedIn = false
+        navigateToLogin(properties)
     }
 }
@@ -8,34 +8,41 @@ Rectangle {
     id: root
     color: Theme.background
     
+    // Backend property - injected from parent
+    property var backend: null
+    // Lista de contas (Python): busca/ordenação no AccountsFilterModel
+    property var accountsModel: backend ? backend.accounts : null
+    
     property string searchQuery: ""
-    property int deleteIndex: -1
+    property string deletePath: ""
+    property string deletePhone: ""
     property bool showDeleteDialog: false
     property bool showConnectDialog: false
     property string connectPhone: ""
     property string connectCode: ""
     property int connectStep: 0 // 0 = phone, 1 = code
     
-    property var accounts: [
-        { phone: "+55 11 98765-4321", flood: "Ativa", floodColor: "#22c55e", addedToday: 156, lastUsed: "2 min atrás" },
-        { phone: "+55 21 91234-5678", flood: "Ativa", floodColor: "#22c55e", addedToday: 89, lastUsed: "15 min atrás" },
-        { phone: "+55 11 95555-4444", flood: "Float 2d", floodColor: "#0080ff", addedToday: 0, lastUsed: "1 dia atrás" },
-        { phone: "+55 19 97777-8888", flood: "Ativa", floodColor: "#22c55e", addedToday: 234, lastUsed: "5 min atrás" },
-        { phone: "+55 48 92222-3333", flood: "7 dias", floodColor: "#f59e0b", addedToday: 0, lastUsed: "5 dias atrás" },
-        { phone: "+55 85 96666-1111", flood: "Banida", floodColor: "#ef4444", addedToday: 0, lastUsed: "2 dias atrás" }
-    ]
+    // Contadores do catálogo de sessions (cards)
+    property var sessionStats: ({ total: 0, by_status: {}, added_today: 0 })
+    
+    onBackendChanged: {
+        if (backend) sessionStats = backend.getSessionStats()
+    }
+    
+    onSearchQueryChanged: {
+        if (accountsModel) accountsModel.searchQuery = searchQuery
+    }
     
-    property var filteredAccounts: {
-        if (searchQuery.length === 0) return accounts
-        var query = searchQuery.toLowerCase()
-        return accounts.filter(function(a) {
-            return a.phone.toLowerCase().indexOf(query) !== -1 || 
-                   a.flood.toLowerCase().indexOf(query) !== -1
-        })
+    Connections {
+        target: root.backend
+        ignoreUnknownSignals: true
+        function onSessionsUpdated(stats) {
+            root.sessionStats = stats
+        }
     }
     
-    function countByFlood(flood) {
-        return accounts.filter(a => a.flood === flood).length
+    function countByStatus(status) {
+        return sessionStats.by_status[status] || 0
     }
     
     // Connect Dialog
@@ -428,7 +435,7 @@ Rectangle {
                         }
                         
                         Text {
-                            text: deleteIndex >= 0 && deleteIndex < accounts.length ? accounts[deleteIndex].phone : ""
+                            text: deletePhone
                             font.pixelSize: 13
                             color: Theme.mutedForeground
                         }
@@ -492,9 +499,10 @@ Rectangle {
                             hoverEnabled: true
                             cursorShape: Qt.PointingHandCursor
                             onClicked: {
-                                console.log("Deleted account:", deleteIndex)
+                                if (backend && deletePath.length > 0) backend.deleteSession(deletePath)
                                 showDeleteDialog = false
-                                deleteIndex = -1
+                                deletePath = ""
+                                deletePhone = ""
                             }
                         }
                         
@@ -521,14 +529,12 @@ Rectangle {
         }
     }
     
-    ScrollView {
+    Item {
         anchors.fill: parent
         anchors.margins: 20
-        contentWidth: availableWidth
-        clip: true
         
         ColumnLayout {
-            width: parent.width
+            anchors.fill: parent
             spacing: 16
             
             // Header
@@ -634,10 +640,10 @@ Rectangle {
                 rowSpacing: 12
                 
                 property var statsData: [
-                    { label: "Ativas", value: countByFlood("Ativa"), color: "#22c55e" },
-                    { label: "Float 2d", value: countByFlood("Float 2d"), color: "#0080ff" },
-                    { label: "7 dias", value: countByFlood("7 dias"), color: "#f59e0b" },
-                    { label: "Banidas", value: countByFlood("Banida"), color: "#ef4444" }
+                    { label: "Ativas", value: countByStatus("active"), color: "#22c55e" },
+                    { label: "Float 2d", value: countByStatus("flood_2d"), color: "#0080ff" },
+                    { label: "7 dias", value: countByStatus("flood_7d"), color: "#f59e0b" },
+                    { label: "Banidas", value: countByStatus("banned"), color: "#ef4444" }
                 ]
                 
                 Repeater {
@@ -696,13 +702,13 @@ Rectangle {
             // Accounts Table
             Rectangle {
                 Layout.fillWidth: true
+                Layout.fillHeight: true
                 color: Theme.card
                 radius: 10
-                implicitHeight: tableCol.height
                 
                 ColumnLayout {
                     id: tableCol
-                    width: parent.width
+                    anchors.fill: parent
                     spacing: 0
                     
                     // Header with search
@@ -747,7 +753,7 @@ Rectangle {
                             }
                             
                             Text {
-                                text: "(" + filteredAccounts.length + " contas)"
+                                text: "(" + (accountsModel ? accountsModel.count : 0) + " contas)"
                                 font.pixelSize: 12
                                 color: Theme.mutedForeground
                             }
@@ -857,13 +863,22 @@ Rectangle {
                         }
                     }
                     
-                    // Table rows
-                    Repeater {
-                        model: filteredAccounts
+                    // Table rows (ListView: só as linhas visíveis têm delegate)
+                    ListView {
+                        id: accountsList
+                        Layout.fillWidth: true
+                        Layout.fillHeight: true
+                        clip: true
+                        model: accountsModel
+                        boundsBehavior: Flickable.StopAtBounds
+                        reuseItems: true
+                        visible: count > 0
                         
-                        Rectangle {
-                            Layout.fillWidth: true
-                            Layout.preferredHeight: 56
+                        ScrollBar.vertical: ScrollBar { policy: ScrollBar.AsNeeded }
+                        
+                        delegate: Rectangle {
+                            width: accountsList.width
+                            height: 56
                             color: rowMouse.containsMouse ? Qt.rgba(1, 1, 1, 0.03) : "transparent"
                             
                             Behavior on color { ColorAnimation { duration: 150 } }
@@ -873,7 +888,7 @@ Rectangle {
                                 width: parent.width
                                 height: 1
                                 color: Qt.rgba(1, 1, 1, 0.05)
-                                visible: index < filteredAccounts.length - 1
+                                visible: index < accountsList.count - 1
                             }
                             
                             MouseArea {
@@ -908,7 +923,7 @@ Rectangle {
                                     }
                                     
                                     Text {
-                                        text: modelData.phone
+                                        text: phone
                                         font.pixelSize: 13
                                         font.weight: Font.Medium
                                         color: Theme.foreground
@@ -925,15 +940,15 @@ Rectangle {
                                         width: floodLabel.width + 18
                                         height: 28
                                         radius: 6
-                                        color: Qt.rgba(Qt.color(modelData.floodColor).r, Qt.color(modelData.floodColor).g, Qt.color(modelData.floodColor).b, 0.12)
+                                        color: Qt.rgba(Qt.color(statusColor).r, Qt.color(statusColor).g, Qt.color(statusColor).b, 0.12)
                                         
                                         Text {
                                             id: floodLabel
                                             anchors.centerIn: parent
-                                            text: modelData.flood
+                                            text: statusLabel
                                             font.pixelSize: 12
                                             font.weight: Font.Medium
-                                            color: modelData.floodColor
+                                            color: statusColor
                                         }
                                     }
                                 }
@@ -941,16 +956,16 @@ Rectangle {
                                 // Added Today
                                 Text {
                                     Layout.preferredWidth: parent.width * 0.15
-                                    text: modelData.addedToday > 0 ? "+" + modelData.addedToday.toString() : "0"
+                                    text: addedToday > 0 ? "+" + addedToday.toString() : "0"
                                     font.pixelSize: 14
                                     font.weight: Font.DemiBold
-                                    color: modelData.addedToday > 0 ? "#22c55e" : Theme.mutedForeground
+                                    color: addedToday > 0 ? "#22c55e" : Theme.mutedForeground
                                 }
                                 
                                 // Last Used
                                 Text {
                                     Layout.preferredWidth: parent.width * 0.25
-                                    text: modelData.lastUsed
+                                    text: lastUsed
                                     font.pixelSize: 13
                                     color: Theme.mutedForeground
                                 }
@@ -988,7 +1003,8 @@ Rectangle {
                                             hoverEnabled: true
                                             cursorShape: Qt.PointingHandCursor
                                             onClicked: {
-                                                deleteIndex = index
+                                                deletePath = path
+                                                deletePhone = phone
                                                 showDeleteDialog = true
                                             }
                                         }
@@ -1003,7 +1019,7 @@ Rectangle {
                         Layout.fillWidth: true
                         Layout.preferredHeight: 100
                         color: "transparent"
-                        visible: filteredAccounts.length === 0
+                        visible: accountsList.count === 0
                         
                         ColumnLayout {
                             anchors.centerIn: parent
@@ -8,11 +8,14 @@ Rectangle {
     id: root
     color: Theme.background
     
-    property bool isRunning: false
-    property int progress: 45
-    property int processedCount: 4
-    property int totalCount: 8
-    property string currentAccount: "+55 11 98765-4321"
+    // Estado da ação atual (JobRunner, atualizado em taxa limitada)
+    property var jobState: ({ status: "idle" })
+    property bool isRunning: jobState.status === "running"
+    property bool isPaused: jobState.status === "paused"
+    property int progress: jobState.progress || 0
+    property int processedCount: jobState.done || 0
+    property int totalCount: jobState.total || 0
+    property string currentAccount: jobState.currentAccount || ""
     property int activeTab: 0
     
     property var sessions: ({ ativas: 8, bloqueadas: 2, banidas: 1 })
@@ -26,13 +29,43 @@ Rectangle {
         { id: "leave", label: "Sair", icon: "logOut", color: "#ef4444" }
     ]
     
-    property var logs: [
-        { type: "success", message: "Sessões ativas: 8", time: "10:30:15" },
-        { type: "warning", message: "Sessões bloqueadas: 2", time: "10:30:16" },
-        { type: "error", message: "Sessões banidas: 1", time: "10:30:17" },
-        { type: "info", message: "Usando 3 contas para a operação", time: "10:30:18" },
-        { type: "success", message: "João Silva (@joao_s) adicionado", time: "10:31:05" }
-    ]
+    // Backend property - injected from parent
+    property var backend: null
+    // Logs das ações (ring buffer no Python, inserção em lote)
+    property var logModel: backend ? backend.actionLogs : null
+    
+    onBackendChanged: {
+        if (!backend) return
+        jobState = backend.getActionStatus()
+        var settings = backend.getActionSettings()
+        delayInput.text = settings.delay.toString()
+        limitInput.text = settings.limit.toString()
+    }
+    
+    Connections {
+        target: root.backend
+        ignoreUnknownSignals: true
+        function onActionProgress(state) {
+            root.jobState = state
+        }
+    }
+    
+    function toggleRun() {
+        if (!backend) return
+        if (isRunning) {
+            backend.pauseAction()
+        } else if (isPaused) {
+            backend.resumeAction()
+        } else {
+            backend.startAction(actionTypes[activeTab].id, {
+                source: sourceInput.text,
+                target: targetInput.text,
+                message: messageInput.text,
+                delay: parseFloat(delayInput.text) || 0,
+                limit: parseInt(limitInput.text) || 0
+            })
+        }
+    }
     
     function getLogColor(type) {
         switch (type) {
@@ -87,7 +120,7 @@ Rectangle {
                         MouseArea {
                             anchors.fill: parent
                             cursorShape: Qt.PointingHandCursor
-                            onClicked: isRunning = !isRunning
+                            onClicked: toggleRun()
                         }
                         
                         Row {
@@ -104,7 +137,7 @@ Rectangle {
                             
                             Text {
                                 anchors.verticalCenter: parent.verticalCenter
-                                text: isRunning ? "Pausar" : "Executar"
+                                text: isRunning ? "Pausar" : (isPaused ? "Continuar" : "Executar")
                                 font.pixelSize: 13
                                 font.weight: Font.Medium
                                 color: "white"
@@ -265,6 +298,7 @@ Rectangle {
                                                 color: Theme.mutedForeground 
                                             }
                                             AppInput { 
+                                                id: sourceInput
                                                 width: parent.width
                                                 placeholderText: "@grupo_origem" 
                                             }
@@ -281,6 +315,7 @@ Rectangle {
                                                 color: Theme.mutedForeground 
                                             }
                                             AppInput { 
+                                                id: targetInput
                                                 width: parent.width
                                                 placeholderText: "@grupo_destino" 
                                             }
@@ -308,6 +343,7 @@ Rectangle {
                                             border.color: Qt.rgba(1, 1, 1, 0.08)
                                             
                                             TextArea {
+                                                id: messageInput
                                                 anchors.fill: parent
                                                 anchors.margins: 10
                                                 placeholderText: "Digite sua mensagem..."
@@ -335,6 +371,7 @@ Rectangle {
                                                 color: Theme.mutedForeground 
                                             }
                                             AppInput { 
+                                                id: delayInput
                                                 width: parent.width
                                                 placeholderText: "30"
                                                 text: "30"
@@ -351,6 +388,7 @@ Rectangle {
                                                 color: Theme.mutedForeground 
                                             }
                                             AppInput { 
+                                                id: limitInput
                                                 width: parent.width
                                                 placeholderText: "50"
                                                 text: "50"
@@ -363,7 +401,7 @@ Rectangle {
                         
                         // Progress Panel
                         Rectangle {
-                            visible: isRunning
+                            visible: isRunning || isPaused
                             Layout.fillWidth: true
                             color: Theme.card
                             radius: 8
@@ -404,17 +442,36 @@ Rectangle {
                                         
                                         Text {
                                             anchors.verticalCenter: parent.verticalCenter
-                                            text: "Executando..."
+                                            text: isPaused ? "Pausado" : "Executando..."
                                             font.pixelSize: 12
                                             font.weight: Font.Medium
                                             color: Theme.primary
                                         }
                                     }
                                     
+                                    Text {
+                                        anchors.right: accBadge.left
+                                        anchors.rightMargin: 10
+                                        anchors.verticalCenter: parent.verticalCenter
+                                        text: "Cancelar"
+                                        font.pixelSize: 11
+                                        color: cancelMouse.containsMouse ? "#ef4444" : Theme.mutedForeground
+                                        
+                                        MouseArea {
+                                            id: cancelMouse
+                                            anchors.fill: parent
+                                            hoverEnabled: true
+                                            cursorShape: Qt.PointingHandCursor
+                                            onClicked: if (backend) backend.cancelAction()
+                                        }
+                                    }
+                                    
                                     Rectangle {
+                                        id: accBadge
                                         anchors.right: parent.right
                                         anchors.rightMargin: 14
                                         anchors.verticalCenter: parent.verticalCenter
+                                        visible: currentAccount.length > 0
                                         width: accLabel.width + 12
                                         height: 22
                                         radius: 4
@@ -493,14 +550,13 @@ Rectangle {
                         // Logs Panel
                         Rectangle {
                             Layout.fillWidth: true
+                            Layout.preferredHeight: 320
                             color: Theme.card
                             radius: 8
-                            implicitHeight: logsContent.height
-                            Layout.minimumHeight: 220
                             
                             Column {
                                 id: logsContent
-                                width: parent.width
+                                anchors.fill: parent
                                 spacing: 0
                                 
                                 // Header
@@ -538,61 +594,109 @@ Rectangle {
                                             color: Theme.foreground
                                         }
                                     }
+                                    
+                                    // Filtro por nível (feito no modelo)
+                                    Row {
+                                        anchors.right: parent.right
+                                        anchors.rightMargin: 14
+                                        anchors.verticalCenter: parent.verticalCenter
+                                        spacing: 10
+                                        
+                                        Repeater {
+                                            model: [
+                                                { level: "", label: "Todos" },
+                                                { level: "error", label: "Erros" },
+                                                { level: "warning", label: "Avisos" }
+                                            ]
+                                            
+                                            Text {
+                                                property bool selected: !!logModel && logModel.levelFilter === modelData.level
+                                                text: modelData.label
+                                                font.pixelSize: 11
+                                                font.weight: selected ? Font.Medium : Font.Normal
+                                                color: selected ? Theme.foreground : Theme.mutedForeground
+                                                
+                                                MouseArea {
+                                                    anchors.fill: parent
+                                                    cursorShape: Qt.PointingHandCursor
+                                                    onClicked: if (logModel) logModel.levelFilter = modelData.level
+                                                }
+                                            }
+                                        }
+                                    }
                                 }
                                 
-                                // Log entries
-                                Column {
+                                // Log entries (ListView: só as linhas visíveis têm delegate)
+                                ListView {
+                                    id: logsList
                                     width: parent.width - 16
+                                    height: parent.height - 40
                                     x: 8
-                                    topPadding: 8
-                                    bottomPadding: 8
+                                    topMargin: 8
+                                    bottomMargin: 8
                                     spacing: 4
+                                    clip: true
+                                    model: logModel
+                                    reuseItems: true
+                                    boundsBehavior: Flickable.StopAtBounds
                                     
-                                    Repeater {
-                                        model: logs
+                                    // Segue as linhas novas, a menos que o usuário tenha rolado para cima
+                                    property bool followTail: true
+                                    onMovementEnded: followTail = atYEnd
+                                    onCountChanged: if (followTail) Qt.callLater(positionViewAtEnd)
+                                    
+                                    ScrollBar.vertical: ScrollBar { policy: ScrollBar.AsNeeded }
+                                    
+                                    delegate: Rectangle {
+                                        width: logsList.width
+                                        height: 36
+                                        radius: 4
+                                        color: Qt.rgba(Qt.color(getLogColor(type)).r, Qt.color(getLogColor(type)).g, Qt.color(getLogColor(type)).b, 0.08)
                                         
                                         Rectangle {
-                                            width: parent.width
-                                            height: 36
-                                            radius: 4
-                                            color: Qt.rgba(Qt.color(getLogColor(modelData.type)).r, Qt.color(getLogColor(modelData.type)).g, Qt.color(getLogColor(modelData.type)).b, 0.08)
-                                            
-                                            Rectangle {
-                                                anchors.left: parent.left
-                                                anchors.leftMargin: 10
-                                                anchors.verticalCenter: parent.verticalCenter
-                                                width: 6
-                                                height: 6
-                                                radius: 3
-                                                color: getLogColor(modelData.type)
-                                            }
-                                            
-                                            Text {
-                                                anchors.left: parent.left
-                                                anchors.leftMargin: 24
-                                                anchors.right: timeLabel.left
-                                                anchors.rightMargin: 8
-                                                anchors.verticalCenter: parent.verticalCenter
-                                                text: modelData.message
-                                                font.pixelSize: 11
-                                                color: Theme.foreground
-                                                elide: Text.ElideRight
-                                            }
-                                            
-                                            Text {
-                                                id: timeLabel
-                                                anchors.right: parent.right
-                                                anchors.rightMargin: 10
-                                                anchors.verticalCenter: parent.verticalCenter
-                                                text: modelData.time
-                                                font.pixelSize: 9
-                                                font.family: "monospace"
-                                                color: Theme.mutedForeground
-                                            }
+                                            anchors.left: parent.left
+                                            anchors.leftMargin: 10
+                                            anchors.verticalCenter: parent.verticalCenter
+                                            width: 6
+                                            height: 6
+                                            radius: 3
+                                            color: getLogColor(type)
+                                        }
+                                        
+                                        Text {
+                                            anchors.left: parent.left
+                                            anchors.leftMargin: 24
+                                            anchors.right: timeLabel.left
+                                            anchors.rightMargin: 8
+                                            anchors.verticalCenter: parent.verticalCenter
+                                            text: message
+                                            font.pixelSize: 11
+                                            color: Theme.foreground
+                                            elide: Text.ElideRight
+                                        }
+                                        
+                                        Text {
+                                            id: timeLabel
+                                            anchors.right: parent.right
+                                            anchors.rightMargin: 10
+                                            anchors.verticalCenter: parent.verticalCenter
+                                            text: time
+                                            font.pixelSize: 9
+                                            font.family: "monospace"
+                                            color: Theme.mutedForeground
                                         }
                                     }
                                 }
                             }
+                            
+                            Text {
+                                anchors.centerIn: parent
+                                anchors.verticalCenterOffset: 20
+                                visible: logsList.count === 0
+                                text: "Nenhum log ainda"
+                                font.pixelSize: 11
+                                color: Theme.mutedForeground
+                            }
                         }
                     }
                 }
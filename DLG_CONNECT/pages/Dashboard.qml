@@ -10,15 +10,20 @@ Rectangle {
     
     signal navigateToActions(int tabIndex)
     
-    property var user: ({
-        name: "Kauan",
-        plan: "Pro",
-        expiresAt: "2025-01-15",
-        daysRemaining: 22,
-        totalDays: 30
-    })
+    // Backend property - injected from parent
+    property var backend: null
     
-    property real progressPercentage: (user.daysRemaining / user.totalDays) * 100
+    // Usuário/plano (cada propriedade do userState tem seu próprio sinal)
+    property var userState: backend ? backend.userState : null
+    readonly property string userName: userState ? userState.name : ""
+    readonly property string planName: userState ? userState.planName : ""
+    readonly property string expiresAt: userState ? userState.expiresAt : ""
+    readonly property int daysRemaining: userState ? userState.daysRemaining : 0
+    readonly property int totalDays: userState ? userState.totalDays : 0
+    // Vence em até 3 dias (atualizado pelo timer da licença, sem polling)
+    readonly property bool expiringSoon: userState ? userState.expiringSoon : false
+    
+    property real progressPercentage: totalDays > 0 ? (daysRemaining / totalDays) * 100 : 0
     
     property var accounts: [
         { phone: "+55 11 98765-4321", flood: "Ativa", floodColor: "#22c55e" },
@@ -66,7 +71,7 @@ Rectangle {
                         
                         Text {
                             anchors.centerIn: parent
-                            text: user.name.charAt(0).toUpperCase()
+                            text: root.userName.charAt(0).toUpperCase()
                             font.pixelSize: 14
                             font.weight: Font.Bold
                             color: Theme.primaryForeground
@@ -74,7 +79,7 @@ Rectangle {
                     }
                     
                     Text {
-                        text: "Bem-vindo, " + user.name + "!"
+                        text: "Bem-vindo, " + root.userName + "!"
                         font.pixelSize: 16
                         font.weight: Font.DemiBold
                         color: Theme.foreground
@@ -150,7 +155,7 @@ Rectangle {
                                 spacing: 8
                                 
                                 Text {
-                                    text: "Plano " + user.plan
+                                    text: userState && userState.accessType !== "none" ? "Plano " + root.planName : root.planName
                                     font.pixelSize: 14
                                     font.weight: Font.Bold
                                     color: Theme.foreground
@@ -185,7 +190,7 @@ Rectangle {
                                 }
                                 
                                 Text {
-                                    text: "Expira em " + user.expiresAt
+                                    text: root.expiresAt ? "Expira em " + root.expiresAt : "Sem data de expiração"
                                     font.pixelSize: 11
                                     color: Theme.mutedForeground
                                 }
@@ -208,10 +213,10 @@ Rectangle {
                                 Item { Layout.fillWidth: true }
                                 
                                 Text {
-                                    text: user.daysRemaining + " dias restantes"
+                                    text: root.daysRemaining + " dias restantes"
                                     font.pixelSize: 11
                                     font.weight: Font.Medium
-                                    color: Theme.foreground
+                                    color: root.expiringSoon ? Theme.warning : Theme.foreground
                                 }
                             }
                             
@@ -225,7 +230,7 @@ Rectangle {
                                     width: parent.width * (progressPercentage / 100)
                                     height: parent.height
                                     radius: parent.radius
-                                    color: Theme.primary
+                                    color: root.expiringSoon ? Theme.warning : Theme.primary
                                 }
                             }
                         }
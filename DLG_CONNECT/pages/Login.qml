@@ -1,7 +1,6 @@
 import QtQuick 2.15
 import QtQuick.Controls 2.15
 import QtQuick.Layouts 1.15
-import QtWebEngine 1.10
 import ".."
 import "../components"
 
@@ -43,6 +42,7 @@ Rectangle {
     property bool recaptchaVerified: false
     property string recaptchaToken: ""
     property string errorMessage: ""
+    readonly property string serverUnavailableMessage: "Servidor indisponível no momento. Tentando reconectar..."
     
     // Trial/License properties
     property bool isTrialEligible: false
@@ -93,9 +93,12 @@ Rectangle {
         console.log("Ativando período de teste...")
         root.isLoading = true
         
-        var result = backend.registerTrial()
+        // Resultado chega em onTrialRegistered
+        backend.registerTrialAsync()
+    }
+    
+    function handleTrialRegistered(data) {
         try {
-            var data = JSON.parse(result)
             if (data.success) {
                 console.log("Trial ativado com sucesso!")
                 root.showNoLicenseModal = false
@@ -158,7 +161,7 @@ Rectangle {
         ignoreUnknownSignals: true
         
         function onLoginSuccess(userData) {
-            console.log("Login success:", userData)
+            console.log("Login success:", userData.accessType)
             root.isLoading = false
             root.isCheckingSession = false
             root.showAnimation = true
@@ -187,15 +190,14 @@ Rectangle {
             if (root.backend) root.backend.clearLocalSession()
         }
         
-        function onDeviceLimitReached(infoJson) {
+        function onDeviceLimitReached(info) {
             try {
-                var info = JSON.parse(infoJson)
                 root.activeDevices = info.active_count
                 root.maxDevices = info.max_allowed
                 root.deviceLimitError = info.error
                 root.showDeviceLimitModal = true
             } catch(e) {
-                console.log("Erro ao parsear limite:", e)
+                console.log("Erro ao ler limite:", e)
             }
             root.isLoading = false
             root.isCheckingSession = false
@@ -208,22 +210,20 @@ Rectangle {
             root.isCheckingSession = false
         }
         
-        function onTrialAvailable(infoJson) {
+        function onTrialAvailable(info) {
             try {
-                var info = JSON.parse(infoJson)
                 root.isTrialEligible = true
                 root.trialDays = info.trial_days || 3
                 root.showAnimation = true
             } catch(e) {
-                console.log("Erro ao parsear trial:", e)
+                console.log("Erro ao ler trial:", e)
             }
             root.isLoading = false
             root.isCheckingSession = false
         }
         
-        function onNoLicense(infoJson) {
+        function onNoLicense(info) {
             try {
-                var info = JSON.parse(infoJson)
                 root.canActivateTrial = info.can_use_trial || false
                 root.trialDays = info.trial_days || 3
                 root.trialAlreadyUsed = !root.canActivateTrial
@@ -242,6 +242,28 @@ Rectangle {
         function onLoadingChanged(loading) {
             root.isLoading = loading
         }
+        
+        function onTrialRegistered(result) {
+            root.handleTrialRegistered(result)
+        }
+        
+        function onRecaptchaSettingsChanged() {
+            root.loadRecaptchaSettings()
+        }
+        
+        function onServerAvailabilityChanged(available) {
+            if (!available) {
+                root.errorMessage = root.serverUnavailableMessage
+            } else if (root.errorMessage === root.serverUnavailableMessage) {
+                root.errorMessage = ""
+            }
+        }
+    }
+    
+    // Saindo da tela: descartar operações de rede ainda em andamento
+    Component.onDestruction: {
+        autoLoginTimer.stop()
+        if (root.backend && !root.showAnimation) root.backend.cancelPending()
     }
     
     RowLayout {
@@ -796,146 +818,19 @@ Rectangle {
                             }
                         }
                         
-                        // reCAPTCHA widget (se habilitado) - Design tema escuro
-                        Rectangle {
-                            id: recaptchaContainer
-                            visible: root.recaptchaEnabled
+                        // reCAPTCHA widget (só é criado se habilitado)
+                        Loader {
+                            id: recaptchaLoader
+                            active: root.recaptchaEnabled
+                            visible: active
                             Layout.fillWidth: true
                             Layout.preferredHeight: 74
-                            radius: 6
-                            clip: true
-                            color: Theme.muted
-                            border.width: 1
-                            border.color: root.recaptchaVerified ? Theme.accent : Theme.border
-                            
-                            Behavior on border.color { ColorAnimation { duration: 200 } }
                             
-                            RowLayout {
-                                anchors.fill: parent
-                                anchors.leftMargin: 16
-                                anchors.rightMargin: 16
-                                spacing: 14
-                                
-                                // Checkbox área
-                                Rectangle {
-                                    id: recaptchaCheckbox
-                                    Layout.preferredWidth: 26
-                                    Layout.preferredHeight: 26
-                                    radius: 4
-                                    color: root.recaptchaVerified ? Theme.accent : 
-                                           (recaptchaCheckMouse.containsMouse ? Qt.rgba(1, 1, 1, 0.1) : "transparent")
-                                    border.width: root.recaptchaVerified ? 0 : 2
-                                    border.color: recaptchaCheckMouse.containsMouse ? Theme.primary : Theme.border
-                                    
-                                    property bool isVerifying: false
-                                    
-                                    Behavior on border.color { ColorAnimation { duration: 150 } }
-                                    Behavior on color { ColorAnimation { duration: 150 } }
-                                    
-                                    // Checkmark quando verificado
-                                    Text {
-                                        visible: root.recaptchaVerified
-                                        anchors.centerIn: parent
-                                        text: "✓"
-                                        font.pixelSize: 16
-                                        font.weight: Font.Bold
-                                        color: Theme.background
-                                        
-                                        scale: root.recaptchaVerified ? 1.0 : 0.5
-                                        opacity: root.recaptchaVerified ? 1.0 : 0.0
-                                        
-                                        Behavior on scale { NumberAnimation { duration: 200; easing.type: Easing.OutBack } }
-                                        Behavior on opacity { NumberAnimation { duration: 150 } }
-                                    }
-                                    
-                                    // Loading spinner durante verificação
-                                    Rectangle {
-                                        visible: recaptchaCheckbox.isVerifying
-                                        anchors.centerIn: parent
-                                        width: 18
-                                        height: 18
-                                        radius: 9
-                                        color: "transparent"
-                                        border.width: 2
-                                        border.color: Theme.primary
-                                        
-                                        Rectangle {
-                                            width: 9
-                                            height: 2
-                                            radius: 1
-                                            color: Theme.primary
-                                            anchors.right: parent.right
-                                            anchors.verticalCenter: parent.verticalCenter
-                                        }
-                                        
-                                        RotationAnimation on rotation {
-                                            from: 0
-                                            to: 360
-                                            duration: 700
-                                            loops: Animation.Infinite
-                                            running: recaptchaCheckbox.isVerifying
-                                        }
-                                    }
-                                    
-                                    MouseArea {
-                                        id: recaptchaCheckMouse
-                                        anchors.fill: parent
-                                        hoverEnabled: true
-                                        cursorShape: (recaptchaCheckbox.isVerifying || root.recaptchaVerified) ? 
-                                                     Qt.ArrowCursor : Qt.PointingHandCursor
-                                        enabled: !recaptchaCheckbox.isVerifying && !root.recaptchaVerified
-                                        
-                                        onClicked: {
-                                            if (recaptchaCheckbox.isVerifying || root.recaptchaVerified) return
-                                            
-                                            console.log("Iniciando verificação reCAPTCHA...")
-                                            recaptchaCheckbox.isVerifying = true
-                                            verifyTimer.start()
-                                        }
-                                    }
-                                    
-                                    Timer {
-                                        id: verifyTimer
-                                        interval: 800 + Math.random() * 400
-                                        repeat: false
-                                        onTriggered: {
-                                            console.log("reCAPTCHA verificado com sucesso")
-                                            root.recaptchaToken = "03AGdBq" + Date.now() + "_verified"
-                                            root.recaptchaVerified = true
-                                            recaptchaCheckbox.isVerifying = false
-                                        }
-                                    }
-                                }
-                                
-                                // Texto
-                                Text {
-                                    text: recaptchaCheckbox.isVerifying ? "Verificando..." : 
-                                          (root.recaptchaVerified ? "Verificado" : "Não sou um robô")
-                                    font.pixelSize: 14
-                                    color: root.recaptchaVerified ? Theme.accent : Theme.foreground
-                                    
-                                    Behavior on color { ColorAnimation { duration: 150 } }
-                                }
-                                
-                                Item { Layout.fillWidth: true }
-                                
-                                // Logo/ícone simplificado
-                                Column {
-                                    spacing: 2
-                                    Layout.alignment: Qt.AlignVCenter
-                                    
-                                    Icon {
-                                        anchors.horizontalCenter: parent.horizontalCenter
-                                        name: "shield"
-                                        size: 20
-                                        color: Theme.mutedForeground
-                                    }
-                                    
-                                    Text {
-                                        text: "Segurança"
-                                        font.pixelSize: 9
-                                        color: Theme.subtleForeground
-                                    }
+                            sourceComponent: RecaptchaBox {
+                                verified: root.recaptchaVerified
+                                onTokenReady: function(token) {
+                                    root.recaptchaToken = token
+                                    root.recaptchaVerified = true
                                 }
                             }
                         }
@@ -30,6 +30,20 @@ Rectangle {
         easing.type: Easing.OutQuad
     }
     
+    // Abre a página Ações em uma aba (aplicada quando a página terminar de carregar)
+    function openActions(tabIndex) {
+        root.pendingActionTab = tabIndex
+        root.currentPage = 2
+        sidebar.currentIndex = 2
+        applyPendingActionTab()
+    }
+    
+    function applyPendingActionTab() {
+        if (root.pendingActionTab < 0 || !actionsLoader.item) return
+        actionsLoader.item.activeTab = root.pendingActionTab
+        root.pendingActionTab = -1
+    }
+    
     RowLayout {
         anchors.fill: parent
         spacing: 0
@@ -40,6 +54,7 @@ Rectangle {
             Layout.fillHeight: true
             Layout.preferredWidth: 180
             currentIndex: root.currentPage
+            userState: root.backend ? root.backend.userState : null
             
             onMenuItemClicked: function(index) {
                 root.currentPage = index
@@ -52,23 +67,45 @@ Rectangle {
             Layout.fillHeight: true
             color: Theme.background
             
+            // Páginas criadas na primeira visita, em segundo plano (asynchronous),
+            // e mantidas depois disso para preservar o estado de cada uma
             StackLayout {
                 anchors.fill: parent
                 anchors.margins: 12
                 currentIndex: root.currentPage
                 
-                Dashboard {
-                    onNavigateToActions: function(tabIndex) {
-                        actionsPage.activeTab = tabIndex
-                        root.currentPage = 2
-                        sidebar.currentIndex = 2
+                Loader {
+                    active: true
+                    sourceComponent: Dashboard {
+                        backend: root.backend
+                        onNavigateToActions: function(tabIndex) {
+                            root.openActions(tabIndex)
+                        }
                     }
                 }
-                Accounts {}
-                Actions {
-                    id: actionsPage
+                Loader {
+                    asynchronous: true
+                    active: StackLayout.isCurrentItem || status !== Loader.Null
+                    sourceComponent: Accounts {
+                        backend: root.backend
+                    }
+                }
+                Loader {
+                    id: actionsLoader
+                    asynchronous: true
+                    active: StackLayout.isCurrentItem || status !== Loader.Null
+                    sourceComponent: Actions {
+                        backend: root.backend
+                    }
+                    onLoaded: root.applyPendingActionTab()
+                }
+                Loader {
+                    asynchronous: true
+                    active: StackLayout.isCurrentItem || status !== Loader.Null
+                    sourceComponent: Settings {
+                        backend: root.backend
+                    }
                 }
-                Settings {}
             }
         }
     }
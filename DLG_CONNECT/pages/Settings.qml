@@ -8,6 +8,52 @@ Rectangle {
     id: root
     color: Theme.background
     
+    // Backend property - injected from parent
+    property var backend: null
+    
+    // Diagnóstico da API (latência/erros por ação)
+    property var apiMetrics: []
+    property string metricsExportPath: ""
+    
+    function refreshApiMetrics() {
+        if (backend === null || backend === undefined) return
+        try {
+            var snapshot = backend.getApiMetrics()
+            var rows = []
+            for (var action in snapshot.actions) {
+                var m = snapshot.actions[action]
+                var errors = 0
+                for (var kind in m.errors) errors += m.errors[kind]
+                rows.push({
+                    action: action,
+                    count: m.latency.count,
+                    p50: m.latency.p50_ms,
+                    p95: m.latency.p95_ms,
+                    server: m.server_time.avg_ms,
+                    errors: errors
+                })
+            }
+            root.apiMetrics = rows
+        } catch(e) {
+            console.log("Erro ao ler métricas:", e)
+        }
+    }
+    
+    function formatMs(value) {
+        return (value === null || value === undefined) ? "-" : Math.round(value) + " ms"
+    }
+    
+    onVisibleChanged: if (visible) refreshApiMetrics()
+    
+    // Delay/limite por conta usados pelas ações (salvos no Python)
+    onBackendChanged: {
+        if (!backend) return
+        var settings = backend.getActionSettings()
+        delaySetting.text = settings.delay.toString()
+        limitSetting.text = settings.limit.toString()
+        antiBanToggle.checked = settings.antiBan
+    }
+    
     // Reusable SettingsToggle component
     component SettingsToggle: Rectangle {
         id: toggleItem
@@ -27,7 +73,7 @@ Rectangle {
             anchors.fill: parent
             hoverEnabled: true
             cursorShape: Qt.PointingHandCursor
-            onClicked: toggleSwitch.checked = !toggleSwitch.checked
+            onClicked: toggleItem.checked = !toggleItem.checked
         }
         
         RowLayout {
@@ -262,7 +308,7 @@ Rectangle {
                                 Layout.margins: 10
                                 spacing: 6
                                 
-                                SettingsToggle { title: "Anti-Ban Mode"; desc: "Delays aleatórios extras"; checked: true }
+                                SettingsToggle { id: antiBanToggle; title: "Anti-Ban Mode"; desc: "Delays aleatórios extras"; checked: true }
                                 SettingsToggle { title: "Simular Digitação"; desc: "Parecer mais humano"; checked: true }
                                 SettingsToggle { title: "Proxy Rotativo"; desc: "Alternar IPs"; checked: false }
                             }
@@ -302,7 +348,7 @@ Rectangle {
                                         spacing: 4
                                         
                                         Text { text: "Delay (segundos)"; font.pixelSize: 10; color: Theme.mutedForeground }
-                                        AppInput { Layout.fillWidth: true; placeholderText: "30"; text: "30" }
+                                        AppInput { id: delaySetting; Layout.fillWidth: true; placeholderText: "30"; text: "30" }
                                         Text { text: "Recomendado: 25-40s"; font.pixelSize: 9; color: Theme.mutedForeground }
                                     }
                                     
@@ -311,7 +357,7 @@ Rectangle {
                                         spacing: 4
                                         
                                         Text { text: "Limite de Adições"; font.pixelSize: 10; color: Theme.mutedForeground }
-                                        AppInput { Layout.fillWidth: true; placeholderText: "50"; text: "50" }
+                                        AppInput { id: limitSetting; Layout.fillWidth: true; placeholderText: "50"; text: "50" }
                                         Text { text: "Máximo: 50/conta"; font.pixelSize: 9; color: Theme.mutedForeground }
                                     }
                                 }
@@ -352,6 +398,14 @@ Rectangle {
                     anchors.fill: parent
                     hoverEnabled: true
                     cursorShape: Qt.PointingHandCursor
+                    onClicked: {
+                        if (!backend) return
+                        backend.saveActionSettings(
+                            parseFloat(delaySetting.text) || 30,
+                            parseInt(limitSetting.text) || 50,
+                            antiBanToggle.checked
+                        )
+                    }
                 }
                 
                 RowLayout {
@@ -465,6 +519,94 @@ Rectangle {
                 }
             }
             
+            // ===== Diagnóstico da Conexão =====
+            Rectangle {
+                Layout.fillWidth: true
+                Layout.preferredHeight: diagCol.height
+                color: Theme.card
+                radius: 6
+                
+                ColumnLayout {
+                    id: diagCol
+                    width: parent.width
+                    spacing: 0
+                    
+                    PanelHeader {
+                        title: "Diagnóstico da Conexão"
+                        iconName: "activity"
+                        iconColor: Theme.primary
+                    }
+                    
+                    ColumnLayout {
+                        Layout.fillWidth: true
+                        Layout.margins: 12
+                        spacing: 6
+                        
+                        // Cabeçalho da tabela
+                        RowLayout {
+                            Layout.fillWidth: true
+                            spacing: 8
+                            
+                            Text { text: "Ação"; Layout.fillWidth: true; font.pixelSize: 10; color: Theme.mutedForeground }
+                            Text { text: "Chamadas"; Layout.preferredWidth: 60; font.pixelSize: 10; color: Theme.mutedForeground }
+                            Text { text: "p50"; Layout.preferredWidth: 60; font.pixelSize: 10; color: Theme.mutedForeground }
+                            Text { text: "p95"; Layout.preferredWidth: 60; font.pixelSize: 10; color: Theme.mutedForeground }
+                            Text { text: "Servidor"; Layout.preferredWidth: 60; font.pixelSize: 10; color: Theme.mutedForeground }
+                            Text { text: "Erros"; Layout.preferredWidth: 40; font.pixelSize: 10; color: Theme.mutedForeground }
+                        }
+                        
+                        Repeater {
+                            model: root.apiMetrics
+                            
+                            RowLayout {
+                                Layout.fillWidth: true
+                                spacing: 8
+                                
+                                Text { text: modelData.action; Layout.fillWidth: true; font.pixelSize: 11; color: Theme.foreground; elide: Text.ElideRight }
+                                Text { text: modelData.count; Layout.preferredWidth: 60; font.pixelSize: 11; color: Theme.foreground }
+                                Text { text: root.formatMs(modelData.p50); Layout.preferredWidth: 60; font.pixelSize: 11; color: Theme.foreground }
+                                Text { text: root.formatMs(modelData.p95); Layout.preferredWidth: 60; font.pixelSize: 11; color: Theme.foreground }
+                                Text { text: root.formatMs(modelData.server); Layout.preferredWidth: 60; font.pixelSize: 11; color: Theme.mutedForeground }
+                                Text { text: modelData.errors; Layout.preferredWidth: 40; font.pixelSize: 11; color: modelData.errors > 0 ? Theme.destructive : Theme.foreground }
+                            }
+                        }
+                        
+                        Text {
+                            visible: root.apiMetrics.length === 0
+                            text: "Nenhuma requisição registrada nesta sessão"
+                            font.pixelSize: 10
+                            color: Theme.mutedForeground
+                        }
+                        
+                        RowLayout {
+                            Layout.fillWidth: true
+                            Layout.topMargin: 4
+                            spacing: 8
+                            
+                            AppButton {
+                                text: "Atualizar"
+                                onClicked: root.refreshApiMetrics()
+                            }
+                            
+                            AppButton {
+                                text: "Exportar (OpenMetrics)"
+                                onClicked: {
+                                    if (root.backend) root.metricsExportPath = root.backend.exportApiMetrics()
+                                }
+                            }
+                            
+                            Text {
+                                Layout.fillWidth: true
+                                text: root.metricsExportPath
+                                font.pixelSize: 9
+                                color: Theme.mutedForeground
+                                elide: Text.ElideMiddle
+                            }
+                        }
+                    }
+                }
+            }
+            
             Item { Layout.preferredHeight: 20 }
         }
     }
@@ -0,0 +1,103 @@
+"""
+Fixtures dos testes: pasta de dados isolada, stand-in HTTPS do bot-auth e
+DLGApiClient apontado para ele, com o estado de classe zerado a cada teste.
+"""
+
+import datetime
+import ipaddress
+import os
+import ssl
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+APP_DIR = Path(__file__).resolve().parent.parent
+
+# Antes de importar api: a sessão/cache do app vão para uma pasta temporária
+_HOME = tempfile.mkdtemp(prefix="dlg-tests-")
+os.environ["HOME"] = _HOME
+os.environ["APPDATA"] = _HOME
+if str(APP_DIR) not in sys.path:
+    sys.path.insert(0, str(APP_DIR))
+
+from bench.standin import StandInServer, StandInConfig  # noqa: E402
+
+
+def _self_signed_cert(directory: Path):
+    """Certificado autoassinado para 127.0.0.1; retorna (cert.pem, key.pem)"""
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from cryptography.x509.oid import NameOID
+
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "127.0.0.1")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(minutes=5))
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .add_extension(x509.SubjectAlternativeName([x509.IPAddress(ipaddress.ip_address("127.0.0.1"))]), False)
+        .add_extension(x509.BasicConstraints(ca=True, path_length=None), True)
+        .sign(key, hashes.SHA256())
+    )
+    cert_path, key_path = directory / "cert.pem", directory / "key.pem"
+    cert_path.write_bytes(cert.public_bytes(serialization.Encoding.PEM))
+    key_path.write_bytes(key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ))
+    return cert_path, key_path
+
+
+@pytest.fixture(scope="session")
+def tls_cert(tmp_path_factory):
+    return _self_signed_cert(tmp_path_factory.mktemp("tls"))
+
+
+@pytest.fixture
+def standin(tls_cert, monkeypatch):
+    """bot-auth local em HTTPS; requests/httpx confiam no certificado pelas variáveis de ambiente"""
+    cert_path, key_path = tls_cert
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert_path, key_path)
+    monkeypatch.setenv("REQUESTS_CA_BUNDLE", str(cert_path))
+    monkeypatch.setenv("SSL_CERT_FILE", str(cert_path))
+    server = StandInServer(StandInConfig(), ssl_context=context).start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture(params=["requests", "httpx-h2"])
+def client(request, standin, monkeypatch):
+    """DLGApiClient como num app recém-aberto, falando com o stand-in (um teste por transporte)"""
+    from api.policy import CircuitBreaker, SingleFlight
+    from api.supabase_client import DLGApiClient, api
+    from api.transport import create_transport, http2_available
+
+    http2 = request.param == "httpx-h2"
+    if http2 and not http2_available():
+        pytest.skip("httpx/h2 não instalados")
+
+    monkeypatch.setattr(DLGApiClient, "API_URL", standin.url)
+    monkeypatch.setattr(DLGApiClient, "_circuit_breaker", CircuitBreaker())
+    monkeypatch.setattr(DLGApiClient, "_single_flight", SingleFlight())
+    DLGApiClient._bootstrap_future = None
+    DLGApiClient._server_capabilities = None
+    DLGApiClient._etags.clear()
+    DLGApiClient._warm_profiles.clear()
+    api.clear_local_session()
+    api._get_settings_cache().invalidate()
+    DLGApiClient._transport = None
+    headers = api._get_transport()._default_headers
+    api.set_transport(create_transport(headers, prefer_http2=http2))
+    assert api._get_transport().name == request.param
+    yield api
+    api.clear_local_session()
+    api.close()
+    DLGApiClient._transport = None
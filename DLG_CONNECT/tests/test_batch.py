@@ -0,0 +1,73 @@
+"""Ação batch e bootstrap do startup contra o stand-in do bot-auth"""
+
+from bench.standin import BENCH_EMAIL, BENCH_PASSWORD
+
+
+def test_bootstrap_is_one_round_trip(client, standin):
+    from api.supabase_client import DLGApiClient
+
+    client.full_login(BENCH_EMAIL, BENCH_PASSWORD)
+    # App reaberto: sem cache do reCAPTCHA, com sessão salva
+    client._get_settings_cache().invalidate()
+    DLGApiClient._server_capabilities = None
+    standin.reset_counters()
+
+    result = client.bootstrap()
+
+    assert standin.calls == ["batch"]
+    assert result["recaptcha"] is not None
+    assert result["session"]["access"] is True
+    assert result["cached"] is False
+
+
+def test_batch_keeps_per_action_results_and_errors(client, standin):
+    results = client.batch([
+        ("get_recaptcha_settings", {}),
+        ("no_such_action", {}),
+        ("check_trial_eligibility", {"device_fingerprint": "someone"}),
+    ])
+
+    assert standin.calls == ["batch"]
+    assert [r.get("success") for r in results] == [True, False, True]
+    assert [r["_status_code"] for r in results] == [200, 400, 200]
+    assert results[1]["error"] == "Ação inválida"
+
+
+def test_batch_falls_back_to_sequential_calls(client, standin):
+    standin.config.batch = False
+    requests = [("get_recaptcha_settings", {}), ("check_trial_eligibility", {"device_fingerprint": "someone"})]
+
+    first = client.batch(requests)
+    # Servidor já conhecido sem batch: nem tenta mais
+    second = client.batch(requests)
+
+    assert client.supports("batch") is False
+    # Leituras repetidas saem do memo; o que importa é não haver outro "batch"
+    assert standin.calls == ["batch", "get_recaptcha_settings", "check_trial_eligibility"]
+    assert all(r["success"] for r in first + second)
+
+
+def test_response_headers_are_lowercase(client, standin):
+    response = client._get_transport().post(standin.url, b'{"action":"get_recaptcha_settings"}', (3, 5))
+
+    assert all(name == name.lower() for name in response.headers)
+    assert response.headers["content-type"] == "application/json"
+    assert "batch" in response.headers["x-bot-auth-capabilities"]
+
+    client.load_recaptcha_settings()
+    assert client.supports("batch") is True
+
+
+def test_start_bootstrap_applies_cached_recaptcha_before_the_request(client, standin, monkeypatch):
+    standin.config.recaptcha_enabled = True
+    client.load_recaptcha_settings()
+    client.full_login(BENCH_EMAIL, BENCH_PASSWORD)
+    # App reaberto: estado em memória zerado, cache do reCAPTCHA em disco
+    monkeypatch.setattr(client, "_recaptcha_enabled", False)
+    standin.config.action_latency_ms["batch"] = 300
+
+    future = client.start_bootstrap()
+
+    assert client.recaptcha_enabled is True
+    assert not future.done()
+    assert future.result(timeout=10)["session"]["access"] is True
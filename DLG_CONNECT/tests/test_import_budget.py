@@ -0,0 +1,7 @@
+"""Orçamento de import do pacote api (mesma verificação do bench/import_budget.py)"""
+
+from bench.import_budget import check
+
+
+def test_api_imports_within_budget():
+    assert check() == []
@@ -0,0 +1,90 @@
+"""Circuit breaker: a requisição de teste do half_open sempre termina com um veredito"""
+
+import threading
+
+from api.policy import CircuitBreaker
+
+
+def _half_open(breaker: CircuitBreaker, monkeypatch):
+    monkeypatch.setattr(breaker, "RESET_TIMEOUT", 0.0)
+    for _ in range(breaker.FAILURE_THRESHOLD):
+        breaker.record_failure()
+    assert breaker.state == breaker.OPEN
+
+
+def test_probe_without_verdict_reopens(monkeypatch):
+    breaker = CircuitBreaker()
+    _half_open(breaker, monkeypatch)
+
+    assert breaker.allow()
+    assert breaker.state == breaker.HALF_OPEN
+    assert not breaker.allow()  # só um teste por vez
+    breaker.release()
+
+    assert breaker.state == breaker.OPEN
+    # RESET_TIMEOUT=0: já pode testar de novo
+    assert breaker.allow()
+
+
+def test_release_after_verdict_keeps_state(monkeypatch):
+    breaker = CircuitBreaker()
+    _half_open(breaker, monkeypatch)
+
+    assert breaker.allow()
+    breaker.record_success()
+    breaker.release()
+
+    assert breaker.state == breaker.CLOSED
+
+
+def test_release_from_other_request_does_not_settle_probe(monkeypatch):
+    breaker = CircuitBreaker()
+    _half_open(breaker, monkeypatch)
+    assert breaker.allow()
+
+    # Requisição iniciada antes do circuito abrir termina em outra thread
+    other = threading.Thread(target=breaker.release)
+    other.start()
+    other.join()
+
+    assert breaker.state == breaker.HALF_OPEN
+    assert not breaker.allow()
+
+
+def test_ssl_error_on_probe_does_not_lock_the_client(client, monkeypatch):
+    from api.transport import TransportSSLError
+
+    breaker = client._circuit_breaker
+    _half_open(breaker, monkeypatch)
+    transport = client._get_transport()
+    original_post = transport.post
+
+    def failing_post(*args, **kwargs):
+        raise TransportSSLError("certificate verify failed")
+
+    monkeypatch.setattr(transport, "post", failing_post)
+    result = client._api_request("logout", {"user_id": "someone"})
+    assert result["success"] is False
+    assert result.get("code") != "SERVER_UNAVAILABLE"
+    assert breaker.state == breaker.OPEN
+
+    # Endpoint de volta: o próximo teste passa e fecha o circuito
+    monkeypatch.setattr(transport, "post", original_post)
+    result = client._api_request("logout", {"user_id": "someone"})
+    assert result["success"] is True
+    assert breaker.state == breaker.CLOSED
+
+
+def test_verify_session_is_sent_once(client, standin):
+    from bench.standin import BENCH_EMAIL, BENCH_PASSWORD
+
+    client.full_login(BENCH_EMAIL, BENCH_PASSWORD)
+    # Renova o refresh_token (uso único): nem retry nem hedge podem duplicá-lo
+    standin.config.fail_rate = 1.0
+    standin.config.latency_ms = 300
+    standin.reset_counters()
+
+    result = client.verify_session()
+
+    assert result["success"] is False
+    assert standin.calls == ["verify_session"]
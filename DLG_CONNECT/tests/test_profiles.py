@@ -0,0 +1,99 @@
+"""Troca de perfil sem o servidor: só entra com entitlement válido, e sai se não for confirmada"""
+
+import time
+
+import pytest
+
+from bench.realtime_standin import RealtimeStandIn
+from bench.standin import BENCH_EMAIL, BENCH_PASSWORD, BENCH_USER_2, generate_entitlement_keys
+
+
+@pytest.fixture
+def entitlement_keys(standin, monkeypatch):
+    """Stand-in assinando entitlements; o cliente confia na chave pública"""
+    from api.supabase_client import DLGApiClient
+
+    standin.config.entitlement_key, public_key = generate_entitlement_keys()
+    monkeypatch.setattr(DLGApiClient, "ENTITLEMENT_PUBLIC_KEY", public_key)
+
+
+@pytest.fixture
+def backend(client, monkeypatch):
+    """Backend com os dois perfis salvos (ativo: BENCH_USER), Realtime no stand-in local"""
+    from PySide6.QtCore import QCoreApplication
+    from api.bridge import Backend
+    from api.supabase_client import DLGApiClient
+
+    realtime = RealtimeStandIn().start()
+    monkeypatch.setattr(DLGApiClient, "REALTIME_URL", realtime.url)
+    assert client.full_login(BENCH_USER_2["email"], BENCH_PASSWORD)["access"]
+    assert client.full_login(BENCH_EMAIL, BENCH_PASSWORD)["access"]
+
+    app = QCoreApplication.instance() or QCoreApplication([])
+    backend = Backend()
+    logged_in = []
+    backend.loginSuccess.connect(logged_in.append)
+    backend.verifySession()
+    assert _wait(app, lambda: bool(logged_in))
+    yield app, backend
+    backend._push.stop()
+    backend.cancelPending()
+    realtime.stop()
+
+
+def _wait(app, predicate, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        app.processEvents()
+        time.sleep(0.01)
+    return True
+
+
+def _record(signal):
+    received = []
+    signal.connect(lambda *args: received.append(args))
+    return received
+
+
+def test_switch_without_entitlement_waits_for_the_server(client, standin):
+    client.full_login(BENCH_USER_2["email"], BENCH_PASSWORD)
+    client.full_login(BENCH_EMAIL, BENCH_PASSWORD)
+    standin.stop()
+
+    result = client.switch_profile(BENCH_USER_2["id"])
+
+    assert result["success"] and not result["access"] and result["pending"]
+    assert not client.is_authenticated
+    assert client.verify_session()["success"] is False
+    assert not client.is_authenticated
+
+
+def test_switch_offline_leaves_the_app_until_confirmed(backend, standin):
+    from api.supabase_client import api
+
+    app, backend = backend
+    revoked, switched, logged_in = _record(backend.accessRevoked), _record(backend.profileSwitched), _record(backend.loginSuccess)
+    standin.stop()
+
+    backend.switchProfile(BENCH_USER_2["id"])
+
+    assert len(revoked) == 1 and not switched
+    assert _wait(app, lambda: not backend._tasks.is_running("verify_session"))
+    app.processEvents()
+    assert not api.is_authenticated and not logged_in
+
+
+def test_switch_with_entitlement_is_revoked_without_confirmation(entitlement_keys, backend, standin):
+    from api.supabase_client import api
+
+    app, backend = backend
+    revoked, switched = _record(backend.accessRevoked), _record(backend.profileSwitched)
+    standin.stop()
+
+    backend.switchProfile(BENCH_USER_2["id"])
+
+    assert len(switched) == 1 and api.user["id"] == BENCH_USER_2["id"]
+    assert _wait(app, lambda: bool(revoked))
+    assert backend._entitlement_revoked
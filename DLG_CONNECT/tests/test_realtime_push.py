@@ -0,0 +1,90 @@
+"""
+classify_change: só mudanças do próprio usuário/dispositivo viram evento;
+PushChannel: queda ou fechamento da conexão reinscreve o canal
+"""
+
+import time
+
+import pytest
+
+from api import realtime_push
+from api.realtime_push import PushChannel, classify_change
+from bench.realtime_standin import RealtimeStandIn
+
+DEVICE = "device-1"
+
+
+@pytest.mark.parametrize("table", ["profiles", "licenses", "bot_device_sessions"])
+def test_delete_is_ignored(table):
+    # DELETE chega sem RLS/filtro, com old_record só com a chave
+    assert classify_change({"table": table, "type": "DELETE", "old_record": {"id": "x"}}, DEVICE) is None
+
+
+def test_this_device_deactivated():
+    record = {"user_id": "u", "device_id": DEVICE, "is_active": False}
+    event = classify_change({"table": "bot_device_sessions", "type": "UPDATE", "record": record}, DEVICE)
+    assert event == {"type": "device", "event": "UPDATE"}
+
+
+@pytest.mark.parametrize("record", [
+    {"device_id": DEVICE, "is_active": True},      # last_activity_at do próprio verify_session
+    {"device_id": "other", "is_active": False},    # outro dispositivo do usuário
+])
+def test_irrelevant_device_updates(record):
+    assert classify_change({"table": "bot_device_sessions", "type": "UPDATE", "record": record}, DEVICE) is None
+
+
+def test_ban_and_maintenance():
+    ban = classify_change({"table": "profiles", "type": "UPDATE", "record": {"banned": True, "ban_reason": "spam"}})
+    assert ban == {"type": "banned", "reason": "spam"}
+    maintenance = classify_change({
+        "table": "system_settings", "type": "UPDATE", "record": {"key": "maintenance_mode", "value": "true"}
+    })
+    assert maintenance == {"type": "maintenance", "active": True}
+
+
+@pytest.fixture
+def realtime(monkeypatch):
+    monkeypatch.setattr(realtime_push, "RECONNECT_INITIAL", 0.1)
+    monkeypatch.setattr(realtime_push, "PROBE_INTERVAL", 0.5)
+    monkeypatch.setattr(realtime_push, "PROBE_TIMEOUT", 1.0)
+    monkeypatch.setattr(realtime_push, "SUBSCRIBE_TIMEOUT", 2.0)
+    server = RealtimeStandIn().start()
+    channel = PushChannel(server.url, "anon", on_event=lambda event: None)
+    channel.start("u1", DEVICE)
+    assert server.wait_subscribed(1)
+    yield server, channel
+    channel.stop()
+    server.stop()
+
+
+def _wait(predicate, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.05)
+    return True
+
+
+@pytest.mark.parametrize("close", ["drop_connections", "close_connections"])
+def test_resubscribes_after_connection_loss(realtime, close):
+    server, channel = realtime
+
+    assert getattr(server, close)() == 1
+
+    assert _wait(lambda: channel.reconnects >= 1 and server.subscribed == 1)
+    assert server.connections >= 2
+
+
+def test_takes_over_when_the_library_cannot_reconnect(realtime):
+    server, channel = realtime
+    server.accepting = False
+
+    server.drop_connections()
+    time.sleep(1.0)  # a tentativa única da lib é recusada
+    assert server.subscribed == 0
+    server.accepting = True
+
+    assert _wait(lambda: server.subscribed == 1)
+    assert channel.reconnects >= 1
@@ -0,0 +1,88 @@
+"""Refresh tokens ficam no SecretStore, nunca em texto puro nos JSON de estado"""
+
+import json
+import os
+import stat
+
+import pytest
+
+from api.secret_store import SecretStore
+from api.session_manager import SessionManager
+from api.state_store import atomic_write_json
+
+TOKEN = "rt-plaintext-canary"
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    """SessionManager isolado (fora do singleton) numa pasta temporária"""
+    monkeypatch.setattr(SessionManager, "_get_app_data_path", lambda self: tmp_path)
+    manager = object.__new__(SessionManager)
+    manager._initialized = False
+    manager.__init__()
+    return manager
+
+
+def _files_contain(folder, text):
+    return [p.name for p in folder.iterdir() if p.is_file() and text.encode() in p.read_bytes()]
+
+
+def test_encrypted_file_roundtrip(tmp_path):
+    store = SecretStore(tmp_path)
+    if store.backend != "file":
+        pytest.skip("keyring do SO em uso")
+
+    assert store.set("refresh_token:u1", TOKEN) is True
+    assert store.set("refresh_token:u1", TOKEN) is False
+
+    assert _files_contain(tmp_path, TOKEN) == []
+    if os.name == "posix":
+        assert stat.S_IMODE((tmp_path / SecretStore.KEY_FILE).stat().st_mode) == 0o600
+    assert SecretStore(tmp_path).get("refresh_token:u1") == TOKEN
+
+    store.delete("refresh_token:u1")
+    assert not (tmp_path / SecretStore.SECRETS_FILE).exists()
+    assert SecretStore(tmp_path).get("refresh_token:u1") is None
+
+
+def test_session_and_profiles_have_no_refresh_token(manager, tmp_path):
+    manager.save_session("u1", "a@dlg.local", device_fingerprint="fp", refresh_token=TOKEN)
+    manager.flush()
+
+    assert "refresh_token" not in manager.get_session()
+    assert _files_contain(tmp_path, TOKEN) == []
+    assert manager.get_refresh_token() == TOKEN
+
+    manager.clear_session()
+    assert manager.get_refresh_token("u1") is None
+
+
+def test_plaintext_session_is_migrated(manager, tmp_path):
+    atomic_write_json(tmp_path / SessionManager.SESSION_FILE, {
+        "user_id": "u1", "email": "a@dlg.local", "refresh_token": TOKEN,
+    })
+
+    assert manager.preload() is True
+    manager.flush()
+
+    assert manager.get_refresh_token("u1") == TOKEN
+    session = json.loads((tmp_path / SessionManager.SESSION_FILE).read_text(encoding="utf-8"))
+    assert "refresh_token" not in session
+    assert _files_contain(tmp_path, TOKEN) == []
+
+
+def test_plaintext_profiles_are_migrated(manager, tmp_path):
+    atomic_write_json(tmp_path / SessionManager.PROFILES_FILE, {
+        "u1": {"user_id": "u1", "email": "a@dlg.local", "refresh_token": TOKEN},
+        "u2": {"user_id": "u2", "email": "b@dlg.local", "refresh_token": TOKEN + "-2"},
+    })
+
+    assert [p["user_id"] for p in manager.list_profiles()] == ["u1", "u2"]
+    manager.flush()
+
+    assert manager.get_refresh_token("u2") == TOKEN + "-2"
+    assert _files_contain(tmp_path, TOKEN) == []
+
+    manager.remove_profile("u2")
+    assert manager.get_refresh_token("u2") is None
+    assert manager.get_refresh_token("u1") == TOKEN
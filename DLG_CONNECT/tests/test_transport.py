@@ -0,0 +1,53 @@
+"""Transporte keep-alive contra o stand-in HTTPS: uma conexão TLS para o app inteiro"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from bench.standin import BENCH_EMAIL, BENCH_PASSWORD
+
+
+def test_startup_and_login_share_one_connection(client, standin):
+    # Abertura do app (bootstrap), login e chamadas do Dashboard/trial
+    client.bootstrap()
+    login = client.full_login(BENCH_EMAIL, BENCH_PASSWORD)
+    trial = client.check_trial()
+    license = client.check_license()
+    client.verify_session()
+
+    assert login["access"] is True
+    # Nomes das ações do bot-auth; respostas no formato que o app lê
+    assert standin.calls[2:4] == ["check_trial_eligibility", "validate_license"]
+    assert trial["trial"]["eligible"] is True
+    assert license["hasLicense"] is True and license["license"]["plan_name"] == "Pro"
+    assert len(standin.calls) == 5
+    assert standin.connections == 1
+
+
+def test_concurrent_calls_stay_within_pool(client, standin):
+    from api.transport import RequestsTransport
+
+    if not isinstance(client._get_transport(), RequestsTransport):
+        pytest.skip("limite do pool só no transporte requests (HTTP/2 multiplexa)")
+    standin.config.latency_ms = 50
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(
+            lambda i: client._api_request("check_trial_eligibility", {"device_fingerprint": f"device-{i}"}), range(16)
+        ))
+
+    assert all(result["success"] for result in results)
+    assert standin.connections <= RequestsTransport.POOL_SIZE
+
+
+def test_static_headers_and_per_action_timeout(client, standin, monkeypatch):
+    transport = client._get_transport()
+    seen = []
+    original_post = transport.post
+    monkeypatch.setattr(transport, "post", lambda url, body, timeout, headers=None: (
+        seen.append(timeout) or original_post(url, body, timeout, headers)
+    ))
+
+    client.load_recaptcha_settings()
+
+    assert seen == [client.ACTION_TIMEOUTS["get_recaptcha_settings"]]
+    assert transport._default_headers["apikey"] == client.ANON_KEY
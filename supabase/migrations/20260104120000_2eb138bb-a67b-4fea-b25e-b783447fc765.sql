@@ -0,0 +1,20 @@
+-- Push para o bot desktop (canal Realtime): ban, licença e dispositivos do usuário.
+-- system_settings (manutenção) já está na publicação. profiles e licenses só
+-- entregam as linhas do próprio usuário (RLS); bot_device_sessions depende da
+-- política corrigida em 20260105120000. DELETE não passa pelo RLS nem pelo
+-- filtro: o bot ignora DELETE (nada apaga essas linhas; desconectar é UPDATE).
+DO $$ 
+BEGIN
+  BEGIN
+    ALTER PUBLICATION supabase_realtime ADD TABLE public.profiles;
+  EXCEPTION WHEN duplicate_object THEN NULL;
+  END;
+  BEGIN
+    ALTER PUBLICATION supabase_realtime ADD TABLE public.licenses;
+  EXCEPTION WHEN duplicate_object THEN NULL;
+  END;
+  BEGIN
+    ALTER PUBLICATION supabase_realtime ADD TABLE public.bot_device_sessions;
+  EXCEPTION WHEN duplicate_object THEN NULL;
+  END;
+END $$;
@@ -0,0 +1,22 @@
+-- =====================================================
+-- SECURITY FIX: bot_device_sessions visível só para o dono
+-- A política "Service role can manage device sessions" (FOR ALL, USING true)
+-- valia para qualquer papel, inclusive anon: com a tabela na publicação
+-- supabase_realtime, qualquer assinante recebia os dispositivos (IP, nome)
+-- de todos os usuários. A Edge Function usa a service_role.
+-- =====================================================
+
+DROP POLICY IF EXISTS "Service role can manage device sessions" ON public.bot_device_sessions;
+CREATE POLICY "Service role can manage device sessions"
+ON public.bot_device_sessions
+FOR ALL
+TO service_role
+USING (true)
+WITH CHECK (true);
+
+DROP POLICY IF EXISTS "Users can view own device sessions" ON public.bot_device_sessions;
+CREATE POLICY "Users can view own device sessions"
+ON public.bot_device_sessions
+FOR SELECT
+TO authenticated
+USING (auth.uid() = user_id);